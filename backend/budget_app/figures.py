@@ -0,0 +1,22 @@
+"""
+The derived budget numbers, shared by the budget summary and the dashboard so both report
+the same "remaining".
+"""
+from decimal import Decimal
+
+ZERO = Decimal('0')
+
+
+def budget_figures(income_total, expense_total, deduction_total):
+    """
+    spent, remaining and net_profit from the three stored totals. Negative expense or
+    deduction totals count as nothing spent, and remaining never drops below zero (an
+    overspent budget has nothing remaining; net_profit carries the shortfall), the same
+    way SpendingGauge draws it.
+    """
+    spent = max(expense_total, ZERO) + max(deduction_total, ZERO)
+    return {
+        'spent': spent,
+        'remaining': max(income_total - spent, ZERO),
+        'net_profit': income_total - spent,
+    }
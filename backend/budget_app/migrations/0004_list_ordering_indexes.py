@@ -0,0 +1,51 @@
+# Generated by Django 5.0.3 on 2026-10-18 21:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('budget_app', '0003_costofliving_deduction_expense_income_delete_budget'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deduction',
+            index=models.Index(fields=['user', 'id'], name='deduction_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deduction',
+            index=models.Index(fields=['user', 'name', 'id'], name='deduction_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deduction',
+            index=models.Index(fields=['user', 'amount', 'id'], name='deduction_user_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'id'], name='expense_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'name', 'id'], name='expense_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'amount', 'id'], name='expense_user_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['user', 'id'], name='income_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['user', 'name', 'id'], name='income_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['user', 'amount', 'id'], name='income_user_amount_idx'),
+        ),
+    ]
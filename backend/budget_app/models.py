@@ -8,6 +8,13 @@ class Income(models.Model):
     name = models.CharField(max_length=100)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="income_user_id_idx"),
+            models.Index(fields=["user", "name", "id"], name="income_user_name_idx"),
+            models.Index(fields=["user", "amount", "id"], name="income_user_amount_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name} - ${self.amount}"
 
@@ -17,6 +24,13 @@ class Expense(models.Model):
     name = models.CharField(max_length=100)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="expense_user_id_idx"),
+            models.Index(fields=["user", "name", "id"], name="expense_user_name_idx"),
+            models.Index(fields=["user", "amount", "id"], name="expense_user_amount_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name} - ${self.amount}"
 
@@ -26,6 +40,13 @@ class Deduction(models.Model):
     name = models.CharField(max_length=100)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="deduction_user_id_idx"),
+            models.Index(fields=["user", "name", "id"], name="deduction_user_name_idx"),
+            models.Index(fields=["user", "amount", "id"], name="deduction_user_amount_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name} - ${self.amount}"
 
@@ -1,3 +1,37 @@
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from user_app.models import App_user
+from .figures import budget_figures
+from .models import Deduction, Expense, Income
+
+
+def logged_in_client(email="budgeter@example.com"):
+    user = App_user.objects.create_user(username=email, email=email, password="pw")
+    client = APIClient()
+    client.cookies["token"] = Token.objects.create(user=user).key
+    return client, user
+
+
+class BudgetFiguresTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client, self.user = logged_in_client()
+
+    def test_remaining_is_clamped_and_net_profit_carries_the_shortfall(self):
+        figures = budget_figures(Decimal("1000"), Decimal("900"), Decimal("300"))
+        self.assertEqual(figures, {"spent": Decimal("1200"), "remaining": Decimal("0"), "net_profit": Decimal("-200")})
 
-# Create your tests here.
+    def test_summary_and_dashboard_agree_when_overspent(self):
+        Income.objects.create(user=self.user, name="pay", amount=1000)
+        Expense.objects.create(user=self.user, name="rent", amount=900)
+        Deduction.objects.create(user=self.user, name="tax", amount=300)
+        summary = self.client.get("/api/budget/summary/").json()
+        budget = self.client.get("/api/dashboard/").json()["budget"]
+        for key in ("spent", "remaining", "net_profit"):
+            self.assertEqual(Decimal(str(summary[key])), Decimal(str(budget[key])), key)
+        self.assertEqual(Decimal(str(budget["remaining"])), 0)
@@ -3,7 +3,8 @@ from .views import (
     IncomeListCreate, IncomeDelete,
     ExpenseListCreate, ExpenseDelete,
     DeductionListCreate, DeductionDelete,
-    CostOfLivingListCreate
+    CostOfLivingListCreate,
+    BudgetSummary,
 )
 
 urlpatterns = [
@@ -21,4 +22,7 @@ urlpatterns = [
 
     # Cost of Living
     path('col/', CostOfLivingListCreate.as_view(), name='col-list-create'),
+
+    # Totals and spend ratios
+    path('summary/', BudgetSummary.as_view(), name='budget-summary'),
 ]
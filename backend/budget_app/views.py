@@ -1,3 +1,6 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db.models import Count, Sum, Value
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
@@ -5,20 +8,26 @@ from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import TokenAuthentication
 
+from .figures import budget_figures
 from .models import Income, Expense, Deduction, CostOfLiving
 from .serializers import (
     IncomeSerializer, ExpenseSerializer, DeductionSerializer, CostOfLivingSerializer
 )
+from personal_project.aggregates import count_of
+from personal_project.listing import list_response
+from user_app.models import App_user
+from user_app.totals import stored_totals
 from user_app.views import TokenReq
 
 
 
 # --- INCOME VIEWS ---
 class IncomeListCreate(TokenReq):
+    orderings = ('name', 'amount')
+
     def get(self, request):
         incomes = Income.objects.filter(user=request.user)
-        serializer = IncomeSerializer(incomes, many=True)
-        return Response(serializer.data)
+        return list_response(request, incomes, IncomeSerializer, self.orderings)
 
     def post(self, request):
         data = request.data.copy()
@@ -38,10 +47,11 @@ class IncomeDelete(TokenReq):
 
 # --- EXPENSE VIEWS ---
 class ExpenseListCreate(TokenReq):
+    orderings = ('name', 'amount')
+
     def get(self, request):
         expenses = Expense.objects.filter(user=request.user)
-        serializer = ExpenseSerializer(expenses, many=True)
-        return Response(serializer.data)
+        return list_response(request, expenses, ExpenseSerializer, self.orderings)
 
     def post(self, request):
         data = request.data.copy()
@@ -61,10 +71,11 @@ class ExpenseDelete(TokenReq):
 
 # --- DEDUCTION VIEWS ---
 class DeductionListCreate(TokenReq):
+    orderings = ('name', 'amount')
+
     def get(self, request):
         deductions = Deduction.objects.filter(user=request.user)
-        serializer = DeductionSerializer(deductions, many=True)
-        return Response(serializer.data)
+        return list_response(request, deductions, DeductionSerializer, self.orderings)
 
     def post(self, request):
         data = request.data.copy()
@@ -96,3 +107,109 @@ class CostOfLivingListCreate(TokenReq):
             serializer.save(user=request.user)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+# --- SUMMARY VIEW ---
+MAX_TOP_CATEGORIES = 50
+
+
+def whole_percent(part, whole):
+    # Math.round semantics, so the numbers match what SpendingGauge used to show
+    return int((part / whole * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def kind_categories(model, kind, user):
+    return (
+        model.objects.filter(user=user)
+        .order_by()
+        .values('name')
+        .annotate(total=Sum('amount'), count=Count('id'), kind=Value(kind))
+        .values_list('kind', 'name', 'total', 'count')
+    )
+
+
+class BudgetSummary(TokenReq):
+    """
+    Budget totals, net profit and spend ratios without sending the line items.
+
+    The three per-kind totals are read from the user's stored UserTotals row and the row
+    counts are Count subqueries served from the (user, id) indexes, all in one query, so
+    the response is the same size and costs the same however many rows the user has.
+    With ?top=N the N largest spending categories (expense and deduction rows grouped by
+    name) are added, from one more grouped UNION query.
+    """
+
+    def get(self, request):
+        top = request.query_params.get('top')
+        if top is not None:
+            try:
+                top = int(top)
+            except ValueError:
+                return Response({'detail': 'top must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+            if not 1 <= top <= MAX_TOP_CATEGORIES:
+                return Response(
+                    {'detail': f'top must be between 1 and {MAX_TOP_CATEGORIES}.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        user = request.user
+        row = (
+            App_user.objects.filter(pk=user.pk)
+            .values(
+                **stored_totals('income_total', 'expense_total', 'deduction_total'),
+                income_count=count_of(Income),
+                expense_count=count_of(Expense),
+                deduction_count=count_of(Deduction),
+            )
+            .get()
+        )
+        totals = {
+            kind: (row[f'{kind}_total'], row[f'{kind}_count'])
+            for kind in ('income', 'expense', 'deduction')
+        }
+
+        income = totals['income'][0]
+        expenses = max(totals['expense'][0], Decimal('0'))
+        deductions = max(totals['deduction'][0], Decimal('0'))
+        figures = budget_figures(income, totals['expense'][0], totals['deduction'][0])
+        spent, remaining = figures['spent'], figures['remaining']
+        if income > 0:
+            ratios = {
+                'deductions': whole_percent(deductions, income),
+                'expenses': whole_percent(expenses, income),
+                'remaining': whole_percent(remaining, income),
+            }
+            percent_spent = whole_percent(spent, income)
+        else:
+            ratios = None
+            percent_spent = None
+
+        summary = {
+            'income_total': totals['income'][0],
+            'expense_total': totals['expense'][0],
+            'deduction_total': totals['deduction'][0],
+            'spent': spent,
+            'remaining': remaining,
+            'net_profit': figures['net_profit'],
+            'percent_spent': percent_spent,
+            'ratios': ratios,
+            'counts': {kind: count for kind, (_, count) in totals.items()},
+        }
+
+        if top is not None:
+            categories = (
+                kind_categories(Expense, 'expense', user)
+                .union(kind_categories(Deduction, 'deduction', user), all=True)
+                .order_by('-total', 'name')[:top]
+            )
+            summary['top_categories'] = [
+                {
+                    'kind': kind,
+                    'name': name,
+                    'total': total,
+                    'count': count,
+                    'percent_of_income': whole_percent(total, income) if income > 0 else None,
+                }
+                for kind, name, total, count in categories
+            ]
+        return Response(summary)
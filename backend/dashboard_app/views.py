@@ -0,0 +1,125 @@
+from datetime import date
+
+from django.db.models import Value
+from rest_framework.response import Response
+
+from budget_app.figures import budget_figures
+from goals_app.models import Goal
+from investment_app.models import Investment
+from investment_app.projection import PROJECTION_CACHE, investment_inputs, project_investments
+from networth_app.models import Asset, Liability
+from personal_project.aggregates import count_of, sum_of
+from personal_project.query_budget import QueryBudget
+from retire_app.models import RetirementPlan, RetirementIncomeSource
+from user_app.models import App_user
+from user_app.totals import stored_totals
+from user_app.views import TokenReq
+
+# Token lookup, one row of totals, assets + liabilities, favorite goals, plan, investments.
+DASHBOARD_QUERY_BUDGET = 6
+
+# The dashboard's investment chart always shows this many years.
+DASHBOARD_PROJECTION_YEARS = 20
+
+
+class Dashboard(TokenReq):
+    """
+    Everything the dashboard page shows, in one response: budget totals, net worth with its
+    asset and liability rows, investment total and 20-year projection, favorite goals with
+    goal counts, and the retirement plan with its stored readiness.
+
+    Every total comes from a single query against the user row: the budget, net-worth and
+    investment totals are joined from the stored UserTotals row (user_app/totals.py), and
+    the counts and retirement income are Sum/Count subqueries. The response costs
+    DASHBOARD_QUERY_BUDGET queries however many rows the user has; that budget is checked
+    on every request (see personal_project/query_budget.py).
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with QueryBudget(DASHBOARD_QUERY_BUDGET, "dashboard") as budget:
+            response = super().dispatch(request, *args, **kwargs)
+        response["X-Query-Count"] = str(budget.count)
+        return response
+
+    def get(self, request):
+        user = request.user
+        totals = (
+            App_user.objects.filter(pk=user.pk)
+            .annotate(
+                **stored_totals(),
+                investment_count=count_of(Investment),
+                retirement_income_total=sum_of(RetirementIncomeSource),
+                retirement_income_count=count_of(RetirementIncomeSource),
+                goal_count=count_of(Goal),
+                goals_completed=count_of(Goal, is_complete=True),
+            )
+            .values(
+                "income_total", "expense_total", "deduction_total", "asset_total", "liability_total",
+                "investment_total", "investment_count", "retirement_income_total",
+                "retirement_income_count", "goal_count", "goals_completed",
+            )
+            .get()
+        )
+
+        # assets and liabilities in one round-trip; the pie chart needs the individual rows
+        assets, liabilities = [], []
+        rows = (
+            Asset.objects.filter(user=user).annotate(kind=Value("asset")).values_list("kind", "id", "name", "amount")
+            .union(
+                Liability.objects.filter(user=user).annotate(kind=Value("liability")).values_list("kind", "id", "name", "amount"),
+                all=True,
+            )
+        )
+        for kind, pk, name, amount in sorted(rows, key=lambda row: row[1]):
+            (assets if kind == "asset" else liabilities).append({"id": pk, "name": name, "amount": amount})
+
+        favorites = list(
+            Goal.objects.filter(user=user, is_favorite=True)
+            .order_by("id")
+            .values("id", "goal_name", "is_favorite", "is_complete", "is_long_term")
+        )
+        plan = (
+            RetirementPlan.objects.filter(user=user)
+            .values("id", "current_age", "retirement_age", "projected_expenses", "withdrawal_rate", "readiness")
+            .first()
+        )
+
+        investments = list(Investment.objects.filter(user=user))
+        years = DASHBOARD_PROJECTION_YEARS
+        inputs = {"years": years, "year": date.today().year, "inflation": None, "investments": investment_inputs(investments)}
+        projection = PROJECTION_CACHE.get_or_compute(user.id, inputs, lambda: project_investments(investments, years))
+
+        net_worth = totals["asset_total"] - totals["liability_total"]
+        return Response({
+            "budget": {
+                "income_total": totals["income_total"],
+                "expense_total": totals["expense_total"],
+                "deduction_total": totals["deduction_total"],
+                # same definitions as /api/budget/summary/
+                **budget_figures(totals["income_total"], totals["expense_total"], totals["deduction_total"]),
+            },
+            "networth": {
+                "assets": assets,
+                "liabilities": liabilities,
+                "asset_total": totals["asset_total"],
+                "liability_total": totals["liability_total"],
+                "net_worth": net_worth,
+                "net_worth_with_investments": net_worth + totals["investment_total"],
+            },
+            "investments": {
+                "total_value": totals["investment_total"],
+                "count": totals["investment_count"],
+                "projection": projection,
+            },
+            "goals": {
+                "favorites": favorites,
+                "total": totals["goal_count"],
+                "completed": totals["goals_completed"],
+            },
+            "retirement": {
+                "plan": plan,
+                "readiness": plan["readiness"] if plan else None,
+                "income_total": totals["retirement_income_total"],
+                "income_count": totals["retirement_income_count"],
+            },
+        })
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-18 21:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals_app', '0002_goal_is_long_term'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'id'], name='goal_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'goal_name', 'id'], name='goal_user_goal_name_idx'),
+        ),
+    ]
@@ -9,4 +9,11 @@ class Goal(models.Model):
     is_favorite = models.BooleanField(default=False)
     is_complete = models.BooleanField(default=False)
     is_long_term = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="goal_user_id_idx"),
+            models.Index(fields=["user", "goal_name", "id"], name="goal_user_goal_name_idx"),
+        ]
+
 # Create your models here.
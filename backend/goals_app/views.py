@@ -13,15 +13,17 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.models import Token
 from .models import Goal
 from .serializers import GoalSerializer
+from personal_project.listing import list_response
 from user_app.views import TokenReq
 
 
 
 class All_goals(TokenReq):
+    orderings = ("goal_name",)
+
     def get(self, request):
         goals = Goal.objects.filter(user=request.user)
-        serializer = GoalSerializer(goals, many=True)
-        return Response(serializer.data, status=HTTP_200_OK)
+        return list_response(request, goals, GoalSerializer, self.orderings)
 
 
 class A_goal(TokenReq):
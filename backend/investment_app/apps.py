@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class InvestmentAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'investment_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
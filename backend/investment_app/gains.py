@@ -0,0 +1,138 @@
+from typing import Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+from .models import ReturnSnapshot
+from .price_store import sync_many, sync_many_async, load_timeseries
+from .returns import history_start, latest_snapshots, save_snapshot
+
+# The response's changes_pct labels and the ReturnSnapshot horizon each one reads. The
+# horizons count back from the last trading day, with calendar months/years (see
+# MarketGainsAPIView for how that differs from the original today-based 1/7/30/365 days).
+CHANGE_HORIZONS = {
+    "Day": "1D",
+    "Week": "1W",
+    "Month": "1M",
+    "Year": "1Y",
+}
+
+# Per-symbol results are shared by every user watching that symbol for this long.
+SYMBOL_GAINS_TTL = 10 * 60
+
+# A symbol whose fetch failed (unknown ticker, upstream error) isn't retried for this long.
+# Kept well under SYMBOL_GAINS_TTL: most failures are transient upstream errors, and this
+# only needs to stop every watcher of a bad ticker from retrying it at once.
+SYMBOL_FAILURE_TTL = 60
+
+
+def gains_for_snapshot(snapshot: Optional[ReturnSnapshot], is_crypto: bool = False) -> Dict:
+    """
+    The per-asset block of the market gains response, read from a stored snapshot:
+    changes_pct keeps the original Day/Week/Month/Year shape, and "returns" carries the
+    full horizon set with annualized figures.
+    """
+    if snapshot is None:
+        if is_crypto:
+            error = "Could not find historical rows in FMP crypto light response."
+        else:
+            error = "Could not find 'historical' data in FMP response for equity."
+        return {"error": error}
+
+    returns = snapshot.returns
+    return {
+        "as_of": snapshot.as_of.strftime("%Y-%m-%d"),
+        "latest_price": float(snapshot.close),
+        "changes_pct": {
+            label: returns[horizon]["price_return"] if returns.get(horizon) else None
+            for label, horizon in CHANGE_HORIZONS.items()
+        },
+        "returns": returns,
+    }
+
+
+def compute_gains(assets: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    assets: display name -> {"symbol": ..., "type": "equity" | "index" | "crypto"}.
+    Brings every symbol's local history up to date in one concurrent batch (which also
+    refreshes its return snapshot), then answers each asset from the snapshots.
+    """
+    try:
+        sync_many({cfg["symbol"]: cfg["type"] for cfg in assets.values()}, since=history_start())
+    except Exception as e:
+        # serve whatever is stored locally if the refresh itself blew up
+        print(f"[MarketGains] Price store sync failed: {e}")
+
+    return gains_from_store(assets)
+
+
+async def acompute_gains(assets: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    compute_gains() for async views: the upstream batch is awaited on the event loop and
+    only the database work goes through sync_to_async.
+    """
+    try:
+        await sync_many_async({cfg["symbol"]: cfg["type"] for cfg in assets.values()}, since=history_start())
+    except Exception as e:
+        print(f"[MarketGains] Price store sync failed: {e}")
+
+    return await sync_to_async(gains_from_store)(assets)
+
+
+def gains_from_store(assets: Dict[str, Dict]) -> Dict[str, Dict]:
+    symbols = [cfg["symbol"] for cfg in assets.values()]
+    try:
+        snapshots = latest_snapshots(symbols)
+    except Exception as e:
+        return {name: {"error": f"Exception while fetching/parsing: {str(e)}"} for name in assets}
+
+    results = {}
+    for name, cfg in assets.items():
+        try:
+            snapshot = snapshots.get(cfg["symbol"])
+            if snapshot is None:
+                # prices stored before snapshots existed: compute it once now
+                snapshot = save_snapshot(cfg["symbol"], load_timeseries(cfg["symbol"]))
+            results[name] = gains_for_snapshot(snapshot, is_crypto=cfg["type"] == "crypto")
+        except Exception as e:
+            results[name] = {"error": f"Exception while fetching/parsing: {str(e)}"}
+    return results
+
+
+def symbol_gains_cache_key(symbol: str) -> str:
+    return f"investment_app:gains:{symbol}"
+
+
+def cached_symbol_gains(symbols: Dict[str, str]) -> Dict[str, Dict]:
+    """
+    symbols: symbol -> asset_type. Gains keyed by symbol, computed once per symbol per
+    SYMBOL_GAINS_TTL no matter how many users' watchlists contain it; only the symbols
+    missing from the cache are synced, and those in a single batch. Failures are cached
+    too, briefly (SYMBOL_FAILURE_TTL), so a bad ticker costs one upstream call per window.
+    """
+    keys = {symbol_gains_cache_key(symbol): symbol for symbol in symbols}
+    hits = cache.get_many(list(keys))
+    results = {keys[key]: value for key, value in hits.items()}
+
+    missing = {symbol: asset_type for symbol, asset_type in symbols.items() if symbol not in results}
+    if missing:
+        computed = compute_gains({symbol: {"symbol": symbol, "type": t} for symbol, t in missing.items()})
+        cache.set_many(
+            {
+                symbol_gains_cache_key(symbol): value
+                for symbol, value in computed.items()
+                if "error" not in value
+            },
+            timeout=SYMBOL_GAINS_TTL,
+        )
+        cache.set_many(
+            {
+                symbol_gains_cache_key(symbol): value
+                for symbol, value in computed.items()
+                if "error" in value
+            },
+            timeout=SYMBOL_FAILURE_TTL,
+        )
+        results.update(computed)
+
+    return {symbol: results[symbol] for symbol in symbols}
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from investment_app.models import PriceSeries
+from investment_app.price_store import load_timeseries
+from investment_app.returns import save_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the latest rolling-return snapshot for stored price series "
+        "(run after adding a horizon to returns.RETURN_HORIZONS)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("symbols", nargs="*", help="only these symbols (default: every stored series)")
+
+    def handle(self, *args, **options):
+        symbols = [s.upper() for s in options["symbols"]] or list(
+            PriceSeries.objects.order_by("symbol").values_list("symbol", flat=True)
+        )
+        written = 0
+        for symbol in symbols:
+            snapshot = save_snapshot(symbol, load_timeseries(symbol))
+            if snapshot is None:
+                self.stdout.write(f"{symbol}: no stored prices, skipped")
+                continue
+            written += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} return snapshot(s)"))
@@ -0,0 +1,553 @@
+import asyncio
+import codecs
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, datetime, timezone as dt_timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from django.conf import settings
+from personal_project.outbound import AsyncOutboundClient, OutboundClient
+from .timeseries import TimeSeries, parse_date
+
+API_KEY = os.getenv('MARKET_KEY')
+
+# Per-call budget (timeouts + retries); a batch is additionally bounded by MarketDataClient.deadline.
+REQUEST_TIMEOUT = 20
+
+# FMP's quote endpoint takes a comma-separated symbol list; keep URLs a sane length.
+QUOTE_BATCH_SIZE = 50
+
+# Bytes read from the socket per step while stream-parsing a history payload.
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# FMP has used all of these names for the row array of a full-history response.
+HISTORICAL_ARRAY_RE = re.compile(r'"(?:historical|historicalPrice|historicalData)"\s*:\s*\[')
+
+def build_fmp_url_for_symbol(
+    symbol: str, is_index: bool = False, is_crypto: bool = False
+) -> str:
+
+    base = f"{settings.FMP_BASE_URL}/api/v3"
+    if is_crypto:
+        return f"{base}/historical-price-eod/light/{symbol}"
+    if is_index:
+        return f"{base}/historical-price-full/index/{symbol}"
+    return f"{base}/historical-price-full/{symbol}"
+
+
+class HistoricalRowParser:
+    """
+    Push-style incremental parser for an FMP full-history payload
+    ({"symbol": ..., "historical": [{...}, ...]}): feed() it raw byte chunks as they arrive
+    and it returns the rows completed so far. Only the bytes of the row being decoded are
+    held in memory. Shared by the sync (requests) and async (httpx) fetchers.
+    """
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.text = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.in_array = False
+        # set once the closing "]" of the row array has been seen
+        self.done = False
+
+    def feed(self, chunk: bytes) -> List[Dict]:
+        rows = []
+        if self.done or not chunk:
+            return rows
+        self.buf += self.text.decode(chunk)
+
+        if not self.in_array:
+            # find the start of the row array
+            match = HISTORICAL_ARRAY_RE.search(self.buf)
+            if not match:
+                if len(self.buf) > 4096:
+                    # keep a tail so a key split across chunks is still found
+                    self.buf = self.buf[-64:]
+                return rows
+            self.buf = self.buf[match.end():]
+            self.in_array = True
+
+        buf, pos = self.buf, 0
+        while True:
+            # skip separators between rows
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                buf, pos = "", 0
+                break
+            if buf[pos] == "]":
+                self.done = True
+                break
+            try:
+                row, end = self.decoder.raw_decode(buf, pos)
+            except ValueError:
+                # row is split across chunks; wait for more bytes
+                break
+            if isinstance(row, dict):
+                rows.append(row)
+            buf, pos = buf[end:], 0
+        self.buf = buf[pos:]
+        return rows
+
+    def close(self) -> None:
+        if not self.in_array:
+            print(f"[MarketGains:FMP:equity] No 'historical' array in payload: {self.buf[:200]!r}")
+
+
+def iter_historical_rows(chunks: Iterable[bytes]) -> Iterator[Dict]:
+    """
+    Yield the rows of an FMP full-history payload from raw byte chunks. The caller can stop
+    iterating (and close the response) as soon as it has the rows it needs.
+    """
+    parser = HistoricalRowParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    parser.close()
+
+
+class HistoryWindow:
+    """
+    Collects (date, price) pairs from FMP rows on or after `cutoff` (all rows if None).
+    FMP returns newest first, so add() returns False at the first row older than the
+    window, once the rows are seen to be descending: nothing after it is needed.
+    """
+
+    def __init__(self, cutoff: Optional[date] = None):
+        self.cutoff = cutoff
+        self.pairs = []
+        self.last_seen = None
+
+    def add(self, row: Dict) -> bool:
+        d = parse_date(row.get("date"))
+        if d is None:
+            return True
+        if self.cutoff and d < self.cutoff:
+            if self.last_seen is not None and d <= self.last_seen:
+                # rows are newest-first and already past the window: nothing left we need
+                return False
+            self.last_seen = d
+            return True
+        self.last_seen = d
+        self.pairs.append((d, price_from_row(row)))
+        return True
+
+
+def price_from_row(row: Dict) -> Optional[float]:
+    """
+    Extract a numeric price from a FMP historical row. Prefer 'close', then 'adjClose', then try numeric values.
+    """
+    for candidate in ("close", "adjClose", "adj_close", "adjclose", "closePrice"):
+        if candidate in row:
+            try:
+                return float(row[candidate])
+            except Exception:
+                return None
+    # fallback: try any numeric value
+    for v in row.values():
+        try:
+            return float(v)
+        except Exception:
+            continue
+    return None
+
+
+def equity_request(symbol: str, from_date: Optional[str], is_index: bool) -> Tuple[str, Dict]:
+    url = build_fmp_url_for_symbol(symbol, is_index=is_index, is_crypto=False)
+    params = {}
+    if API_KEY:
+        params["apikey"] = API_KEY
+    # keep the serietype parameter if your build expects it (harmless for equities)
+    params["serietype"] = "line"
+    if from_date:
+        params["from"] = from_date
+    return url, params
+
+
+def equity_timeseries(symbol: str, window: HistoryWindow) -> Optional[TimeSeries]:
+    ts = TimeSeries.from_pairs(window.pairs)
+    if not ts:
+        print(f"[MarketGains:FMP:equity] No 'historical' rows for {symbol}")
+        return None
+    return ts
+
+
+def fetch_equity_timeseries(
+    symbol: str,
+    from_date: Optional[str] = None,
+    is_index: bool = False,
+    http: Optional[OutboundClient] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> Optional[TimeSeries]:
+    """
+    Fetch an equity/ETF/index history from FMP and normalize to a TimeSeries.
+    When from_date is given only rows on or after that date are requested, and the body is
+    stream-parsed so rows outside the window are never materialized: FMP returns newest
+    first, so reading stops at the first row older than from_date.
+    Returns None on failure.
+    """
+    url, params = equity_request(symbol, from_date, is_index)
+    window = HistoryWindow(parse_date(from_date) if from_date else None)
+
+    try:
+        with (http or OutboundClient()).get(url, params=params, budget=timeout, stream=True) as resp:
+            print(f"[MarketGains:FMP:equity] Requesting {resp.url} -> status {resp.status_code}")
+
+            if not resp.headers.get("Content-Type", "").startswith("application/json"):
+                print(f"[MarketGains:FMP:equity] Non-JSON response for {symbol} (status {resp.status_code})")
+                return None
+
+            for row in iter_historical_rows(resp.iter_content(chunk_size=STREAM_CHUNK_SIZE)):
+                if not window.add(row):
+                    break
+
+        return equity_timeseries(symbol, window)
+
+    except Exception as exc:
+        print(f"[MarketGains:FMP:equity] Exception fetching equity timeseries: {exc}")
+        return None
+
+
+async def afetch_equity_timeseries(
+    symbol: str,
+    from_date: Optional[str] = None,
+    is_index: bool = False,
+    http: Optional[AsyncOutboundClient] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> Optional[TimeSeries]:
+    """
+    Async fetch_equity_timeseries() over httpx, with the same streaming early stop.
+    """
+    url, params = equity_request(symbol, from_date, is_index)
+    window = HistoryWindow(parse_date(from_date) if from_date else None)
+
+    try:
+        resp = await (http or AsyncOutboundClient()).get(url, params=params, budget=timeout, stream=True)
+        try:
+            print(f"[MarketGains:FMP:equity] Requesting {resp.url} -> status {resp.status_code}")
+
+            if not resp.headers.get("Content-Type", "").startswith("application/json"):
+                print(f"[MarketGains:FMP:equity] Non-JSON response for {symbol} (status {resp.status_code})")
+                return None
+
+            parser = HistoricalRowParser()
+            async for chunk in resp.aiter_bytes(STREAM_CHUNK_SIZE):
+                if not all(window.add(row) for row in parser.feed(chunk)) or parser.done:
+                    break
+            else:
+                parser.close()
+        finally:
+            await resp.aclose()
+
+        return equity_timeseries(symbol, window)
+
+    except Exception as exc:
+        print(f"[MarketGains:FMP:equity] Exception fetching equity timeseries: {exc}")
+        return None
+
+
+def crypto_request(symbol: str, from_date: str) -> Tuple[str, Dict]:
+    # light endpoint for eod data (documented)
+    url = f"{settings.FMP_BASE_URL}/stable/historical-price-eod/light"
+    params = {"symbol": symbol, "from": from_date}
+    if API_KEY:
+        params["apikey"] = API_KEY
+    return url, params
+
+
+def crypto_timeseries_from_payload(data) -> Optional[TimeSeries]:
+    """
+    Normalize an FMP crypto light payload (a row list, or a dict wrapping one) to a TimeSeries.
+    """
+    if data is None:
+        return None
+
+    rows = None
+    if isinstance(data, list):
+        rows = data
+    elif isinstance(data, dict):
+        # common: {"symbol": "BTCUSD", "historical": [...]}
+        rows = data.get("historical") or data.get("data") or data.get("rows")
+        if rows is None:
+            # fallback: if dict contains exactly one list value, use that
+            for v in data.values():
+                if isinstance(v, list):
+                    rows = v
+                    break
+
+    if not rows or not isinstance(rows, list):
+        return None
+
+    ts = TimeSeries.from_pairs(
+        (row.get("date") or row.get("datetime") or row.get("timestamp"), price_from_row(row))
+        for row in rows
+        if isinstance(row, dict)
+    )
+    return ts if ts else None
+
+
+def fetch_crypto_timeseries(
+    symbol: str,
+    from_date: str,
+    http: Optional[OutboundClient] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> Optional[TimeSeries]:
+    """
+    Fetch crypto using the FMP EOD endpoint and normalize to a TimeSeries.
+    Returns None on failure.
+    """
+    url, params = crypto_request(symbol, from_date)
+
+    try:
+        resp = (http or OutboundClient()).get(url, params=params, budget=timeout)
+        print(f"[MarketGains:FMP:crypto] Requesting {resp.url} -> status {resp.status_code}")
+        # attempt JSON parse
+        try:
+            data = resp.json() if resp.headers.get("Content-Type", "").startswith("application/json") else None
+        except Exception:
+            data = None
+        return crypto_timeseries_from_payload(data)
+
+    except Exception as exc:
+        print(f"[MarketGains:FMP:crypto] Exception fetching crypto timeseries: {exc}")
+        return None
+
+
+async def afetch_crypto_timeseries(
+    symbol: str,
+    from_date: str,
+    http: Optional[AsyncOutboundClient] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> Optional[TimeSeries]:
+    url, params = crypto_request(symbol, from_date)
+
+    try:
+        resp = await (http or AsyncOutboundClient()).get(url, params=params, budget=timeout)
+        print(f"[MarketGains:FMP:crypto] Requesting {resp.url} -> status {resp.status_code}")
+        try:
+            data = resp.json() if resp.headers.get("Content-Type", "").startswith("application/json") else None
+        except Exception:
+            data = None
+        return crypto_timeseries_from_payload(data)
+
+    except Exception as exc:
+        print(f"[MarketGains:FMP:crypto] Exception fetching crypto timeseries: {exc}")
+        return None
+
+
+def quote_request(symbols: List[str]) -> Tuple[str, Dict]:
+    url = f"{settings.FMP_BASE_URL}/api/v3/quote/{','.join(symbols)}"
+    params = {}
+    if API_KEY:
+        params["apikey"] = API_KEY
+    return url, params
+
+
+def quotes_from_payload(data) -> Dict[str, Tuple[date, float]]:
+    if not isinstance(data, list):
+        return {}
+
+    out = {}
+    for row in data:
+        if not isinstance(row, dict) or not row.get("symbol"):
+            continue
+        try:
+            price = float(row["price"])
+        except Exception:
+            continue
+        stamp = row.get("timestamp")
+        quoted = (
+            datetime.fromtimestamp(int(stamp), tz=dt_timezone.utc).date()
+            if stamp
+            else datetime.now(tz=dt_timezone.utc).date()
+        )
+        out[row["symbol"].upper()] = (quoted, price)
+    return out
+
+
+def fetch_batch_quotes(
+    symbols: Iterable[str],
+    http: Optional[OutboundClient] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> Dict[str, Tuple[date, float]]:
+    """
+    One round-trip to FMP's comma-separated quote endpoint for up to QUOTE_BATCH_SIZE symbols.
+    Returns symbol -> (quote date, price); symbols FMP doesn't know are simply absent.
+    """
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+    url, params = quote_request(symbols)
+
+    try:
+        resp = (http or OutboundClient()).get(url, params=params, budget=timeout)
+        print(f"[MarketGains:FMP:quote] Requesting {len(symbols)} symbols -> status {resp.status_code}")
+        try:
+            data = resp.json() if resp.headers.get("Content-Type", "").startswith("application/json") else None
+        except Exception:
+            data = None
+        return quotes_from_payload(data)
+
+    except Exception as exc:
+        print(f"[MarketGains:FMP:quote] Exception fetching batch quotes: {exc}")
+        return {}
+
+
+async def afetch_batch_quotes(
+    symbols: Iterable[str],
+    http: Optional[AsyncOutboundClient] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> Dict[str, Tuple[date, float]]:
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+    url, params = quote_request(symbols)
+
+    try:
+        resp = await (http or AsyncOutboundClient()).get(url, params=params, budget=timeout)
+        print(f"[MarketGains:FMP:quote] Requesting {len(symbols)} symbols -> status {resp.status_code}")
+        try:
+            data = resp.json() if resp.headers.get("Content-Type", "").startswith("application/json") else None
+        except Exception:
+            data = None
+        return quotes_from_payload(data)
+
+    except Exception as exc:
+        print(f"[MarketGains:FMP:quote] Exception fetching batch quotes: {exc}")
+        return {}
+
+
+class MarketDataClient:
+    """
+    Fetches several symbols at once on a small thread pool over the shared outbound session
+    (so every call also gets the FMP circuit breaker, timeouts and bounded retries).
+    The whole batch gets one deadline, so a request waits for the slowest symbol
+    rather than the sum of all of them; anything still running at the deadline is
+    reported as None and left to finish in the background.
+
+    afetch_batch() is the same batch for async callers: one task per fetch on the running
+    event loop over httpx, and anything past the deadline is cancelled.
+    """
+
+    def __init__(
+        self,
+        http: Optional[OutboundClient] = None,
+        max_workers: int = 8,
+        deadline: float = REQUEST_TIMEOUT,
+        ahttp: Optional[AsyncOutboundClient] = None,
+    ):
+        self.http = http or OutboundClient()
+        self.ahttp = ahttp or AsyncOutboundClient()
+        self.max_workers = max_workers
+        self.deadline = deadline
+
+    def fetch(self, symbol: str, asset_type: str, from_date: Optional[str], timeout: float) -> Optional[TimeSeries]:
+        if asset_type == "crypto":
+            return fetch_crypto_timeseries(symbol, from_date, http=self.http, timeout=timeout)
+        return fetch_equity_timeseries(
+            symbol, from_date=from_date, is_index=asset_type == "index", http=self.http, timeout=timeout
+        )
+
+    def fetch_batch(
+        self, jobs: Iterable[Tuple[str, str, Optional[str]]], quote_symbols: Iterable[str]
+    ) -> Tuple[Dict[str, Optional[TimeSeries]], Dict[str, Tuple[date, float]]]:
+        """
+        History fetches for `jobs` plus batch quotes for `quote_symbols` (QUOTE_BATCH_SIZE
+        per round-trip), all on the same pool under the same deadline.
+        Returns (symbol -> TimeSeries or None, symbol -> (date, price)).
+        """
+        jobs = list(jobs)
+        quote_symbols = list(quote_symbols)
+        histories = {symbol: None for symbol, _, _ in jobs}
+        quotes = {}
+        chunks = [quote_symbols[i:i + QUOTE_BATCH_SIZE] for i in range(0, len(quote_symbols), QUOTE_BATCH_SIZE)]
+        if not jobs and not chunks:
+            return histories, quotes
+
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs) + len(chunks)))
+        try:
+            futures = {
+                executor.submit(self.fetch, symbol, asset_type, from_date, self.deadline): symbol
+                for symbol, asset_type, from_date in jobs
+            }
+            quote_futures = {
+                executor.submit(fetch_batch_quotes, chunk, self.http, self.deadline): ",".join(chunk)
+                for chunk in chunks
+            }
+            done, not_done = wait([*futures, *quote_futures], timeout=self.deadline)
+            for future in done:
+                label = futures.get(future) or quote_futures.get(future)
+                try:
+                    if future in futures:
+                        histories[label] = future.result()
+                    else:
+                        quotes.update(future.result())
+                except Exception as exc:
+                    print(f"[MarketGains:FMP] Exception fetching {label}: {exc}")
+            for future in not_done:
+                label = futures.get(future) or quote_futures.get(future)
+                print(f"[MarketGains:FMP] {label} missed the {self.deadline}s deadline")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        print(
+            f"[MarketGains:FMP] Fetched {len(jobs)} histories and {len(quote_symbols)} quotes "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return histories, quotes
+
+    async def afetch(self, symbol: str, asset_type: str, from_date: Optional[str], timeout: float) -> Optional[TimeSeries]:
+        if asset_type == "crypto":
+            return await afetch_crypto_timeseries(symbol, from_date, http=self.ahttp, timeout=timeout)
+        return await afetch_equity_timeseries(
+            symbol, from_date=from_date, is_index=asset_type == "index", http=self.ahttp, timeout=timeout
+        )
+
+    async def afetch_batch(
+        self, jobs: Iterable[Tuple[str, str, Optional[str]]], quote_symbols: Iterable[str]
+    ) -> Tuple[Dict[str, Optional[TimeSeries]], Dict[str, Tuple[date, float]]]:
+        """
+        Async fetch_batch(): same arguments, same result shape.
+        """
+        jobs = list(jobs)
+        quote_symbols = list(quote_symbols)
+        histories = {symbol: None for symbol, _, _ in jobs}
+        quotes = {}
+        chunks = [quote_symbols[i:i + QUOTE_BATCH_SIZE] for i in range(0, len(quote_symbols), QUOTE_BATCH_SIZE)]
+        if not jobs and not chunks:
+            return histories, quotes
+
+        started = time.monotonic()
+        tasks = {
+            asyncio.ensure_future(self.afetch(symbol, asset_type, from_date, self.deadline)): symbol
+            for symbol, asset_type, from_date in jobs
+        }
+        quote_tasks = {
+            asyncio.ensure_future(afetch_batch_quotes(chunk, self.ahttp, self.deadline)): ",".join(chunk)
+            for chunk in chunks
+        }
+        done, not_done = await asyncio.wait([*tasks, *quote_tasks], timeout=self.deadline)
+        for task in done:
+            label = tasks.get(task) or quote_tasks.get(task)
+            try:
+                if task in tasks:
+                    histories[label] = task.result()
+                else:
+                    quotes.update(task.result())
+            except Exception as exc:
+                print(f"[MarketGains:FMP] Exception fetching {label}: {exc}")
+        for task in not_done:
+            label = tasks.get(task) or quote_tasks.get(task)
+            print(f"[MarketGains:FMP] {label} missed the {self.deadline}s deadline")
+            task.cancel()
+
+        print(
+            f"[MarketGains:FMP] Fetched {len(jobs)} histories and {len(quote_symbols)} quotes "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return histories, quotes
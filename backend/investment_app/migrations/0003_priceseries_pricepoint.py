@@ -0,0 +1,35 @@
+# Generated by Django 5.0.3 on 2026-10-18 20:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment_app', '0002_investment_contribution'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceSeries',
+            fields=[
+                ('symbol', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('asset_type', models.CharField(default='equity', max_length=10)),
+                ('last_fetched', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PricePoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('close', models.DecimalField(decimal_places=6, max_digits=18)),
+                ('series', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points', to='investment_app.priceseries')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='pricepoint',
+            constraint=models.UniqueConstraint(fields=('series', 'date'), name='unique_series_date'),
+        ),
+    ]
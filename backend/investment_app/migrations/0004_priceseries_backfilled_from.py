@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 20:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment_app', '0003_priceseries_pricepoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='priceseries',
+            name='backfilled_from',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.3 on 2026-10-18 21:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment_app', '0005_watchlistitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReturnSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField()),
+                ('close', models.DecimalField(decimal_places=6, max_digits=18)),
+                ('returns', models.JSONField(default=dict)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('series', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='return_snapshots', to='investment_app.priceseries')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='returnsnapshot',
+            constraint=models.UniqueConstraint(fields=('series', 'as_of'), name='unique_series_as_of'),
+        ),
+    ]
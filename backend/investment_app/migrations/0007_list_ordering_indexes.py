@@ -0,0 +1,31 @@
+# Generated by Django 5.0.3 on 2026-10-18 21:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investment_app', '0006_returnsnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(fields=['user', 'id'], name='inv_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(fields=['user', 'investment_name', 'id'], name='inv_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(fields=['user', 'value', 'id'], name='inv_user_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='investment',
+            index=models.Index(fields=['user', 'rate_of_return', 'id'], name='inv_user_rate_idx'),
+        ),
+    ]
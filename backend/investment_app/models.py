@@ -10,5 +10,79 @@ class Investment(models.Model):
     contribution = models.PositiveIntegerField()
     contribution_timeline_years = models.PositiveIntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="inv_user_id_idx"),
+            models.Index(fields=["user", "investment_name", "id"], name="inv_user_name_idx"),
+            models.Index(fields=["user", "value", "id"], name="inv_user_value_idx"),
+            models.Index(fields=["user", "rate_of_return", "id"], name="inv_user_rate_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.investment_name} - {self.value} - {self.rate_of_return}"
+
+
+class PriceSeries(models.Model):
+    """
+    One row per market symbol we keep local history for. last_fetched records when
+    we last asked FMP for new rows so the store only goes upstream once per refresh window;
+    backfilled_from is the earliest date we have asked FMP for, so a wider window is only
+    backfilled once even for symbols that don't trade that far back.
+    """
+    symbol = models.CharField(max_length=20, primary_key=True)
+    asset_type = models.CharField(max_length=10, default="equity")
+    last_fetched = models.DateTimeField(null=True, blank=True)
+    backfilled_from = models.DateField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.symbol} - {self.asset_type} - {self.last_fetched}"
+
+
+class PricePoint(models.Model):
+    series = models.ForeignKey(PriceSeries, on_delete=models.CASCADE, related_name="points")
+    date = models.DateField()
+    close = models.DecimalField(max_digits=18, decimal_places=6)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["series", "date"], name="unique_series_date")
+        ]
+
+    def __str__(self):
+        return f"{self.series_id} - {self.date} - {self.close}"
+
+
+class WatchlistItem(models.Model):
+    user = models.ForeignKey(App_user, on_delete=models.CASCADE)
+    symbol = models.CharField(max_length=20)
+    asset_type = models.CharField(max_length=10, default="equity")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "symbol"], name="unique_user_watchlist_symbol")
+        ]
+
+    def __str__(self):
+        return f"{self.symbol} - {self.asset_type}"
+
+
+class ReturnSnapshot(models.Model):
+    """
+    Rolling returns for one symbol as of one trading day, computed when new prices are
+    stored (see returns.py) so reads are a single indexed lookup. `returns` maps each
+    horizon label to {"start_date", "price_return", "annualized_return"} (percentages),
+    or None when the stored history doesn't reach back that far.
+    """
+    series = models.ForeignKey(PriceSeries, on_delete=models.CASCADE, related_name="return_snapshots")
+    as_of = models.DateField()
+    close = models.DecimalField(max_digits=18, decimal_places=6)
+    returns = models.JSONField(default=dict)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["series", "as_of"], name="unique_series_as_of")
+        ]
+
     def __str__(self):
-        return f"{self.investment_name} - {self.value} - {self.rate_of_return}"
\ No newline at end of file
+        return f"{self.series_id} - {self.as_of}"
@@ -0,0 +1,173 @@
+from array import array
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.db.models import Max
+from django.utils import timezone
+
+from .market_data import MarketDataClient
+from .models import PriceSeries, PricePoint
+from .returns import save_snapshot
+from .timeseries import TimeSeries
+
+# How long a symbol's local history is trusted before we ask FMP for newer rows.
+REFRESH_INTERVAL = timedelta(hours=6)
+
+# Backfill window used when the caller doesn't say how far back it needs (1 year + a week
+# so an "on or before" lookup at the far edge still finds the previous trading day).
+DEFAULT_LOOKBACK_DAYS = 372
+
+
+def store_rows(series: PriceSeries, ts: TimeSeries) -> int:
+    """
+    Upsert a fetched TimeSeries into PricePoint.
+    Existing dates get their close overwritten so a partial-day print is corrected
+    on the next refresh. Returns the number of rows written.
+    """
+    points = [PricePoint(series=series, date=d, close=round(close, 6)) for d, close in ts]
+    if points:
+        PricePoint.objects.bulk_create(
+            points,
+            update_conflicts=True,
+            unique_fields=["series", "date"],
+            update_fields=["close"],
+        )
+    return len(points)
+
+
+class SyncPlan:
+    """
+    What sync_many() has to fetch: history `jobs` as (symbol, asset_type, from_date),
+    `quote_symbols` for same-day refreshes, and the PriceSeries rows to update afterwards.
+    """
+
+    def __init__(self, now):
+        self.now = now
+        self.jobs = []
+        self.quote_symbols = []
+        self.stale = {}
+        self.backfills = {}
+
+    def __bool__(self):
+        return bool(self.jobs or self.quote_symbols)
+
+
+def plan_sync(assets: Dict[str, str], since: Optional[date] = None) -> SyncPlan:
+    """
+    Decide per symbol whether its stored history is current, needs a quote, an incremental
+    fetch or a backfill (see sync_many). Missing PriceSeries rows are only built here;
+    apply_sync saves them once a fetch brings back prices, so a ticker FMP doesn't know
+    leaves no row behind.
+    """
+    now = timezone.now()
+    plan = SyncPlan(now)
+    if since is None:
+        since = now.date() - timedelta(days=DEFAULT_LOOKBACK_DAYS)
+    existing = PriceSeries.objects.in_bulk(list(assets.keys()))
+    last_dates = dict(
+        PricePoint.objects.filter(series_id__in=list(assets.keys()))
+        .values("series_id")
+        .annotate(last=Max("date"))
+        .values_list("series_id", "last")
+    )
+
+    for symbol, asset_type in assets.items():
+        series = existing.get(symbol)
+        if series is None:
+            series = PriceSeries(symbol=symbol, asset_type=asset_type)
+        last_date = last_dates.get(symbol)
+        covers_window = (
+            last_date is not None and series.backfilled_from is not None and series.backfilled_from <= since
+        )
+        if covers_window and series.last_fetched and now - series.last_fetched < REFRESH_INTERVAL:
+            continue
+
+        plan.stale[symbol] = series
+        if covers_window and series.last_fetched and series.last_fetched.date() == now.date():
+            # already pulled history today: the only thing that can have moved is today's
+            # price, which one batch quote round-trip covers for every such symbol
+            plan.quote_symbols.append(symbol)
+            continue
+
+        if covers_window:
+            # re-request the last stored day as well, its close may have been taken intraday
+            from_date = last_date
+        else:
+            from_date = since
+            plan.backfills[symbol] = since
+        plan.jobs.append((symbol, asset_type, from_date.strftime("%Y-%m-%d")))
+    return plan
+
+
+def apply_sync(plan: SyncPlan, fetched: Dict[str, Optional[TimeSeries]], quotes: Dict) -> None:
+    """
+    Store what a plan's fetch brought back and recompute the rolling-return snapshot of
+    every symbol that got new rows; symbols that failed keep what they had.
+    """
+    for symbol, (quoted, price) in quotes.items():
+        if symbol in plan.stale:
+            fetched[symbol] = TimeSeries.from_pairs([(quoted, price)])
+    for symbol, ts in fetched.items():
+        if not ts:
+            continue
+        series = plan.stale[symbol]
+        if series._state.adding:
+            series.save()
+        store_rows(series, ts)
+        series.last_fetched = plan.now
+        if symbol in plan.backfills:
+            series.backfilled_from = plan.backfills[symbol]
+        series.save(update_fields=["last_fetched", "backfilled_from"])
+        save_snapshot(symbol, load_timeseries(symbol))
+
+
+def sync_many(
+    assets: Dict[str, str], since: Optional[date] = None, client: Optional[MarketDataClient] = None
+) -> None:
+    """
+    Make sure the local history for every symbol in `assets` (symbol -> asset_type) is current
+    and reaches back to `since` (default: DEFAULT_LOOKBACK_DAYS ago).
+    The first call backfills only that window; afterwards only rows from the last stored date
+    onward are requested, and nothing is requested at all while a series is inside
+    REFRESH_INTERVAL. A caller that needs a longer window than has been backfilled triggers
+    one wider backfill. Later refreshes on the same day only need today's price, so those
+    symbols share FMP batch-quote round-trips instead of one history call each.
+    All stale symbols are fetched concurrently in one MarketDataClient batch; database
+    reads and writes stay on the calling thread. Upstream failures leave whatever is
+    already stored untouched.
+    """
+    plan = plan_sync(assets, since)
+    if not plan:
+        return
+    fetched, quotes = (client or MarketDataClient()).fetch_batch(plan.jobs, plan.quote_symbols)
+    apply_sync(plan, fetched, quotes)
+
+
+async def sync_many_async(
+    assets: Dict[str, str], since: Optional[date] = None, client: Optional[MarketDataClient] = None
+) -> None:
+    """
+    sync_many() for async callers: the planning and storing run on Django's sync DB thread,
+    the upstream batch is awaited on the event loop.
+    """
+    plan = await sync_to_async(plan_sync)(assets, since)
+    if not plan:
+        return
+    fetched, quotes = await (client or MarketDataClient()).afetch_batch(plan.jobs, plan.quote_symbols)
+    await sync_to_async(apply_sync)(plan, fetched, quotes)
+
+
+def load_timeseries(symbol: str) -> Optional[TimeSeries]:
+    """
+    Read the stored history for `symbol` as a TimeSeries. Rows come back in date order
+    from the (series, date) unique index, so no sorting happens in Python.
+    """
+    rows = PricePoint.objects.filter(series_id=symbol).order_by("date").values_list("date", "close")
+    ordinals = array("l")
+    closes = array("d")
+    for d, close in rows:
+        ordinals.append(d.toordinal())
+        closes.append(float(close))
+    ts = TimeSeries(ordinals, closes)
+    return ts if ts else None
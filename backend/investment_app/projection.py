@@ -0,0 +1,115 @@
+"""
+Closed-form investment projections, vectorized over investments and years.
+
+Matches the month-by-month loop the charts used to run in the browser: each month the
+contribution (if still inside contribution_timeline_years) is added first, then the
+balance compounds at rate_of_return / 12. With monthly rate i, growth g = 1 + i and K
+contribution months, the balance after n months is
+
+    V(n) = V0 * g^n + C * g * (g^m - 1) / i * g^(n - m),    m = min(n, K)
+
+i.e. the future value of an annuity due for the contribution months, carried forward
+at g once contributions stop (C * m when i == 0).
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from personal_project.memo_cache import MemoCache
+
+# Upper bound on the ?years= the projection endpoint accepts.
+MAX_PROJECTION_YEARS = 100
+
+# Chart series by content hash of the user's investments (see personal_project/memo_cache.py).
+PROJECTION_CACHE = MemoCache("investment_projection")
+
+
+def project_balances(
+    values: np.ndarray,
+    annual_rates_pct: np.ndarray,
+    monthly_contributions: np.ndarray,
+    contribution_years: np.ndarray,
+    months: np.ndarray,
+) -> np.ndarray:
+    """
+    Balances of every investment (rows) after each month count in `months` (columns).
+    """
+    v0 = values[:, None]
+    i = (annual_rates_pct / 100.0 / 12.0)[:, None]
+    c = monthly_contributions[:, None]
+    k = (contribution_years * 12)[:, None]
+    n = months[None, :].astype(np.float64)
+
+    g = 1.0 + i
+    m = np.minimum(n, k)
+    growth_n = g ** n
+    # i == 0 would divide by zero; those rows take the straight-line C * m instead
+    safe_i = np.where(i == 0, 1.0, i)
+    annuity = np.where(i == 0, c * m, c * g * (g ** m - 1.0) / safe_i * g ** (n - m))
+    return v0 * growth_n + annuity
+
+
+def investment_inputs(investments: Iterable) -> List[List]:
+    """
+    The Investment fields a projection reads, in id order: the content a cached result is keyed by.
+    """
+    return [
+        [inv.id, inv.investment_name, inv.value, inv.rate_of_return, inv.contribution, inv.contribution_timeline_years]
+        for inv in sorted(investments, key=lambda inv: inv.id)
+    ]
+
+
+def project_investments(investments: Iterable, years: int, inflation_rate: Optional[float] = None) -> Dict:
+    """
+    Yearly series for the investment chart: one series per investment (largest starting
+    value first, the order the chart stacks them in), per-year totals and their max.
+    `investments` are Investment rows (or anything with the same attributes).
+
+    With an annual `inflation_rate` (percent), every series also comes deflated to today's
+    dollars (real_data / real_totals), and price_index[y] = (1 + rate)^y is included so any
+    other amount (e.g. retirement expenses) converts with one lookup. Without a rate the
+    real fields are None.
+    """
+    investments = sorted(investments, key=lambda inv: float(inv.value or 0), reverse=True)
+    this_year = date.today().year
+    labels = [str(this_year + y) for y in range(years + 1)]
+    price_index = None
+    if inflation_rate is not None:
+        price_index = (1.0 + inflation_rate / 100.0) ** np.arange(years + 1)
+
+    if investments:
+        balances = project_balances(
+            np.array([float(inv.value or 0) for inv in investments]),
+            np.array([float(inv.rate_of_return or 0) for inv in investments]),
+            np.array([float(inv.contribution or 0) for inv in investments]),
+            np.array([int(inv.contribution_timeline_years or 0) for inv in investments]),
+            np.arange(years + 1) * 12,
+        )
+    else:
+        balances = np.zeros((0, years + 1))
+    totals = balances.sum(axis=0)
+    # deflate every investment and year in one broadcast division
+    real = balances / price_index[None, :] if price_index is not None else None
+    real_totals = totals / price_index if price_index is not None else None
+
+    series: List[Dict] = [
+        {
+            "id": inv.id,
+            "label": inv.investment_name or f"inv-{inv.id}",
+            "data": np.round(balances[i], 2).tolist(),
+            "real_data": np.round(real[i], 2).tolist() if real is not None else None,
+        }
+        for i, inv in enumerate(investments)
+    ]
+    return {
+        "years": years,
+        "labels": labels,
+        "series": series,
+        "totals": np.round(totals, 2).tolist(),
+        "max_total": round(float(totals.max()), 2) if investments else 0.0,
+        "inflation_rate": inflation_rate,
+        "price_index": np.round(price_index, 6).tolist() if price_index is not None else None,
+        "real_totals": np.round(real_totals, 2).tolist() if real_totals is not None else None,
+        "max_real_total": round(float(real_totals.max()), 2) if real_totals is not None and investments else None,
+    }
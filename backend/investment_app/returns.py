@@ -0,0 +1,108 @@
+import calendar
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+
+from django.db.models import OuterRef, Subquery
+
+from .models import ReturnSnapshot
+from .timeseries import TimeSeries
+
+# Horizons stored in every ReturnSnapshot. Adding one here only costs work at ingest time
+# (and `manage.py rebuild_returns` to fill it in for symbols already stored).
+RETURN_HORIZONS = ("1D", "1W", "1M", "3M", "YTD", "1Y", "3Y", "5Y")
+
+# Horizons that get an annualized figure, with their length in years. Returns over less
+# than a year are reported as-is, not annualized (the GIPS convention): compounding a
+# one-day move out to a year says nothing useful.
+ANNUALIZED_YEARS = {"1Y": 1, "3Y": 3, "5Y": 5}
+
+
+def months_before(d: date, months: int) -> date:
+    """
+    Same day `months` calendar months earlier, clamped to the end of shorter months.
+    """
+    year, month = divmod(d.year * 12 + d.month - 1 - months, 12)
+    month += 1
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def horizon_start(label: str, as_of: date) -> date:
+    """
+    The date whose close (on or before it) each horizon's return is measured from.
+    """
+    if label == "1D":
+        return as_of - timedelta(days=1)
+    if label == "1W":
+        return as_of - timedelta(days=7)
+    if label == "YTD":
+        # last close of the previous year
+        return date(as_of.year - 1, 12, 31)
+    if label.endswith("M"):
+        return months_before(as_of, int(label[:-1]))
+    if label.endswith("Y"):
+        return months_before(as_of, 12 * int(label[:-1]))
+    raise ValueError(f"Unknown return horizon {label!r}")
+
+
+def history_start(as_of: Optional[date] = None) -> date:
+    """
+    How far back the price store needs history for every horizon to have a base price
+    (plus a week so the "on or before" lookup at the far edge still finds a trading day).
+    """
+    as_of = as_of or date.today()
+    return min(horizon_start(label, as_of) for label in RETURN_HORIZONS) - timedelta(days=7)
+
+
+def rolling_returns(ts: TimeSeries) -> Dict[str, Dict]:
+    """
+    Price and annualized return (both in percent) for every RETURN_HORIZONS entry, measured
+    from the close on or before the horizon start to the series' latest close.
+    A horizon the stored history doesn't reach back to (or with a zero base) is None.
+    """
+    as_of, latest = ts.last_date, ts.last_price
+    out = {}
+    for label in RETURN_HORIZONS:
+        start = horizon_start(label, as_of)
+        base = ts.point_on_or_before(start)
+        if base is None or not base[1]:
+            out[label] = None
+            continue
+        base_date, base_price = base
+        growth = latest / base_price
+        annualized = None
+        years = ANNUALIZED_YEARS.get(label)
+        if years and growth > 0:
+            annualized = round((growth ** (1 / years) - 1) * 100.0, 4)
+        out[label] = {
+            "start_date": base_date.strftime("%Y-%m-%d"),
+            "price_return": round((growth - 1) * 100.0, 4),
+            "annualized_return": annualized,
+        }
+    return out
+
+
+def save_snapshot(symbol: str, ts: Optional[TimeSeries]) -> Optional[ReturnSnapshot]:
+    """
+    Compute and upsert the snapshot for `symbol` as of its latest stored close.
+    """
+    if not ts:
+        return None
+    snapshot, _ = ReturnSnapshot.objects.update_or_create(
+        series_id=symbol,
+        as_of=ts.last_date,
+        defaults={"close": round(ts.last_price, 6), "returns": rolling_returns(ts)},
+    )
+    return snapshot
+
+
+def latest_snapshots(symbols: Iterable[str]) -> Dict[str, ReturnSnapshot]:
+    """
+    Newest snapshot per symbol in one query, answered from the (series, as_of) unique index.
+    """
+    newest = (
+        ReturnSnapshot.objects.filter(series_id=OuterRef("series_id"))
+        .order_by("-as_of")
+        .values("as_of")[:1]
+    )
+    rows = ReturnSnapshot.objects.filter(series_id__in=list(symbols), as_of=Subquery(newest))
+    return {row.series_id: row for row in rows}
@@ -1,7 +1,23 @@
+import re
 from rest_framework import serializers
-from .models import Investment
+from .models import Investment, WatchlistItem
+
+SYMBOL_RE = re.compile(r"^[A-Z0-9][A-Z0-9.\-^]{0,19}$")
 
 class InvestmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Investment
-        fields = ['id', 'investment_name', 'value', 'rate_of_return', 'contribution', 'contribution_timeline_years']
\ No newline at end of file
+        fields = ['id', 'investment_name', 'value', 'rate_of_return', 'contribution', 'contribution_timeline_years']
+
+class WatchlistItemSerializer(serializers.ModelSerializer):
+    asset_type = serializers.ChoiceField(choices=["equity", "index", "crypto"], default="equity")
+
+    class Meta:
+        model = WatchlistItem
+        fields = ['id', 'symbol', 'asset_type']
+
+    def validate_symbol(self, value):
+        symbol = value.strip().upper()
+        if not SYMBOL_RE.match(symbol):
+            raise serializers.ValidationError("Enter a ticker like VOO, BRK.B or BTCUSD.")
+        return symbol
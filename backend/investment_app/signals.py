@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from personal_project.memo_cache import invalidate_owner
+from .models import Investment
+
+
+@receiver(post_save, sender=Investment)
+@receiver(post_delete, sender=Investment)
+def investment_changed(sender, instance, **kwargs):
+    # projections and retirement scenarios memoized for this user are now stale
+    invalidate_owner(instance.user_id)
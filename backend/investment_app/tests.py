@@ -1,3 +1,175 @@
-from django.test import TestCase
+import json
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from user_app.models import App_user
+from .gains import SYMBOL_FAILURE_TTL, SYMBOL_GAINS_TTL
+from .market_data import HistoricalRowParser, HistoryWindow, iter_historical_rows
+from .models import PriceSeries, WatchlistItem
+from .price_store import apply_sync, plan_sync
+from .projection import project_balances, project_investments
+
+
+def logged_in_client(email="watcher@example.com"):
+    user = App_user.objects.create_user(username=email, email=email, password="pw")
+    client = APIClient()
+    client.cookies["token"] = Token.objects.create(user=user).key
+    return client, user
+
+
+class WatchlistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client, self.user = logged_in_client()
+
+    def test_duplicate_add_is_a_400(self):
+        self.assertEqual(self.client.post("/api/invest/watchlist/", {"symbol": "VOO"}).status_code, 201)
+        response = self.client.post("/api/invest/watchlist/", {"symbol": "VOO"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_add_losing_the_unique_race_is_a_400(self):
+        WatchlistItem.objects.create(user=self.user, symbol="VOO")
+        # the exists() check passes as if the other add hadn't committed yet
+        with mock.patch("django.db.models.query.QuerySet.exists", return_value=False):
+            response = self.client.post("/api/invest/watchlist/", {"symbol": "VOO"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(WatchlistItem.objects.filter(user=self.user).count(), 1)
+
+    def test_symbols_override_only_accepts_tracked_symbols(self):
+        response = self.client.get("/api/invest/watchlist/gains/?symbols=NOTREAL")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PriceSeries.objects.filter(symbol="NOTREAL").exists())
+
+    def test_symbols_override_keeps_each_symbol_asset_type(self):
+        PriceSeries.objects.create(symbol="BTCUSD", asset_type="crypto", last_fetched=timezone.now())
+        other, _ = logged_in_client("other@example.com")
+        other.post("/api/invest/watchlist/", {"symbol": "ETHUSD", "asset_type": "crypto"})
+        self.client.post("/api/invest/watchlist/", {"symbol": "VOO"})
+        with mock.patch("investment_app.gains.sync_many") as sync:
+            response = self.client.get("/api/invest/watchlist/gains/?symbols=BTCUSD,ETHUSD,VOO")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sync.call_args[0][0], {"BTCUSD": "crypto", "ETHUSD": "crypto", "VOO": "equity"})
+
+    def test_failures_are_cached_for_less_time_than_results(self):
+        self.assertLess(SYMBOL_FAILURE_TTL, SYMBOL_GAINS_TTL)
+
+    def test_failed_fetch_leaves_no_series_row(self):
+        plan = plan_sync({"NOTREAL": "equity"})
+        self.assertFalse(PriceSeries.objects.filter(symbol="NOTREAL").exists())
+        apply_sync(plan, {"NOTREAL": None}, {})
+        self.assertFalse(PriceSeries.objects.filter(symbol="NOTREAL").exists())
+
+
+def split_every(payload, size):
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+
+class HistoryParserTests(SimpleTestCase):
+    ROWS = [
+        {"date": "2024-03-05", "close": 101.5, "label": "Mar 05, 24 \u2013 caf\u00e9"},
+        {"date": "2024-03-04", "close": 100.25, "nested": {"a": [1, 2, {"b": "]"}]}},
+        {"date": "2024-03-01", "close": 99.0},
+    ]
+
+    def payload(self, key="historical"):
+        return json.dumps({"symbol": "VOO", key: self.ROWS, "trailer": [1, 2]}, ensure_ascii=False).encode()
+
+    def test_rows_survive_any_chunk_split(self):
+        payload = self.payload()
+        # 1 byte splits every key, row and multi-byte character; 7 and 50 land mid-token
+        for size in (1, 7, 50, len(payload)):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_historical_rows(split_every(payload, size))), self.ROWS)
+
+    def test_alternate_array_names(self):
+        for key in ("historicalPrice", "historicalData"):
+            self.assertEqual(list(iter_historical_rows(split_every(self.payload(key), 5))), self.ROWS)
+
+    def test_stops_at_the_end_of_the_array(self):
+        parser = HistoricalRowParser()
+        rows = parser.feed(self.payload())
+        self.assertEqual(rows, self.ROWS)
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.feed(b'{"date": "2024-01-01"}'), [])
+
+    def test_payload_without_historical_key_yields_nothing(self):
+        payload = json.dumps({"symbol": "VOO", "Error Message": "Invalid API KEY"}).encode()
+        with mock.patch("builtins.print") as printed:
+            self.assertEqual(list(iter_historical_rows(split_every(payload, 3))), [])
+        self.assertIn("No 'historical' array", printed.call_args[0][0])
+
+    def test_long_preamble_keeps_a_split_key(self):
+        # the parser trims its buffer past 4 KB; a key straddling the trim must still match
+        preamble = b'{"symbol": "VOO", "note": "' + b"x" * 5000 + b'", '
+        payload = preamble + self.payload()[1:]
+        split = payload.index(b'"historical"') + 5
+        self.assertGreater(split, 4096)
+        chunks = [payload[:split], payload[split:]]
+        self.assertEqual(list(iter_historical_rows(chunks)), self.ROWS)
+
+    def test_history_window_stops_at_the_first_row_past_the_cutoff(self):
+        window = HistoryWindow(cutoff=date(2024, 3, 4))
+        self.assertTrue(window.add(self.ROWS[0]))
+        self.assertTrue(window.add({"date": "not a date"}))
+        self.assertTrue(window.add(self.ROWS[1]))
+        self.assertFalse(window.add(self.ROWS[2]))
+        self.assertEqual(window.pairs, [(date(2024, 3, 5), 101.5), (date(2024, 3, 4), 100.25)])
+
+    def test_history_window_keeps_reading_ascending_rows(self):
+        window = HistoryWindow(cutoff=date(2024, 3, 4))
+        # oldest first: the early rows are skipped but reading continues
+        self.assertEqual([window.add(row) for row in reversed(self.ROWS)], [True, True, True])
+        self.assertEqual(window.pairs, [(date(2024, 3, 4), 100.25), (date(2024, 3, 5), 101.5)])
+
+
+def chart_loop(value, rate_pct, contribution, cont_years, years):
+    """
+    Port of InvestChart.jsx computeYearlySeries: contribute, then compound monthly.
+    """
+    val = value
+    out = [val]
+    for month in range(years * 12):
+        if month < cont_years * 12:
+            val = (val + contribution) * (1 + rate_pct / 100 / 12)
+        else:
+            val = val * (1 + rate_pct / 100 / 12)
+        if (month + 1) % 12 == 0:
+            out.append(val)
+    return out
+
+
+class ProjectionTests(SimpleTestCase):
+    CASES = [
+        # value, rate %, monthly contribution, contribution years
+        (10000.0, 7.0, 500.0, 10),
+        (2500.0, 0.0, 100.0, 5),
+        (0.0, 12.5, 1000.0, 40),
+        (50000.0, -3.0, 0.0, 0),
+        (1234.56, 4.25, 75.0, 60),
+    ]
+
+    def test_closed_form_matches_the_chart_loop(self):
+        years = 45
+        values, rates, contributions, cont_years = (np.array(column) for column in zip(*self.CASES))
+        balances = project_balances(values, rates, contributions, cont_years, np.arange(years + 1) * 12)
+        for row, case in zip(balances, self.CASES):
+            np.testing.assert_allclose(row, chart_loop(*case, years), rtol=1e-9, atol=1e-6)
+
+    def test_project_investments_orders_series_and_totals(self):
+        investments = [
+            mock.Mock(id=1, investment_name="small", value=100, rate_of_return=5, contribution=10, contribution_timeline_years=2),
+            mock.Mock(id=2, investment_name="big", value=900, rate_of_return=0, contribution=0, contribution_timeline_years=0),
+        ]
+        result = project_investments(investments, 3, inflation_rate=2.0)
+        self.assertEqual([series["id"] for series in result["series"]], [2, 1])
+        self.assertEqual(result["totals"][0], 1000.0)
+        self.assertEqual(result["series"][0]["data"], [900.0] * 4)
+        np.testing.assert_allclose(result["real_totals"], np.array(result["totals"]) / 1.02 ** np.arange(4), atol=0.01)
+        self.assertEqual(project_investments([], 3)["series"], [])
@@ -0,0 +1,76 @@
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+def parse_date(value) -> Optional[date]:
+    """
+    Accept a date, a datetime, or an FMP style 'YYYY-MM-DD' / 'YYYY-MM-DD HH:MM:SS' string.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except Exception:
+        return None
+
+
+class TimeSeries:
+    """
+    Daily close series stored as two parallel arrays sorted by date:
+    proleptic-Gregorian ordinals (array 'l') and closes (array 'd').
+    Built once per fetch/load, then every "close on or before" lookup is a bisection
+    instead of re-parsing and re-sorting the history.
+    """
+
+    __slots__ = ("ordinals", "closes")
+
+    def __init__(self, ordinals: array, closes: array):
+        self.ordinals = ordinals
+        self.closes = closes
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[object, float]]) -> "TimeSeries":
+        """
+        Build from (date-like, close) pairs in any order. Unparseable dates and missing
+        closes are dropped; when a date repeats, the later pair wins.
+        """
+        by_ordinal = {}
+        for d, close in pairs:
+            parsed = parse_date(d)
+            if parsed is None or close is None:
+                continue
+            by_ordinal[parsed.toordinal()] = float(close)
+
+        ordinals = array("l", sorted(by_ordinal))
+        closes = array("d", (by_ordinal[o] for o in ordinals))
+        return cls(ordinals, closes)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __bool__(self) -> bool:
+        return len(self.ordinals) > 0
+
+    def __iter__(self) -> Iterator[Tuple[date, float]]:
+        for o, c in zip(self.ordinals, self.closes):
+            yield date.fromordinal(o), c
+
+    @property
+    def first_date(self) -> Optional[date]:
+        return date.fromordinal(self.ordinals[0]) if self.ordinals else None
+
+    @property
+    def last_date(self) -> Optional[date]:
+        return date.fromordinal(self.ordinals[-1]) if self.ordinals else None
+
+    @property
+    def last_price(self) -> Optional[float]:
+        return self.closes[-1] if self.closes else None
+
+    def point_on_or_before(self, target: date) -> Optional[Tuple[date, float]]:
+        i = bisect_right(self.ordinals, target.toordinal())
+        return (date.fromordinal(self.ordinals[i - 1]), self.closes[i - 1]) if i else None
@@ -1,9 +1,20 @@
+from django.conf import settings
 from django.urls import path
-from .views import InvestmentListCreate, InvestmentDetail, InvestmentSum, MarketGainsAPIView
+from .views import (
+    InvestmentListCreate, InvestmentDetail, InvestmentSum, InvestmentProjection, ProjectionCacheStats, MarketGainsAPIView, AsyncMarketGainsView,
+    WatchlistListCreate, WatchlistDelete, WatchlistGains,
+)
+
+MarketGainsView = AsyncMarketGainsView if settings.ASYNC_IO_VIEWS else MarketGainsAPIView
 
 urlpatterns = [
     path('', InvestmentListCreate.as_view(), name='investment_list_create'),
     path('<int:pk>/', InvestmentDetail.as_view(), name='investment_detail'),
     path('sum/', InvestmentSum.as_view(), name='investment_sum'),
-    path('market-gains/', MarketGainsAPIView.as_view(), name='market-gains'),
+    path('projection/', InvestmentProjection.as_view(), name='investment-projection'),
+    path('projection/cache-stats/', ProjectionCacheStats.as_view(), name='projection-cache-stats'),
+    path('market-gains/', MarketGainsView.as_view(), name='market-gains'),
+    path('watchlist/', WatchlistListCreate.as_view(), name='watchlist-list-create'),
+    path('watchlist/<int:pk>/', WatchlistDelete.as_view(), name='watchlist-delete'),
+    path('watchlist/gains/', WatchlistGains.as_view(), name='watchlist-gains'),
 ]
@@ -2,19 +2,24 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from datetime import date
 from .models import Investment
 from .serializers import InvestmentSerializer
+from .projection import MAX_PROJECTION_YEARS, PROJECTION_CACHE, investment_inputs, project_investments
+from personal_project.listing import list_response
+from personal_project.memo_cache import all_stats
+from retire_app.economic_data import INFLATION_AVERAGE
+from user_app.totals import get_totals
 from user_app.views import TokenReq
-from django.db.models import Sum
-import os
 from dotenv import load_dotenv
 
 
 class InvestmentListCreate(TokenReq):
+    orderings = ("investment_name", "value", "rate_of_return")
+
     def get(self, request):
         investments = Investment.objects.filter(user=request.user)
-        serializer = InvestmentSerializer(investments, many=True)
-        return Response(serializer.data)
+        return list_response(request, investments, InvestmentSerializer, self.orderings)
 
     def post(self, request):
         data = request.data.copy()
@@ -47,261 +52,247 @@ class InvestmentDetail(TokenReq):
 
 class InvestmentSum(TokenReq):
     def get(self, request):
-        # print("at the InvestmentSum View")
-        total_value = (
-            Investment.objects.filter(user=request.user).aggregate(total=Sum("value"))[
-                "total"
-            ]
-            or 0
-        )
-        # print("total Value", total_value)
+        # maintained on every investment write, so this is a primary-key lookup (see user_app/totals.py)
+        total_value = get_totals(request.user.id).investment_total
         return Response({"total_investment_value": total_value})
 
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-import requests
-from datetime import datetime, timedelta
-from typing import Dict, Optional
-
-API_KEY = os.getenv('MARKET_KEY') 
 
+class InvestmentProjection(TokenReq):
+    """
+    GET ?years=N (default 30)&inflation=R (optional): projected yearly balances for all of
+    the user's investments, shaped for the investment chart (labels, one series per
+    investment, totals, max_total), with the same series deflated to today's dollars.
+    The inflation rate defaults to the locally stored FRED average (the value
+    /api/retire/inflation/ serves). Computed in closed form on the server; see projection.py.
+    """
 
-def build_fmp_url_for_symbol(
-    symbol: str, is_index: bool = False, is_crypto: bool = False
-) -> str:
-
-    base = "https://financialmodelingprep.com/api/v3"
-    if is_crypto:
-        return f"{base}/historical-price-eod/light/{symbol}"
-    if is_index:
-        return f"{base}/historical-price-full/index/{symbol}"
-    return f"{base}/historical-price-full/{symbol}"
+    def get(self, request):
+        try:
+            years = int(request.query_params.get("years", 30))
+            inflation = request.query_params.get("inflation")
+            inflation = float(inflation) if inflation not in (None, "") else None
+        except ValueError:
+            return Response({"detail": "years must be an integer and inflation a number."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= years <= MAX_PROJECTION_YEARS:
+            return Response(
+                {"detail": f"years must be between 0 and {MAX_PROJECTION_YEARS}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if inflation is not None and not -50 < inflation <= 100:
+            return Response({"detail": "inflation must be within -50-100."}, status=status.HTTP_400_BAD_REQUEST)
+        if inflation is None:
+            # None when no inflation series was ever stored; the real fields are then left empty
+            inflation, _ = INFLATION_AVERAGE.get()
+
+        investments = list(Investment.objects.filter(user=request.user))
+        # labels are calendar years, so the current year is part of the inputs
+        inputs = {
+            "years": years,
+            "year": date.today().year,
+            "inflation": inflation,
+            "investments": investment_inputs(investments),
+        }
+        result = PROJECTION_CACHE.get_or_compute(
+            request.user.id, inputs, lambda: project_investments(investments, years, inflation)
+        )
+        return Response(result)
 
 
-def parse_historical_to_dict(json_resp: Dict) -> Optional[Dict[str, Dict]]:
+class ProjectionCacheStats(TokenReq):
     """
-    FMP historical responses have a top-level 'historical' list with entries that
-    contain at least 'date' and 'close' (or 'adjClose').
-    This returns a dict keyed by 'YYYY-MM-DD' -> row dict for quick lookup.
+    Hit / miss / eviction counters of this process's projection and readiness memo caches.
     """
-    if not isinstance(json_resp, dict):
-        return None
-    # FMP uses key 'historical' (array of objects)
-    hist = (
-        json_resp.get("historical")
-        or json_resp.get("historicalPrice")
-        or json_resp.get("historicalData")
-    )
-    if not hist or not isinstance(hist, list):
-        return None
-    out = {}
-    for row in hist:
-        d = row.get("date")
-        if d:
-            out[d] = row
-    return out if out else None
 
+    def get(self, request):
+        return Response(all_stats())
 
-def price_from_row(row: Dict) -> Optional[float]:
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from datetime import datetime, timezone as dt_timezone
+from django.db import IntegrityError, transaction
+from django.db.models import Value
+from django.http import JsonResponse
+from django.views import View
+from .gains import compute_gains, acompute_gains, cached_symbol_gains
+from .models import PriceSeries, WatchlistItem
+from user_app.models import App_user
+from personal_project.response_cache import StaleWhileRevalidateCache
+from .serializers import WatchlistItemSerializer, SYMBOL_RE
+
+# Market gains are the same for every caller and only move once a day, so the response
+# is cached: served as-is for FRESH_TTL, then served stale for up to STALE_TTL while a
+# single background refresh runs.
+MARKET_GAINS_FRESH_TTL = 10 * 60
+MARKET_GAINS_STALE_TTL = 6 * 60 * 60
+
+MARKET_ASSETS = {
+    "VOO": {"symbol": "VOO", "type": "equity"},
+    "QQQ": {"symbol": "QQQ", "type": "equity"},
+    "DOW JONES": {"symbol": "DIA", "type": "equity"},  # ETF proxy
+    "Bitcoin": {"symbol": "BTCUSD", "type": "crypto"},
+}
+
+# Upper bound on symbols per watchlist / ?symbols= request.
+MAX_WATCHLIST_SYMBOLS = 50
+
+
+def compute_market_gains() -> dict:
     """
-    Extract a numeric price from a FMP historical row. Prefer 'close', then 'adjClose', then try numeric values.
+    Gain/loss percentages over Day / Week / Month / Year for every MARKET_ASSETS entry.
+    Prices are served from the local PricePoint store, which only goes to FMP for rows
+    newer than what it already holds (see gains.compute_gains / price_store.sync_many).
     """
-    for candidate in ("close", "adjClose", "adj_close", "adjclose", "closePrice"):
-        if candidate in row:
-            try:
-                return float(row[candidate])
-            except Exception:
-                return None
-    # fallback: try any numeric value
-    for v in row.values():
-        try:
-            return float(v)
-        except Exception:
-            continue
-    return None
-
-
-def find_price_on_or_before(
-    timeseries: Dict[str, Dict], target_date: datetime.date
-) -> Optional[float]:
-    try:
-        available_dates = sorted(
-            [datetime.strptime(d, "%Y-%m-%d").date() for d in timeseries.keys()],
-            reverse=True,
-        )
-    except Exception:
-        return None
-    for dt in available_dates:
-        if dt <= target_date:
-            row = timeseries.get(dt.strftime("%Y-%m-%d"))
-            return price_from_row(row) if row else None
-    return None
+    return compute_gains(MARKET_ASSETS)
+
 
+def has_any_gains(results: dict) -> bool:
+    # don't pin an all-error response in the cache for the whole TTL
+    return any("error" not in asset for asset in results.values())
 
-def pct_change(new: float, old: float) -> Optional[float]:
-    try:
-        if old == 0:
-            return None
-        return (new - old) / old * 100.0
-    except Exception:
-        return None
+
+def with_cache_meta(results: dict, meta: dict) -> dict:
+    body = dict(results)
+    body["cache"] = {
+        "as_of": datetime.fromtimestamp(meta["as_of"], tz=dt_timezone.utc).isoformat(),
+        "age_seconds": meta["age_seconds"],
+        "status": meta["status"],
+    }
+    return body
 
 
 class MarketGainsAPIView(APIView):
     """
     GET: returns JSON with gain/loss percentages for VOO, QQQ, DOW (DIA), and Bitcoin
-    over Day / Week / Month / Year. Preserves existing output shape.
+    over Day / Week / Month / Year. Preserves existing output shape, plus a top-level
+    "cache" object ({as_of, age_seconds, status}) and an Age header for freshness monitoring.
+
+    The four changes_pct figures are read from the stored return snapshot (the 1D, 1W, 1M
+    and 1Y horizons in returns.py), so they are measured back from the asset's last
+    trading day ("as_of"), not from today, and Month/Year are calendar months/years rather
+    than 30/365 days. Before the snapshots they counted back from today's date, so a
+    weekend or holiday request showed a different base close than it does now.
     """
 
-    def fetch_crypto_timeseries(self, symbol: str, from_date: str) -> Optional[Dict[str, Dict]]:
-        """
-        Fetch crypto using the FMP EOD endpoint and normalize to dict[YYYY-MM-DD] -> row.
-        Returns a dict keyed by date or None on failure.
-        """
-        # light endpoint for eod data (documented)
-        url = "https://financialmodelingprep.com/stable/historical-price-eod/light"
-        params = {"symbol": symbol, "from": from_date}
-        if API_KEY:
-            params["apikey"] = API_KEY
+    cache = StaleWhileRevalidateCache(
+        "investment_app:market_gains",
+        compute_market_gains,
+        fresh_ttl=MARKET_GAINS_FRESH_TTL,
+        stale_ttl=MARKET_GAINS_STALE_TTL,
+        cacheable=has_any_gains,
+        acompute=lambda: acompute_gains(MARKET_ASSETS),
+    )
 
-        try:
-            resp = requests.get(url, params=params, timeout=20)
-            print(f"[MarketGains:FMP:crypto] Requesting {resp.url} -> status {resp.status_code}")
-            # attempt JSON parse
-            try:
-                data = resp.json() if resp.headers.get("Content-Type", "").startswith("application/json") else None
-            except Exception:
-                data = None
-
-            if data is None:
-                return None
-
-            rows = None
-            if isinstance(data, list):
-                rows = data
-            elif isinstance(data, dict):
-                # common: {"symbol": "BTCUSD", "historical": [...]}
-                rows = data.get("historical") or data.get("data") or data.get("rows")
-                if rows is None:
-                    # fallback: if dict contains exactly one list value, use that
-                    for v in data.values():
-                        if isinstance(v, list):
-                            rows = v
-                            break
-
-            if not rows or not isinstance(rows, list):
-                return None
-
-            out = {}
-            for row in rows:
-                if not isinstance(row, dict):
-                    continue
-                date_str = row.get("date") or row.get("datetime") or row.get("timestamp")
-                if not date_str:
-                    continue
-                out[date_str] = row
-            return out if out else None
+    def get(self, request, *args, **kwargs):
+        results, meta = self.cache.get()
+        response = Response(with_cache_meta(results, meta), status=status.HTTP_200_OK)
+        response["Age"] = str(int(meta["age_seconds"]))
+        return response
 
-        except Exception as exc:
-            print(f"[MarketGains:FMP:crypto] Exception fetching crypto timeseries: {exc}")
-            return None
 
+class AsyncMarketGainsView(View):
+    """
+    MarketGainsAPIView for ASGI deployments, sharing its cache. Cache hits never leave the
+    event loop and a miss awaits the FMP batch on httpx, so one worker can hold many
+    requests that are waiting on a slow upstream.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        results, meta = await MarketGainsAPIView.cache.aget()
+        response = JsonResponse(with_cache_meta(results, meta), status=status.HTTP_200_OK)
+        response["Age"] = str(int(meta["age_seconds"]))
+        return response
 
-    def get(self, request, *args, **kwargs):
-        assets = {
-            "VOO": {"symbol": "VOO", "type": "equity"},
-            "QQQ": {"symbol": "QQQ", "type": "equity"},
-            "DOW JONES": {"symbol": "DIA", "type": "equity"},  # ETF proxy
-            "Bitcoin": {"symbol": "BTCUSD", "type": "crypto"},
-        }
 
-        results = {}
-        now = datetime.now().date()
+# --- WATCHLIST VIEWS ---
+class WatchlistListCreate(TokenReq):
+    def get(self, request):
+        items = WatchlistItem.objects.filter(user=request.user).order_by("symbol")
+        serializer = WatchlistItemSerializer(items, many=True)
+        return Response(serializer.data)
 
-        for name, cfg in assets.items():
+    def post(self, request):
+        serializer = WatchlistItemSerializer(data=request.data)
+        if serializer.is_valid():
+            symbol = serializer.validated_data["symbol"]
+            duplicate = Response({"error": f"{symbol} is already on your watchlist."}, status=status.HTTP_400_BAD_REQUEST)
             try:
-                is_crypto = cfg["type"] == "crypto"
-                is_index = cfg["type"] == "index"
-                symbol = cfg["symbol"]
-
-                # --- CRYPTO PATH (only changed code) ---
-                if is_crypto:
-                    # Use the stable light EOD endpoint with a from param (1 year ago)
-                    one_year_ago = (now - timedelta(days=365)).strftime("%Y-%m-%d")
-                    ts = self.fetch_crypto_timeseries(symbol, one_year_ago)
-
-                    if not ts:
-                        results[name] = {
-                            "error": "Could not find historical rows in FMP crypto light response.",
-                        }
-                        continue
-
-                # --- EQUITY / ETF PATH (unchanged logic) ---
-                else:
-                    url = build_fmp_url_for_symbol(symbol, is_index=is_index, is_crypto=False)
-                    params = {}
-                    if API_KEY:
-                        params["apikey"] = API_KEY
-                    # keep the serietype parameter if your build expects it (harmless for equities)
-                    params["serietype"] = "line"
-
-                    resp = requests.get(url, params=params, timeout=20)
-                    print(f"[MarketGains:FMP:equity] Requesting {resp.url} -> status {resp.status_code}")
-
-                    data = None
-                    try:
-                        data = resp.json() if resp.headers.get("Content-Type", "").startswith("application/json") else None
-                    except Exception:
-                        data = None
-
-                    if data is None:
-                        results[name] = {
-                            "error": "FMP returned non-JSON response for equity.",
-                            "status_code": resp.status_code,
-                        }
-                        continue
-
-                    # use your existing parser for equities (expects dict with 'historical' list)
-                    ts = parse_historical_to_dict(data)
-                    if not ts:
-                        # include top-level keys for easier debugging
-                        debug_keys = list(data.keys()) if isinstance(data, dict) else []
-                        results[name] = {
-                            "error": "Could not find 'historical' data in FMP response for equity.",
-                            "debug": {"top_level_keys": debug_keys},
-                        }
-                        continue
-
-                # At this point `ts` is a dict keyed by 'YYYY-MM-DD' -> row
-                latest_date_str = sorted(ts.keys(), reverse=True)[0]
-                latest_price = price_from_row(ts[latest_date_str])
-                if latest_price is None:
-                    results[name] = {"error": "Couldn't parse latest price for symbol."}
-                    continue
+                with transaction.atomic():
+                    # lock the user row so concurrent adds can't both pass the limit check
+                    list(App_user.objects.select_for_update().filter(pk=request.user.pk).values_list("pk", flat=True))
+                    items = WatchlistItem.objects.filter(user=request.user)
+                    if items.filter(symbol=symbol).exists():
+                        return duplicate
+                    if items.count() >= MAX_WATCHLIST_SYMBOLS:
+                        return Response(
+                            {"error": f"You can only watch {MAX_WATCHLIST_SYMBOLS} symbols."},
+                            status=status.HTTP_400_BAD_REQUEST,
+                        )
+                    serializer.save(user=request.user)
+            except IntegrityError:
+                # lost a race with another add of the same symbol (unique_user_watchlist_symbol)
+                return duplicate
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class WatchlistDelete(TokenReq):
+    def delete(self, request, pk):
+        item = get_object_or_404(WatchlistItem, id=pk, user=request.user)
+        item.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-                targets = {
-                    "Day": now - timedelta(days=1),
-                    "Week": now - timedelta(days=7),
-                    "Month": now - timedelta(days=30),
-                    "Year": now - timedelta(days=365),
-                }
-                asset_out = {}
-                for label, target_date in targets.items():
-                    past_price = find_price_on_or_before(ts, target_date)
-                    if past_price is None:
-                        asset_out[label] = None
-                    else:
-                        ch = pct_change(latest_price, past_price)
-                        asset_out[label] = round(ch, 4) if ch is not None else None
-
-                results[name] = {
-                    "as_of": latest_date_str,
-                    "latest_price": round(latest_price, 6),
-                    "changes_pct": asset_out,
-                }
-
-            except Exception as e:
-                results[name] = {"error": f"Exception while fetching/parsing: {str(e)}"}
-
-        return Response(results, status=status.HTTP_200_OK)
+
+class WatchlistGains(TokenReq):
+    """
+    GET: gains for every symbol on the user's watchlist in one call, keyed by symbol, in the
+    same per-asset shape as MarketGainsAPIView. `?symbols=VOO,MSFT` overrides the watchlist,
+    limited to symbols the app already tracks (fetched successfully before, or on someone's
+    watchlist), so a request can't make the server backfill arbitrary tickers. Results are
+    cached per symbol, so users watching the same ticker share one upstream fetch.
+    """
+
+    def get(self, request):
+        raw = request.query_params.get("symbols")
+        if raw:
+            symbols = {}
+            for part in raw.split(","):
+                symbol = part.strip().upper()
+                if not symbol:
+                    continue
+                if not SYMBOL_RE.match(symbol):
+                    return Response({"error": f"Invalid symbol: {part}"}, status=status.HTTP_400_BAD_REQUEST)
+                symbols[symbol] = None
+            # asset types from the stored series, else from a watchlist entry, in one query
+            rows = (
+                PriceSeries.objects.filter(symbol__in=list(symbols), last_fetched__isnull=False)
+                .annotate(source=Value(0)).values_list("symbol", "asset_type", "source")
+                .union(
+                    WatchlistItem.objects.filter(symbol__in=list(symbols))
+                    .annotate(source=Value(1)).values_list("symbol", "asset_type", "source"),
+                    all=True,
+                )
+                .order_by("source")
+            )
+            for symbol, asset_type, _ in rows:
+                if symbols[symbol] is None:
+                    symbols[symbol] = asset_type
+            unknown = sorted(symbol for symbol, asset_type in symbols.items() if asset_type is None)
+            if unknown:
+                return Response(
+                    {"error": f"Add {', '.join(unknown)} to your watchlist first."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        else:
+            symbols = dict(
+                WatchlistItem.objects.filter(user=request.user).values_list("symbol", "asset_type")
+            )
+
+        if len(symbols) > MAX_WATCHLIST_SYMBOLS:
+            return Response(
+                {"error": f"At most {MAX_WATCHLIST_SYMBOLS} symbols per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not symbols:
+            return Response({}, status=status.HTTP_200_OK)
+        return Response(cached_symbol_gains(symbols), status=status.HTTP_200_OK)
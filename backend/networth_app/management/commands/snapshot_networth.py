@@ -0,0 +1,26 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from networth_app.snapshots import SNAPSHOT_BATCH_SIZE, capture_snapshots
+
+
+class Command(BaseCommand):
+    help = "Record every user's net-worth snapshot for one day (run nightly; reruns overwrite that day)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="snapshot date as YYYY-MM-DD (default: today)")
+        parser.add_argument("--batch-size", type=int, default=SNAPSHOT_BATCH_SIZE, help="users per aggregate query and insert")
+
+    def handle(self, *args, **options):
+        day = None
+        if options["date"]:
+            try:
+                day = date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError(f"Invalid --date {options['date']!r}; expected YYYY-MM-DD")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        written = capture_snapshots(day, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} net-worth snapshot(s)"))
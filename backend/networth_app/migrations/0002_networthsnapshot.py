@@ -0,0 +1,32 @@
+# Generated by Django 5.0.3 on 2026-10-18 21:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('networth_app', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NetWorthSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('asset_total', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('liability_total', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('investment_total', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('net_worth', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='networth_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='networthsnapshot',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='unique_user_snapshot_date'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.3 on 2026-10-18 21:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('networth_app', '0002_networthsnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['user', 'id'], name='asset_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['user', 'name', 'id'], name='asset_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['user', 'amount', 'id'], name='asset_user_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='liability',
+            index=models.Index(fields=['user', 'id'], name='liability_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='liability',
+            index=models.Index(fields=['user', 'name', 'id'], name='liability_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='liability',
+            index=models.Index(fields=['user', 'amount', 'id'], name='liability_user_amount_idx'),
+        ),
+    ]
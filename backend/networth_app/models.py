@@ -7,6 +7,13 @@ class Asset(models.Model):
     name = models.CharField(max_length=100)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="asset_user_id_idx"),
+            models.Index(fields=["user", "name", "id"], name="asset_user_name_idx"),
+            models.Index(fields=["user", "amount", "id"], name="asset_user_amount_idx"),
+        ]
+
     def __str__(self):
         return f"{self.name} - ${self.amount}"
 
@@ -16,5 +23,34 @@ class Liability(models.Model):
     name = models.CharField(max_length=100)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="liability_user_id_idx"),
+            models.Index(fields=["user", "name", "id"], name="liability_user_name_idx"),
+            models.Index(fields=["user", "amount", "id"], name="liability_user_amount_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} - ${self.amount}"
+
+class NetWorthSnapshot(models.Model):
+    """
+    One user's totals as of one day, written in bulk by the snapshot_networth command (see
+    snapshots.py). Rows are only ever read one user at a time over a date range, so the
+    (user, date) unique index is the only index: it keeps one row per user per day and
+    serves the history query, and the user column doesn't get a separate FK index.
+    """
+    user = models.ForeignKey(App_user, on_delete=models.CASCADE, db_index=False, related_name="networth_snapshots")
+    date = models.DateField()
+    asset_total = models.DecimalField(max_digits=14, decimal_places=2)
+    liability_total = models.DecimalField(max_digits=14, decimal_places=2)
+    investment_total = models.DecimalField(max_digits=14, decimal_places=2)
+    net_worth = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "date"], name="unique_user_snapshot_date")
+        ]
+
     def __str__(self):
-        return f"{self.name} - ${self.amount}"
\ No newline at end of file
+        return f"{self.user_id} - {self.date} - ${self.net_worth}"
@@ -0,0 +1,66 @@
+from datetime import date
+from typing import Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from investment_app.models import Investment
+from personal_project.aggregates import sum_of
+from user_app.models import App_user
+from .models import Asset, Liability, NetWorthSnapshot
+
+# Users per chunk: one aggregate query reads the chunk's totals and one bulk insert writes
+# them, so a run costs two queries per SNAPSHOT_BATCH_SIZE users.
+SNAPSHOT_BATCH_SIZE = 1000
+
+SNAPSHOT_FIELDS = ["asset_total", "liability_total", "investment_total", "net_worth"]
+
+
+def capture_snapshots(day: Optional[date] = None, batch_size: int = SNAPSHOT_BATCH_SIZE) -> int:
+    """
+    Write every user's NetWorthSnapshot for `day` (default today). Users are walked in
+    primary-key order in chunks (keyset, so later chunks cost the same as the first); each
+    chunk's totals come from one query of Sum subqueries against the user rows and go in
+    with one bulk_create. Rerunning for the same day overwrites that day's rows. Returns
+    the number of snapshots written.
+    """
+    day = day or timezone.localdate()
+    written = 0
+    last_pk = 0
+    while True:
+        rows = list(
+            App_user.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .annotate(
+                asset_total=sum_of(Asset),
+                liability_total=sum_of(Liability),
+                investment_total=sum_of(Investment, "value"),
+            )
+            .values_list("pk", "asset_total", "liability_total", "investment_total")[:batch_size]
+        )
+        if not rows:
+            break
+        snapshots = [
+            NetWorthSnapshot(
+                user_id=pk,
+                date=day,
+                asset_total=assets,
+                liability_total=liabilities,
+                investment_total=investments,
+                net_worth=assets - liabilities,
+            )
+            for pk, assets, liabilities, investments in rows
+        ]
+        with transaction.atomic():
+            NetWorthSnapshot.objects.bulk_create(
+                snapshots,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["user", "date"],
+                update_fields=SNAPSHOT_FIELDS,
+            )
+        written += len(snapshots)
+        last_pk = rows[-1][0]
+        if len(rows) < batch_size:
+            break
+    return written
@@ -1,3 +1,75 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import CommandError, call_command
 from django.test import TestCase
 
-# Create your tests here.
+from investment_app.models import Investment
+from user_app.models import App_user
+from .models import Asset, Liability, NetWorthSnapshot
+from .snapshots import capture_snapshots
+
+DAY = date(2026, 10, 17)
+
+
+class NetWorthSnapshotTests(TestCase):
+    def setUp(self):
+        self.users = [
+            App_user.objects.create_user(username=email, email=email, password="pw")
+            for email in ("a@example.com", "b@example.com", "c@example.com")
+        ]
+        first, second, _ = self.users
+        Asset.objects.create(user=first, name="House", amount=300000)
+        Asset.objects.create(user=first, name="Car", amount=12000)
+        Liability.objects.create(user=first, name="Mortgage", amount=200000)
+        Investment.objects.create(
+            user=first, investment_name="Brokerage", value=50000, rate_of_return=7,
+            contribution=0, contribution_timeline_years=0,
+        )
+        Liability.objects.create(user=second, name="Card", amount=1500)
+
+    def totals(self, day=DAY):
+        return {
+            s.user_id: (s.asset_total, s.liability_total, s.investment_total, s.net_worth)
+            for s in NetWorthSnapshot.objects.filter(date=day)
+        }
+
+    def test_every_user_is_written_across_batches(self):
+        # batch_size 2 splits the three users over two chunks
+        self.assertEqual(capture_snapshots(DAY, batch_size=2), 3)
+        first, second, third = (u.id for u in self.users)
+        self.assertEqual(self.totals(), {
+            first: (Decimal("312000"), Decimal("200000"), Decimal("50000"), Decimal("112000")),
+            second: (Decimal("0"), Decimal("1500"), Decimal("0"), Decimal("-1500")),
+            third: (Decimal("0"), Decimal("0"), Decimal("0"), Decimal("0")),
+        })
+
+    def test_rerunning_the_same_day_overwrites_it(self):
+        capture_snapshots(DAY)
+        first = self.users[0]
+        Asset.objects.filter(user=first, name="Car").delete()
+        Liability.objects.create(user=first, name="Loan", amount=1000)
+
+        self.assertEqual(capture_snapshots(DAY, batch_size=1), 3)
+        self.assertEqual(NetWorthSnapshot.objects.count(), 3)
+        self.assertEqual(
+            self.totals()[first.id],
+            (Decimal("300000"), Decimal("201000"), Decimal("50000"), Decimal("99000")),
+        )
+
+    def test_another_day_adds_rows(self):
+        capture_snapshots(DAY)
+        capture_snapshots(date(2026, 10, 18))
+        self.assertEqual(NetWorthSnapshot.objects.count(), 6)
+        self.assertEqual(self.totals(), self.totals(date(2026, 10, 18)))
+
+    def test_command(self):
+        out = StringIO()
+        call_command("snapshot_networth", "--date", "2026-10-17", "--batch-size", "2", stdout=out)
+        self.assertIn("Wrote 3 net-worth snapshot(s)", out.getvalue())
+        self.assertEqual(len(self.totals()), 3)
+        with self.assertRaises(CommandError):
+            call_command("snapshot_networth", "--date", "17/10/2026")
+        with self.assertRaises(CommandError):
+            call_command("snapshot_networth", "--batch-size", "0")
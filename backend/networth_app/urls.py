@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import ( AssetListCreate, AssetDelete, LiabilityListCreate, LiabilityDelete )
+from .views import ( AssetListCreate, AssetDelete, LiabilityListCreate, LiabilityDelete, NetWorthHistory )
 
 urlpatterns = [
     #Assets
@@ -9,4 +9,7 @@ urlpatterns = [
     #Liabilities
     path('liability/', LiabilityListCreate.as_view(), name='liability-list-create'),
     path('liability/<int:pk>/', LiabilityDelete.as_view(), name='liability-delete'),
+
+    #Daily snapshots
+    path('history/', NetWorthHistory.as_view(), name='networth-history'),
 ]
\ No newline at end of file
@@ -1,19 +1,23 @@
+from datetime import date
+
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 
-from .models import Asset, Liability
+from .models import Asset, Liability, NetWorthSnapshot
 from .serializers import AssetSerializer, LiabilitySerializer
+from personal_project.listing import list_response
 from user_app.views import TokenReq
 
 
 # --- ASSET VIEWS ---
 class AssetListCreate(TokenReq):
+    orderings = ("name", "amount")
+
     def get(self, request):
         assets = Asset.objects.filter(user=request.user)
-        serializer = AssetSerializer(assets, many=True)
-        return Response(serializer.data)
+        return list_response(request, assets, AssetSerializer, self.orderings)
     
     def post(self, request):
         data = request.data.copy()
@@ -31,10 +35,11 @@ class AssetDelete(TokenReq):
 
 # --- LIABLITY VIEWS ---
 class LiabilityListCreate(TokenReq):
+    orderings = ("name", "amount")
+
     def get(self, request):
         liabilities = Liability.objects.filter(user=request.user)
-        serializer = LiabilitySerializer(liabilities, many=True)
-        return Response(serializer.data)
+        return list_response(request, liabilities, LiabilitySerializer, self.orderings)
     
     def post(self, request):
         data = request.data.copy()
@@ -49,3 +54,32 @@ class LiabilityDelete(TokenReq):
         liability = get_object_or_404(Liability, id=pk, user=request.user)
         liability.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# --- HISTORY VIEW ---
+class NetWorthHistory(TokenReq):
+    """
+    The user's daily net-worth snapshots, oldest first, optionally limited to
+    ?start=YYYY-MM-DD and/or ?end=YYYY-MM-DD (both inclusive). The filter and ordering
+    are a range scan of the (user, date) unique index, so the cost depends on the range
+    asked for, not on how many snapshots are stored overall.
+    """
+    def get(self, request):
+        bounds = {}
+        for param in ("start", "end"):
+            raw = request.query_params.get(param)
+            if raw:
+                try:
+                    bounds[param] = date.fromisoformat(raw)
+                except ValueError:
+                    return Response({"detail": f"{param} must be a date (YYYY-MM-DD)."}, status=status.HTTP_400_BAD_REQUEST)
+        if "start" in bounds and "end" in bounds and bounds["start"] > bounds["end"]:
+            return Response({"detail": "start must be on or before end."}, status=status.HTTP_400_BAD_REQUEST)
+
+        snapshots = NetWorthSnapshot.objects.filter(user=request.user)
+        if "start" in bounds:
+            snapshots = snapshots.filter(date__gte=bounds["start"])
+        if "end" in bounds:
+            snapshots = snapshots.filter(date__lte=bounds["end"])
+        rows = snapshots.order_by("date").values("date", "asset_total", "liability_total", "investment_total", "net_worth")
+        return Response(list(rows))
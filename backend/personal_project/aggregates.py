@@ -0,0 +1,32 @@
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def sum_of(model, field="amount", **filters):
+    """
+    Correlated subquery: the user's total of `field` over `model` rows (0 when none).
+    Annotate it onto an App_user queryset to get many users' totals in one query.
+    """
+    rows = (
+        model.objects.filter(user=OuterRef("pk"), **filters)
+        .order_by()
+        .values("user")
+        .annotate(total=Sum(field))
+        .values("total")
+    )
+    return Coalesce(Subquery(rows, output_field=MONEY), Value(Decimal("0")), output_field=MONEY)
+
+
+def count_of(model, **filters):
+    rows = (
+        model.objects.filter(user=OuterRef("pk"), **filters)
+        .order_by()
+        .values("user")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), Value(0))
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'personal_project.settings')
+# serve the I/O-bound endpoints with their async views (see settings.ASYNC_IO_VIEWS)
+os.environ.setdefault('ASYNC_IO_VIEWS', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,96 @@
+"""
+Opt-in ordering, sparse fieldsets and cursor pagination for the per-user list endpoints.
+
+Without query parameters a list endpoint answers exactly as before: every row, as a plain
+array, in id order. The parameters can be combined:
+
+- ?ordering=<field> or ?ordering=-<field> sorts by one of the view's allowed fields, with
+  id as the tie-breaker. Each allowed field has a matching (user, field, id) index on its
+  model, so the database reads the user's rows already in order instead of sorting them.
+- ?fields=id,name returns only those serializer fields, and loads only those columns.
+- ?page_size=N and/or ?cursor=<token> switch the response to a page
+  ({"next", "previous", "results"}) of at most N rows (default DEFAULT_PAGE_SIZE, capped at
+  MAX_PAGE_SIZE). Pages are DRF cursor pages: keyset reads (WHERE field > last seen value)
+  that only skip rows tied with the last value seen, so a page deep into the list costs
+  about the same as the first, and rows added or removed between requests don't shift
+  later pages.
+"""
+from typing import Iterable
+
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class ListCursorPagination(CursorPagination):
+    page_size = DEFAULT_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = MAX_PAGE_SIZE
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+
+def parse_ordering(raw, orderings: Iterable[str]):
+    """
+    ?ordering as an order_by() tuple ending in id, so the order is total and cursors are
+    stable. 400 when the field isn't one the view allows.
+    """
+    if not raw:
+        return ("id",)
+    field = raw[1:] if raw.startswith("-") else raw
+    if field == "id":
+        return (raw,)
+    if field not in orderings:
+        allowed = ", ".join(["id", *orderings])
+        raise ParseError(f"ordering must be one of: {allowed} (prefix with - to reverse).")
+    return (raw, "-id" if raw.startswith("-") else "id")
+
+
+def parse_fields(raw, serializer_class):
+    """
+    ?fields as a list of the serializer's field names, or None for every field.
+    """
+    if not raw:
+        return None
+    available = list(serializer_class().fields)
+    fields = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in fields if name not in available]
+    if unknown or not fields:
+        raise ParseError(f"fields must be a comma-separated list of: {', '.join(available)}.")
+    return fields
+
+
+def list_response(request, queryset, serializer_class, orderings: Iterable[str] = ()):
+    """
+    Serialize the user's `queryset` for a list endpoint, applying ?ordering, ?fields and
+    cursor pagination as described in the module docstring.
+    """
+    params = request.query_params
+    ordering = parse_ordering(params.get("ordering"), orderings)
+    fields = parse_fields(params.get("fields"), serializer_class)
+
+    queryset = queryset.order_by(*ordering)
+    if fields is not None:
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        sort_fields = [name.lstrip("-") for name in ordering]
+        queryset = queryset.only(*{name for name in [*fields, *sort_fields] if name in concrete})
+
+    paginator = None
+    if "cursor" in params or "page_size" in params:
+        paginator = ListCursorPagination(ordering)
+        queryset = paginator.paginate_queryset(queryset, request)
+
+    serializer = serializer_class(queryset, many=True)
+    if fields is not None:
+        for name in set(serializer.child.fields) - set(fields):
+            serializer.child.fields.pop(name)
+    if paginator is not None:
+        return paginator.get_paginated_response(serializer.data)
+    return Response(serializer.data)
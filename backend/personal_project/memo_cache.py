@@ -0,0 +1,119 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Hashable
+
+_registry: Dict[str, "MemoCache"] = {}
+
+
+def content_key(inputs: Any) -> str:
+    """
+    SHA-256 of the inputs' canonical JSON (Decimals, dates etc. via str), so equal inputs
+    always map to the same key in any process.
+    """
+    payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MemoCache:
+    """
+    Bounded in-process memo for results that are a pure function of a user's rows.
+
+    Entries are keyed by content_key(inputs), so a result is reused exactly when its inputs
+    are unchanged, and are dropped least-recently-used once `maxsize` is reached or `ttl`
+    seconds after they were stored. Each entry also records its owner (the user id), so the
+    model signals can evict a user's entries as soon as their rows change instead of leaving
+    them to age out. That eviction frees memory early; correctness never depends on it, since
+    changed rows hash to a new key. Each process keeps its own entries and counters.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 15 * 60):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, owner, value)
+        self._owned = defaultdict(set)  # owner -> keys
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        _registry[name] = self
+
+    def get_or_compute(self, owner: Hashable, inputs: Any, compute: Callable[[], Any]) -> Any:
+        key = content_key(inputs)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+                self._discard(key)
+                self.expirations += 1
+            self.misses += 1
+
+        # computed outside the lock; two requests missing on the same key both compute
+        value = compute()
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (now + self.ttl, owner, value)
+            self._owned[owner].add(key)
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def invalidate(self, owner: Hashable) -> int:
+        with self._lock:
+            keys = self._owned.pop(owner, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._owned.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _discard(self, key: str) -> None:
+        # caller holds the lock
+        _, owner, _ = self._entries.pop(key)
+        keys = self._owned.get(owner)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._owned[owner]
+
+
+def invalidate_owner(owner: Hashable) -> None:
+    """
+    Drop `owner`'s entries from every MemoCache (called from the model signals).
+    """
+    for memo in list(_registry.values()):
+        memo.invalidate(owner)
+
+
+def all_stats() -> Dict[str, Dict]:
+    return {name: memo.stats() for name, memo in _registry.items()}
@@ -0,0 +1,261 @@
+"""
+Shared wrapper for outbound HTTP calls to third-party APIs (FMP, FRED).
+
+Every call goes through one pooled keep-alive session and gets:
+- separate connect / read timeouts, capped by an overall per-call budget
+- bounded retries with full-jitter exponential backoff on timeouts, connection errors, 429 and 5xx
+- a per-host circuit breaker: after FAILURE_THRESHOLD consecutive failures the host is
+  skipped for RESET_TIMEOUT seconds (one trial call is let through after that)
+
+AsyncOutboundClient is the same policy on httpx for async views (it shares the circuit
+breakers with the sync client), so a slow upstream parks a coroutine rather than a worker
+thread.
+"""
+import asyncio
+import random
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+DEFAULT_BUDGET = 20
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.25
+BACKOFF_MAX = 2.0
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a host's circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, host: str, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_in_flight:
+                # let exactly one call probe the host
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    print(f"[Outbound] Circuit for {self.host} opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+_session = None
+_session_lock = threading.Lock()
+
+# one httpx client per event loop: its pooled connections can't be shared across loops
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+
+def get_session() -> requests.Session:
+    """
+    Process-wide keep-alive session. Reusing it lets every outbound call share one
+    urllib3 connection pool instead of doing a fresh TCP/TLS handshake per request.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Keep-alive httpx client for the running event loop (one per ASGI worker in practice).
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=16),
+        )
+    return client
+
+
+def backoff_pause(attempt: int) -> float:
+    # full jitter: sleep anywhere in [0, capped exponential step]
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+class OutboundClient:
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.session = session or get_session()
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+
+    def get(self, url: str, params: Optional[Dict] = None, budget: float = DEFAULT_BUDGET, **kwargs) -> requests.Response:
+        """
+        GET with timeouts, retries and the host's circuit breaker, all inside `budget` seconds.
+        Returns the response (which may still be a 4xx, or a 5xx once retries are exhausted);
+        raises CircuitOpenError, or the last requests exception when every attempt failed.
+        """
+        breaker = get_breaker(urlparse(url).netloc)
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {breaker.host}")
+
+        deadline = time.monotonic() + budget
+        attempt = 0
+        while True:
+            remaining = max(deadline - time.monotonic(), 0.001)
+            timeout = (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+            error = None
+            resp = None
+            try:
+                resp = self.session.get(url, params=params, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error = exc
+            except BaseException:
+                # anything else still ends this attempt; without this a half-open trial
+                # would stay "in flight" and the circuit could never close again
+                breaker.record_failure()
+                raise
+
+            if error is None and resp.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return resp
+
+            breaker.record_failure()
+            attempt += 1
+            pause = backoff_pause(attempt)
+            out_of_budget = time.monotonic() + pause >= deadline
+            if attempt > self.max_retries or out_of_budget or not breaker.allow():
+                if error is not None:
+                    raise error
+                return resp
+            if resp is not None:
+                resp.close()
+            time.sleep(pause)
+
+
+class AsyncOutboundClient:
+    """
+    Async counterpart of OutboundClient (same timeouts, retries, budget and breakers) on httpx.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.client = client
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+
+    async def get(
+        self, url: str, params: Optional[Dict] = None, budget: float = DEFAULT_BUDGET, stream: bool = False
+    ) -> httpx.Response:
+        """
+        Same contract as OutboundClient.get. With stream=True the body is left unread and
+        the caller must `await resp.aclose()` when done with it.
+        """
+        breaker = get_breaker(urlparse(url).netloc)
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {breaker.host}")
+
+        client = self.client or get_async_client()
+        deadline = time.monotonic() + budget
+        attempt = 0
+        while True:
+            remaining = max(deadline - time.monotonic(), 0.001)
+            timeout = httpx.Timeout(
+                min(self.read_timeout, remaining), connect=min(self.connect_timeout, remaining)
+            )
+            error = None
+            resp = None
+            try:
+                request = client.build_request("GET", url, params=params, timeout=timeout)
+                resp = await client.send(request, stream=stream)
+            except httpx.TransportError as exc:
+                error = exc
+            except BaseException:
+                # including CancelledError from a caller's deadline (see OutboundClient.get)
+                breaker.record_failure()
+                raise
+
+            if error is None and resp.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return resp
+
+            breaker.record_failure()
+            attempt += 1
+            pause = backoff_pause(attempt)
+            out_of_budget = time.monotonic() + pause >= deadline
+            if attempt > self.max_retries or out_of_budget or not breaker.allow():
+                if error is not None:
+                    raise error
+                return resp
+            if resp is not None:
+                await resp.aclose()
+            await asyncio.sleep(pause)
+
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import connection
+
+
+class QueryBudget:
+    """
+    Counts the SQL statements run on the default connection inside the block and checks
+    them against `limit` on exit. Going over raises AssertionError under DEBUG (so a
+    regression shows up the first time the page is loaded in development) and is logged
+    otherwise. Counting uses a connection execute wrapper, so it works with DEBUG off.
+    """
+
+    def __init__(self, limit: int, label: str):
+        self.limit = limit
+        self.label = label
+        self.count = 0
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._wrapper.__exit__(exc_type, exc, tb)
+        if exc_type is None and self.count > self.limit:
+            message = f"{self.label} ran {self.count} queries (budget {self.limit})"
+            if settings.DEBUG:
+                raise AssertionError(message)
+            print(f"[QueryBudget] {message}")
+        return False
@@ -0,0 +1,214 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connections
+
+# How long a miss waits for another process's in-flight refresh before computing itself.
+# Kept to a few seconds so a cold miss never pins a worker for the whole lock_ttl.
+DEFAULT_WAIT_TIMEOUT = 5
+
+
+class StaleWhileRevalidateCache:
+    """
+    Caches the result of `compute()` under `key` in Django's cache.
+
+    - younger than fresh_ttl: served as-is ("fresh")
+    - younger than stale_ttl: served as-is ("stale") while one background thread refreshes it
+    - missing/older: computed on the request thread ("miss")
+
+    Refreshes are single-flight: within a process a lock per key collapses concurrent
+    misses into one compute, and a short-lived `cache.add` lock does the same across
+    processes when a shared cache backend is configured. A miss waits at most
+    `wait_timeout` seconds for another process's refresh, then computes itself.
+
+    aget() is the same for async views: hits never leave the event loop, a miss awaits
+    `acompute()` (default: `compute` on a worker thread) behind an asyncio lock (one per
+    event loop), and stale entries are still refreshed on a background thread with
+    `compute`, with the cross-process lock taken through the cache's async API.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        fresh_ttl: float,
+        stale_ttl: float,
+        lock_ttl: float = 60,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+        acompute: Optional[Callable[[], Awaitable[Any]]] = None,
+    ):
+        self.key = key
+        self.lock_key = f"{key}:lock"
+        self.compute = compute
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = min(wait_timeout, lock_ttl)
+        self.cacheable = cacheable or (lambda value: True)
+        self._lock = threading.Lock()
+        self.acompute = acompute or sync_to_async(compute, thread_sensitive=False)
+        # asyncio locks are bound to the loop they're first used on, so one per loop
+        self._alocks = weakref.WeakKeyDictionary()
+
+    def get(self) -> Tuple[Any, Dict]:
+        """
+        Returns (value, meta) where meta carries `as_of` (epoch seconds the value was
+        computed), `age_seconds` and `status` ("fresh", "stale" or "miss").
+        """
+        entry = cache.get(self.key)
+        now = time.time()
+        if entry is not None:
+            age = now - entry["stored_at"]
+            if age < self.fresh_ttl:
+                return entry["value"], self._meta(entry, now, "fresh")
+            if age < self.stale_ttl:
+                self._refresh_in_background()
+                return entry["value"], self._meta(entry, now, "stale")
+
+        with self._lock:
+            # another thread may have filled it while we waited on the lock
+            entry = cache.get(self.key)
+            now = time.time()
+            if entry is not None and now - entry["stored_at"] < self.fresh_ttl:
+                return entry["value"], self._meta(entry, now, "fresh")
+
+            owns_lock = self._wait_for_other_process()
+            entry = cache.get(self.key)
+            now = time.time()
+            if entry is not None and now - entry["stored_at"] < self.fresh_ttl:
+                if owns_lock:
+                    cache.delete(self.lock_key)
+                return entry["value"], self._meta(entry, now, "fresh")
+
+            entry = self._compute_and_store(owns_lock)
+            return entry["value"], self._meta(entry, time.time(), "miss")
+
+    async def aget(self) -> Tuple[Any, Dict]:
+        entry = await cache.aget(self.key)
+        now = time.time()
+        if entry is not None:
+            age = now - entry["stored_at"]
+            if age < self.fresh_ttl:
+                return entry["value"], self._meta(entry, now, "fresh")
+            if age < self.stale_ttl:
+                await self._arefresh_in_background()
+                return entry["value"], self._meta(entry, now, "stale")
+
+        async with self._async_lock():
+            entry = await cache.aget(self.key)
+            now = time.time()
+            if entry is not None and now - entry["stored_at"] < self.fresh_ttl:
+                return entry["value"], self._meta(entry, now, "fresh")
+
+            owns_lock = await self._await_other_process()
+            entry = await cache.aget(self.key)
+            now = time.time()
+            if entry is not None and now - entry["stored_at"] < self.fresh_ttl:
+                if owns_lock:
+                    await cache.adelete(self.lock_key)
+                return entry["value"], self._meta(entry, now, "fresh")
+
+            try:
+                value = await self.acompute()
+                entry = {"value": value, "stored_at": time.time()}
+                if self.cacheable(value):
+                    await cache.aset(self.key, entry, timeout=self.stale_ttl)
+            finally:
+                if owns_lock:
+                    await cache.adelete(self.lock_key)
+            return entry["value"], self._meta(entry, time.time(), "miss")
+
+    def _meta(self, entry: Dict, now: float, status: str) -> Dict:
+        return {
+            "as_of": entry["stored_at"],
+            "age_seconds": round(max(now - entry["stored_at"], 0), 3),
+            "status": status,
+        }
+
+    def _async_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._alocks.get(loop)
+        if lock is None:
+            lock = self._alocks[loop] = asyncio.Lock()
+        return lock
+
+    def _compute_and_store(self, owns_lock: bool) -> Dict:
+        try:
+            value = self.compute()
+            entry = {"value": value, "stored_at": time.time()}
+            if self.cacheable(value):
+                cache.set(self.key, entry, timeout=self.stale_ttl)
+            return entry
+        finally:
+            if owns_lock:
+                cache.delete(self.lock_key)
+
+    def _wait_for_other_process(self) -> bool:
+        """
+        Take the cross-process refresh lock, or wait (up to wait_timeout) for whoever holds
+        it to publish a fresh value. Returns True when we ended up owning the lock; False
+        means either a fresh value appeared or the wait ran out and the caller computes
+        without the lock.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while not cache.add(self.lock_key, 1, timeout=self.lock_ttl):
+            if time.monotonic() >= deadline:
+                return False
+            entry = cache.get(self.key)
+            if entry is not None and time.time() - entry["stored_at"] < self.fresh_ttl:
+                return False
+            time.sleep(0.1)
+        return True
+
+    async def _await_other_process(self) -> bool:
+        deadline = time.monotonic() + self.wait_timeout
+        while not await cache.aadd(self.lock_key, 1, timeout=self.lock_ttl):
+            if time.monotonic() >= deadline:
+                return False
+            entry = await cache.aget(self.key)
+            if entry is not None and time.time() - entry["stored_at"] < self.fresh_ttl:
+                return False
+            await asyncio.sleep(0.1)
+        return True
+
+    def _refresh_in_background(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return
+        if not cache.add(self.lock_key, 1, timeout=self.lock_ttl):
+            self._lock.release()
+            return
+        self._start_refresh_thread()
+
+    async def _arefresh_in_background(self) -> None:
+        # same as _refresh_in_background, without a blocking cache call on the event loop
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            added = await cache.aadd(self.lock_key, 1, timeout=self.lock_ttl)
+        except BaseException:
+            self._lock.release()
+            raise
+        if not added:
+            self._lock.release()
+            return
+        self._start_refresh_thread()
+
+    def _start_refresh_thread(self) -> None:
+        # caller holds self._lock and the cross-process lock; the thread releases both
+        def run():
+            try:
+                self._compute_and_store(owns_lock=True)
+            except Exception as exc:
+                print(f"[SWRCache] Background refresh of {self.key} failed: {exc}")
+            finally:
+                self._lock.release()
+                # this thread's DB connection is never reused
+                connections.close_all()
+
+        threading.Thread(target=run, name=f"swr-refresh:{self.key}", daemon=True).start()
@@ -59,6 +59,7 @@ INSTALLED_APPS = [
     'networth_app',
     'investment_app',
     'retire_app',
+    'dashboard_app',
     'rest_framework',
     'rest_framework.authtoken',
 ]
@@ -124,6 +125,16 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Upstream data providers. Point these at tools/standin_server.py to run or benchmark
+# the app without touching the live services.
+FMP_BASE_URL = os.getenv("FMP_BASE_URL", "https://financialmodelingprep.com").rstrip("/")
+FRED_BASE_URL = os.getenv("FRED_BASE_URL", "https://api.stlouisfed.org").rstrip("/")
+
+# Route the upstream-bound endpoints (market gains, inflation) to their native async views.
+# personal_project/asgi.py switches this on, so uvicorn serves the async views while
+# WSGI servers (gunicorn, runserver) keep the sync ones on the same URLs.
+ASYNC_IO_VIEWS = os.getenv("ASYNC_IO_VIEWS", "0").lower() in ("1", "true", "yes")
+
 REST_FRAMEWORK = {
        'DEFAULT_AUTHENTICATION_CLASSES': [
            'user_app.authentication.HttpOnlyTokenAuthentication',
@@ -0,0 +1,321 @@
+import asyncio
+import threading
+import time
+from decimal import Decimal
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from budget_app.models import Expense
+from investment_app.models import Investment
+from investment_app.projection import PROJECTION_CACHE
+from user_app.models import App_user
+from . import memo_cache, outbound
+from .memo_cache import MemoCache, content_key
+from .outbound import AsyncOutboundClient, CircuitBreaker, CircuitOpenError, OutboundClient
+from .response_cache import StaleWhileRevalidateCache
+
+
+def logged_in_client(email="lister@example.com"):
+    user = App_user.objects.create_user(username=email, email=email, password="pw")
+    client = APIClient()
+    client.cookies["token"] = Token.objects.create(user=user).key
+    return client, user
+
+
+class MemoCacheTests(SimpleTestCase):
+    def setUp(self):
+        # keep the test caches out of the process-wide registry
+        registry = mock.patch.dict(memo_cache._registry)
+        registry.start()
+        self.addCleanup(registry.stop)
+        self.memo = MemoCache("test", maxsize=3, ttl=60)
+        self.calls = 0
+
+    def compute(self, value="result"):
+        def run():
+            self.calls += 1
+            return value
+        return run
+
+    def test_equal_inputs_hit(self):
+        self.assertEqual(self.memo.get_or_compute(1, {"b": [1, 2], "a": Decimal("1.50")}, self.compute()), "result")
+        # same content in another key order and another (equal) instance
+        self.assertEqual(self.memo.get_or_compute(1, {"a": Decimal("1.50"), "b": [1, 2]}, self.compute("other")), "result")
+        self.assertEqual(self.calls, 1)
+        self.memo.get_or_compute(1, {"a": Decimal("1.5"), "b": [1, 2]}, self.compute())
+        self.assertEqual(self.calls, 2)
+        stats = self.memo.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (1, 2, 0.3333))
+
+    def test_content_key_is_stable(self):
+        self.assertEqual(content_key({"x": 1, "y": [2, 3]}), content_key({"y": [2, 3], "x": 1}))
+        self.assertNotEqual(content_key({"x": 1}), content_key({"x": 2}))
+
+    def test_invalidate_drops_only_the_owners_entries(self):
+        self.memo.get_or_compute(1, "a", self.compute())
+        self.memo.get_or_compute(1, "b", self.compute())
+        self.memo.get_or_compute(2, "c", self.compute())
+        self.assertEqual(self.memo.invalidate(1), 2)
+        self.assertEqual(self.memo.invalidate(1), 0)
+        self.memo.get_or_compute(2, "c", self.compute())
+        self.memo.get_or_compute(1, "a", self.compute())
+        self.assertEqual(self.calls, 4)
+        stats = self.memo.stats()
+        self.assertEqual((stats["size"], stats["invalidations"]), (2, 2))
+
+    def test_invalidate_owner_reaches_every_cache(self):
+        other = MemoCache("test_other")
+        self.memo.get_or_compute(7, "a", self.compute())
+        other.get_or_compute(7, "a", self.compute())
+        memo_cache.invalidate_owner(7)
+        self.assertEqual((self.memo.stats()["size"], other.stats()["size"]), (0, 0))
+        self.assertLessEqual({"test", "test_other"}, set(memo_cache.all_stats()))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        for key in ("a", "b", "c"):
+            self.memo.get_or_compute(1, key, self.compute(key))
+        self.memo.get_or_compute(1, "a", self.compute())  # "b" is now the oldest
+        self.memo.get_or_compute(2, "d", self.compute("d"))
+        self.assertEqual(self.memo.stats()["evictions"], 1)
+        self.assertEqual(self.memo.get_or_compute(1, "a", self.compute("new a")), "a")
+        self.assertEqual(self.memo.get_or_compute(1, "b", self.compute("new b")), "new b")
+        self.assertEqual(self.memo.stats()["size"], 3)
+
+    def test_eviction_keeps_owner_index_in_step(self):
+        for key in ("a", "b", "c", "d"):
+            self.memo.get_or_compute(1, key, self.compute())
+        # "a" was evicted, so only the three live keys are invalidated
+        self.assertEqual(self.memo.invalidate(1), 3)
+        self.assertEqual(self.memo._owned, {})
+
+    def test_expired_entries_are_recomputed(self):
+        with mock.patch.object(memo_cache.time, "monotonic", return_value=1000.0):
+            self.memo.get_or_compute(1, "a", self.compute())
+        with mock.patch.object(memo_cache.time, "monotonic", return_value=1059.0):
+            self.memo.get_or_compute(1, "a", self.compute())
+        self.assertEqual(self.calls, 1)
+        with mock.patch.object(memo_cache.time, "monotonic", return_value=1060.0):
+            self.memo.get_or_compute(1, "a", self.compute())
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.memo.stats()["expirations"], 1)
+
+
+class MemoCacheSignalTests(TestCase):
+    def test_saving_an_investment_evicts_its_owner(self):
+        user = App_user.objects.create_user(username="memo@example.com", email="memo@example.com", password="pw")
+        PROJECTION_CACHE.get_or_compute(user.id, "inputs", lambda: "projection")
+        Investment.objects.create(
+            user=user, investment_name="Brokerage", value=100, rate_of_return=5,
+            contribution=0, contribution_timeline_years=0,
+        )
+        self.assertEqual(PROJECTION_CACHE.invalidate(user.id), 0)
+
+
+def join_refresh_threads(key):
+    for thread in threading.enumerate():
+        if thread.name == f"swr-refresh:{key}":
+            thread.join(timeout=5)
+
+
+class StaleWhileRevalidateCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def make(self, key="test:swr", **kwargs):
+        kwargs.setdefault("fresh_ttl", 60)
+        kwargs.setdefault("stale_ttl", 600)
+        return StaleWhileRevalidateCache(key, self.compute, **kwargs)
+
+    def test_miss_then_fresh(self):
+        swr = self.make()
+        value, meta = swr.get()
+        self.assertEqual((value, meta["status"]), (1, "miss"))
+        value, meta = swr.get()
+        self.assertEqual((value, meta["status"]), (1, "fresh"))
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_served_while_refreshing_in_background(self):
+        swr = self.make()
+        cache.set(swr.key, {"value": "old", "stored_at": time.time() - 120}, timeout=600)
+        value, meta = swr.get()
+        self.assertEqual((value, meta["status"]), ("old", "stale"))
+        join_refresh_threads(swr.key)
+        value, meta = swr.get()
+        self.assertEqual((value, meta["status"]), (1, "fresh"))
+        self.assertIsNone(cache.get(swr.lock_key))
+
+    def test_uncacheable_value_is_not_stored(self):
+        swr = self.make(cacheable=lambda value: value > 1)
+        self.assertEqual(swr.get()[1]["status"], "miss")
+        self.assertEqual(swr.get()[1]["status"], "miss")
+        self.assertEqual(swr.get()[1]["status"], "fresh")
+
+    def test_miss_waits_at_most_wait_timeout_for_another_process(self):
+        swr = self.make(wait_timeout=0.3)
+        cache.add(swr.lock_key, 1, timeout=60)  # another process is refreshing
+        started = time.monotonic()
+        value, meta = swr.get()
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual((value, meta["status"]), (1, "miss"))
+
+    def test_async_miss_fresh_and_stale(self):
+        swr = self.make()
+
+        async def run():
+            first = await swr.aget()
+            second = await swr.aget()
+            return first, second
+
+        (value, meta), (again, meta_again) = asyncio.run(run())
+        self.assertEqual((value, meta["status"]), (1, "miss"))
+        self.assertEqual((again, meta_again["status"]), (1, "fresh"))
+
+        cache.set(swr.key, {"value": "old", "stored_at": time.time() - 120}, timeout=600)
+        # a second event loop gets its own asyncio lock
+        value, meta = asyncio.run(swr.aget())
+        self.assertEqual((value, meta["status"]), ("old", "stale"))
+        join_refresh_threads(swr.key)
+        self.assertEqual(cache.get(swr.key)["value"], 2)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        outbound._breakers.clear()
+        self.addCleanup(outbound._breakers.clear)
+
+    def half_open(self, breaker):
+        breaker.opened_at = time.monotonic() - breaker.reset_timeout
+
+    def test_opens_after_threshold_and_half_opens_after_reset_timeout(self):
+        breaker = CircuitBreaker("example.test", failure_threshold=3, reset_timeout=30)
+        for _ in range(2):
+            breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+        self.half_open(breaker)
+        self.assertEqual(breaker.state, "half-open")
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # only one trial at a time
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.half_open(breaker)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+        self.assertTrue(breaker.allow())
+
+    def test_open_circuit_skips_the_network(self):
+        breaker = outbound.get_breaker("down.test")
+        breaker.opened_at = time.monotonic()
+        session = mock.Mock()
+        with self.assertRaises(CircuitOpenError):
+            OutboundClient(session=session).get("http://down.test/x")
+        session.get.assert_not_called()
+
+    def test_unexpected_sync_error_in_trial_lets_the_circuit_close_again(self):
+        breaker = outbound.get_breaker("flaky.test")
+        self.half_open(breaker)
+        session = mock.Mock()
+        session.get.side_effect = requests.exceptions.ChunkedEncodingError("truncated")
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            OutboundClient(session=session).get("http://flaky.test/x")
+        self.assertFalse(breaker.trial_in_flight)
+
+        self.half_open(breaker)
+        session.get.side_effect = None
+        session.get.return_value = mock.Mock(status_code=200)
+        OutboundClient(session=session).get("http://flaky.test/x")
+        self.assertEqual(breaker.state, "closed")
+
+    def test_cancelled_trial_lets_the_circuit_close_again(self):
+        breaker = outbound.get_breaker("slow.test")
+        self.half_open(breaker)
+
+        class HangingClient:
+            def build_request(self, method, url, **kwargs):
+                return None
+
+            async def send(self, request, stream=False):
+                await asyncio.sleep(60)
+
+        async def cancel_trial():
+            task = asyncio.ensure_future(AsyncOutboundClient(client=HangingClient()).get("http://slow.test/x"))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_trial())
+        self.assertFalse(breaker.trial_in_flight)
+
+        class OkClient(HangingClient):
+            async def send(self, request, stream=False):
+                return mock.Mock(status_code=200)
+
+        self.half_open(breaker)
+        asyncio.run(AsyncOutboundClient(client=OkClient()).get("http://slow.test/x"))
+        self.assertEqual(breaker.state, "closed")
+
+
+class ListResponseTests(TestCase):
+    def setUp(self):
+        self.client, self.user = logged_in_client("lister@example.com")
+        _, other = logged_in_client("someone-else@example.com")
+        amounts = [40, 10, 30, 10, 50, 20, 10]
+        self.expenses = [
+            Expense.objects.create(user=self.user, name=f"item {n}", amount=amount)
+            for n, amount in enumerate(amounts)
+        ]
+        Expense.objects.create(user=other, name="theirs", amount=5)
+
+    def get(self, query=""):
+        return self.client.get(f"/api/budget/expenses/{query}")
+
+    def test_plain_list_is_unchanged(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.json()], [e.id for e in self.expenses])
+        self.assertEqual(set(response.json()[0]), {"id", "name", "amount"})
+
+    def test_ordering_breaks_ties_by_id(self):
+        rows = self.get("?ordering=amount").json()
+        expected = sorted(self.expenses, key=lambda e: (e.amount, e.id))
+        self.assertEqual([row["id"] for row in rows], [e.id for e in expected])
+        rows = self.get("?ordering=-amount").json()
+        self.assertEqual([row["id"] for row in rows], [e.id for e in reversed(expected)])
+
+    def test_fields_limits_the_response(self):
+        rows = self.get("?fields=id,amount&ordering=name").json()
+        self.assertEqual(set(rows[0]), {"id", "amount"})
+        self.assertEqual(len(rows), len(self.expenses))
+
+    def test_cursor_pages_cover_every_row_once(self):
+        seen = []
+        url = "?ordering=amount&page_size=2"
+        while url:
+            page = self.get(url).json()
+            self.assertLessEqual(len(page["results"]), 2)
+            seen.extend(row["id"] for row in page["results"])
+            url = page["next"] and "?" + page["next"].split("?", 1)[1]
+        expected = sorted(self.expenses, key=lambda e: (e.amount, e.id))
+        self.assertEqual(seen, [e.id for e in expected])
+
+    def test_bad_parameters_are_400s(self):
+        for query in ("?ordering=user", "?ordering=-secret", "?fields=id,user", "?fields=,"):
+            self.assertEqual(self.get(query).status_code, 400, query)
+        # DRF's CursorPagination answers an undecodable cursor with 404 "Invalid cursor"
+        self.assertEqual(self.get("?cursor=garbage").status_code, 404)
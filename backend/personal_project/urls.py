@@ -25,4 +25,5 @@ urlpatterns = [
     path('api/networth/', include("networth_app.urls")),
     path('api/invest/', include("investment_app.urls")),
     path('api/retire/', include("retire_app.urls")),
+    path('api/dashboard/', include("dashboard_app.urls")),
 ]
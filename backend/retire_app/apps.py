@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RetireAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'retire_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
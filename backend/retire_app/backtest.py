@@ -0,0 +1,170 @@
+"""
+Historical backtest of a retirement plan over stored index prices.
+
+Every trading day in the stored history is a start date. From each start the plan is run
+year by year on the index's actual returns, sampled every TRADING_DAYS_PER_YEAR trading
+days, so a window starting on 1999-03-15 sees the same sequence of yearly returns an
+investor starting that day would have. By default prices are deflated by CPI-U
+(CPIAUCSL) first, so the returns are real and the plan's expenses stay in today's dollars.
+Stored closes are price-only, so dividends are not included.
+
+The windows are never looped over in Python. The cumulative log price is viewed through
+sliding_window_view (one row per start day) and every TRADING_DAYS_PER_YEAR-th column of
+that view is one yearly mark, so the (windows x years) growth matrix is a strided view plus
+one np.diff. That matrix goes through monte_carlo.project_paths exactly like the random
+paths do (every investment earns the index's return; contributions made during a year
+still accrue at the investment's own rate until year end). A plan usually spans more years
+than the stored history, so by default only the start days whose whole plan fits inside
+it are used. With wrap, windows that run past the last stored day continue from the first
+one instead (the returns are replayed in order, so the seam adds no jump in price), and the
+response says how many windows wrapped.
+
+Requests only read what is stored. sync_history() backfills the index prices from
+HISTORY_START and refreshes CPI-U; it backs `manage.py sync_backtest_history`.
+"""
+import time
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from investment_app.price_store import load_timeseries, sync_many
+from .economic_data import load_observations, refresh_all
+from .monte_carlo import SimulationInputs, band_values, project_paths
+
+BACKTEST_SYMBOLS = {"VOO": "equity", "QQQ": "equity", "DIA": "equity"}
+DEFAULT_BACKTEST_SYMBOL = "VOO"
+CPI_SERIES_ID = "CPIAUCSL"
+TRADING_DAYS_PER_YEAR = 252
+
+# How far back the price store is asked to backfill for a backtest (roughly where the
+# earliest of these ETFs starts trading; FMP returns what exists after this date).
+HISTORY_START = date(1993, 1, 1)
+
+# A backtest needs at least this many years of stored prices to be worth reporting.
+MIN_HISTORY_YEARS = 5
+
+
+class HistoryTooShort(ValueError):
+    """Raised by run_backtest without wrap when the plan spans more years than are stored."""
+
+    def __init__(self, symbol: str, plan_years: int, stored_years: float):
+        super().__init__(f"{symbol}: plan spans {plan_years} years, {stored_years:.1f} stored")
+        self.symbol = symbol
+        self.plan_years = plan_years
+        self.stored_years = stored_years
+
+
+def sync_history() -> None:
+    """
+    Backfill every BACKTEST_SYMBOLS series from HISTORY_START and refresh CPI-U.
+    """
+    sync_many(BACKTEST_SYMBOLS, since=HISTORY_START)
+    refresh_all([CPI_SERIES_ID])
+
+
+def load_history(symbol: str, real: bool = True) -> Optional[Tuple[np.ndarray, np.ndarray, bool]]:
+    """
+    Stored closes for `symbol` as (ordinals, log prices, real), or None when nothing is
+    stored. With `real`, each close is divided by the CPI-U reading for its month; if no CPI
+    is stored the prices stay nominal and `real` comes back False.
+    """
+    ts = load_timeseries(symbol)
+    if not ts:
+        return None
+    ordinals = np.array(ts.ordinals, dtype=np.int64)
+    log_prices = np.log(np.frombuffer(ts.closes, dtype=np.float64))
+
+    if real:
+        cpi_ordinals, cpi_values = load_observations(CPI_SERIES_ID)
+        if not cpi_ordinals:
+            return ordinals, log_prices, False
+        cpi_ordinals = np.array(cpi_ordinals, dtype=np.int64)
+        month = np.searchsorted(cpi_ordinals, ordinals, side="right") - 1
+        # days before the first CPI reading can't be deflated and are dropped
+        keep = month >= 0
+        log_prices = log_prices[keep] - np.log(np.frombuffer(cpi_values, dtype=np.float64))[month[keep]]
+        ordinals = ordinals[keep]
+    return ordinals, log_prices, real
+
+
+def yearly_growth(log_prices: np.ndarray, years: int, wrap: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (windows x years) yearly growth factors, one window per start day, and each window's
+    start index. Only windows that fit inside the history are returned unless `wrap`, which
+    gives one window per stored day by replaying the history from its start.
+    """
+    span = TRADING_DAYS_PER_YEAR * years
+    daily = np.diff(log_prices)
+    if wrap:
+        # np.resize repeats the daily returns cyclically to cover the longest window
+        cumulative = np.concatenate(([0.0], np.cumsum(np.resize(daily, len(daily) + span))))
+        windows = len(daily)
+    else:
+        cumulative = log_prices - log_prices[0]
+        windows = max(len(log_prices) - span, 0)
+    if not windows:
+        return np.empty((0, years)), np.empty(0, dtype=np.int64)
+    marks = sliding_window_view(cumulative, span + 1)[:windows, ::TRADING_DAYS_PER_YEAR]
+    return np.exp(np.diff(marks, axis=1)), np.arange(windows)
+
+
+def outcome(inputs: SimulationInputs, index: int, starts, ordinals, span, balances, depleted_at) -> Dict:
+    start = int(starts[index])
+    depleted = int(depleted_at[index])
+    return {
+        "start_date": date.fromordinal(int(ordinals[start])).isoformat(),
+        "wrapped": bool(start + span >= len(ordinals)),
+        "balance_at_retirement": round(float(balances[index, inputs.years_to_retire]), 2),
+        "final_balance": round(float(balances[index, -1]), 2),
+        "depletion_age": inputs.current_age + depleted if depleted >= 0 else None,
+        "balances": np.round(balances[index], 2).tolist(),
+    }
+
+
+def run_backtest(
+    inputs: SimulationInputs, symbol: str = DEFAULT_BACKTEST_SYMBOL, real: bool = True, wrap: bool = False
+) -> Optional[Dict]:
+    """
+    Replay the plan from every stored start day and summarize: share of windows where the
+    money lasts to end_age, yearly percentile bands, and the worst, median and best windows
+    (ranked by final balance; windows that ran out rank below all others, earliest first).
+    None when the stored history is missing or too short to report on. Without wrap, raises
+    HistoryTooShort when the plan spans more years than the stored history.
+    """
+    history = load_history(symbol, real)
+    if history is None or len(history[1]) < MIN_HISTORY_YEARS * TRADING_DAYS_PER_YEAR:
+        return None
+    ordinals, log_prices, real = history
+
+    started = time.perf_counter()
+    retire, horizon = inputs.years_to_retire, inputs.horizon
+    growth, starts = yearly_growth(log_prices, horizon, wrap)
+    if not len(starts):
+        raise HistoryTooShort(symbol, horizon, (len(log_prices) - 1) / TRADING_DAYS_PER_YEAR)
+    balances, depleted_at = project_paths(inputs, growth[:, None, :retire], growth[:, retire:])
+    elapsed = time.perf_counter() - started
+    print(f"[Backtest] {symbol}: {len(starts)} windows x {horizon} years in {elapsed * 1000:.0f}ms")
+
+    failed = depleted_at >= 0
+    score = np.where(failed, depleted_at - horizon - 1.0, balances[:, -1])
+    order = np.argsort(score, kind="stable")
+    span = TRADING_DAYS_PER_YEAR * horizon
+    return {
+        "symbol": symbol,
+        "real": real,
+        "first_date": date.fromordinal(int(ordinals[0])).isoformat(),
+        "last_date": date.fromordinal(int(ordinals[-1])).isoformat(),
+        "windows": int(len(starts)),
+        "wrapped_windows": int((starts + span >= len(ordinals)).sum()),
+        "current_age": inputs.current_age,
+        "retirement_age": inputs.retirement_age,
+        "end_age": inputs.end_age,
+        "ages": list(range(inputs.current_age, inputs.end_age + 1)),
+        "success_rate": round(float((~failed).mean()) * 100.0, 2),
+        "bands": band_values(balances, axis=0),
+        "worst": outcome(inputs, order[0], starts, ordinals, span, balances, depleted_at),
+        "median": outcome(inputs, order[len(order) // 2], starts, ordinals, span, balances, depleted_at),
+        "best": outcome(inputs, order[-1], starts, ordinals, span, balances, depleted_at),
+    }
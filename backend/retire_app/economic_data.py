@@ -0,0 +1,258 @@
+"""
+Local store for FRED series.
+
+SERIES_REGISTRY lists the series the app keeps. refresh_series() asks FRED only for
+observations from the last stored date onward, and sends the previous ETag so an unchanged
+series costs a 304. Observations are upserted into EconomicObservation as bare
+(date, value) rows, and the series' summary (average, latest value, count, last date) is
+recomputed in the same step, so most readers only ever read one EconomicSeries row.
+refresh_all() refreshes the whole registry on a small thread pool; it backs
+`manage.py refresh_economic_series`.
+"""
+import os
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Max
+from django.utils import timezone
+
+from personal_project.outbound import OutboundClient
+from personal_project.response_cache import StaleWhileRevalidateCache
+from .models import EconomicSeries, EconomicObservation
+
+FRED_API_KEY = os.getenv('INFLATION_KEY')
+
+# FRED publishes these at most daily (the annual inflation series once a year), so a
+# stored series is trusted for this long before FRED is asked again.
+REVALIDATE_INTERVAL = timedelta(hours=24)
+
+# FRED allows 120 requests a minute per key; a few at a time is plenty for the registry.
+DEFAULT_MAX_WORKERS = 4
+
+SERIES_REGISTRY = {
+    "FPCPITOTLZGUSA": {
+        "title": "Inflation, consumer prices for the United States",
+        "frequency": "annual",
+        "units": "percent",
+    },
+    "CPIAUCSL": {
+        "title": "Consumer Price Index for All Urban Consumers (CPI-U): all items",
+        "frequency": "monthly",
+        "units": "index 1982-1984=100",
+    },
+    "DGS10": {
+        "title": "10-Year Treasury constant maturity rate",
+        "frequency": "daily",
+        "units": "percent",
+    },
+    "FEDFUNDS": {
+        "title": "Federal funds effective rate",
+        "frequency": "monthly",
+        "units": "percent",
+    },
+}
+
+
+def observations_url() -> str:
+    return f"{settings.FRED_BASE_URL}/fred/series/observations"
+
+
+def parse_observations(payload) -> List[Tuple[date, float]]:
+    """
+    (date, value) pairs from a FRED observations payload. FRED marks missing values
+    with "." and those rows are skipped.
+    """
+    pairs = []
+    for obs in (payload or {}).get('observations', []):
+        try:
+            pairs.append((date.fromisoformat(obs['date']), float(obs['value'])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return pairs
+
+
+def store_observations(series: EconomicSeries, pairs: List[Tuple[date, float]]) -> int:
+    """
+    Upsert the pairs that are new or whose value was revised. Returns how many changed.
+    """
+    if not pairs:
+        return 0
+    existing = dict(
+        series.observations.filter(date__gte=min(d for d, _ in pairs)).values_list("date", "value")
+    )
+    changed = [
+        EconomicObservation(series=series, date=d, value=value)
+        for d, value in pairs
+        if existing.get(d) != value
+    ]
+    if changed:
+        EconomicObservation.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=["series", "date"],
+            update_fields=["value"],
+        )
+    return len(changed)
+
+
+def update_summary(series: EconomicSeries) -> None:
+    summary = series.observations.aggregate(avg=Avg("value"), count=Count("id"), last=Max("date"))
+    series.average_value = summary["avg"]
+    series.observation_count = summary["count"]
+    series.last_observation_date = summary["last"]
+    series.latest_value = (
+        series.observations.filter(date=summary["last"]).values_list("value", flat=True).first()
+        if summary["last"]
+        else None
+    )
+
+
+def is_due(series: EconomicSeries, now) -> bool:
+    return not series.last_checked or now - series.last_checked >= REVALIDATE_INTERVAL
+
+
+def fetch_observations(
+    series: EconomicSeries, force: bool = False, client: Optional[OutboundClient] = None
+) -> Optional[Tuple[int, List[Tuple[date, float]], str]]:
+    """
+    Network half of a refresh (no database access, so it can run on a pool thread).
+    Returns (status, pairs, etag) or None when FRED couldn't be reached or answered
+    with an error.
+    """
+    params = {"series_id": series.series_id, "api_key": FRED_API_KEY, "file_type": "json"}
+    headers = {}
+    if not force:
+        if series.last_observation_date:
+            # the last stored observation is requested again so a revision to it is picked up
+            params["observation_start"] = series.last_observation_date.isoformat()
+        if series.etag:
+            headers["If-None-Match"] = series.etag
+
+    try:
+        resp = (client or OutboundClient()).get(observations_url(), params=params, headers=headers)
+        if resp.status_code == 304:
+            return 304, [], series.etag
+        if not resp.ok:
+            print(f"[FRED] {series.series_id}: upstream returned {resp.status_code}")
+            return None
+        return resp.status_code, parse_observations(resp.json()), resp.headers.get("ETag", "")[:200]
+    except Exception as exc:
+        print(f"[FRED] {series.series_id}: {type(exc).__name__}: {exc}")
+        return None
+
+
+def apply_observations(series: EconomicSeries, fetched, now) -> EconomicSeries:
+    """
+    Database half of a refresh: store what fetch_observations() returned.
+    """
+    if fetched is None:
+        return series
+    status, pairs, etag = fetched
+    if status == 304:
+        series.last_checked = now
+        series.save(update_fields=["last_checked"])
+        return series
+
+    with transaction.atomic():
+        changed = store_observations(series, pairs)
+        series.last_checked = now
+        series.etag = etag
+        if changed:
+            update_summary(series)
+            series.last_changed = now
+        series.save()
+    print(f"[FRED] {series.series_id}: {len(pairs)} observations fetched, {changed} new or revised")
+    return series
+
+
+def refresh_series(
+    series_id: str, force: bool = False, client: Optional[OutboundClient] = None
+) -> EconomicSeries:
+    """
+    Bring the local copy of `series_id` up to date if REVALIDATE_INTERVAL has passed
+    (or `force`, which also re-pulls the full history to pick up revisions).
+    Upstream failures leave the stored series as it was.
+    """
+    series, _ = EconomicSeries.objects.get_or_create(series_id=series_id)
+    now = timezone.now()
+    if not force and not is_due(series, now):
+        return series
+    return apply_observations(series, fetch_observations(series, force, client), now)
+
+
+def refresh_all(
+    series_ids: Optional[Iterable[str]] = None, force: bool = False, max_workers: int = DEFAULT_MAX_WORKERS
+) -> Dict[str, EconomicSeries]:
+    """
+    Refresh every series in `series_ids` (default: SERIES_REGISTRY) in one batch: the FRED
+    calls run on a pool with at most `max_workers` in flight, while database reads and
+    writes stay on the calling thread. Returns series_id -> EconomicSeries.
+    """
+    series_ids = list(series_ids or SERIES_REGISTRY)
+    now = timezone.now()
+    existing = EconomicSeries.objects.in_bulk(series_ids)
+    results = {}
+    due = []
+    for series_id in series_ids:
+        series = existing.get(series_id) or EconomicSeries.objects.create(series_id=series_id)
+        results[series_id] = series
+        if force or is_due(series, now):
+            due.append(series)
+    if not due:
+        return results
+
+    client = OutboundClient()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(due)))) as pool:
+        futures = {pool.submit(fetch_observations, series, force, client): series for series in due}
+        for future in as_completed(futures):
+            series = futures[future]
+            results[series.series_id] = apply_observations(series, future.result(), now)
+    return results
+
+
+def load_observations(series_id: str, start: Optional[date] = None) -> Tuple[array, array]:
+    """
+    Stored observations in date order as two parallel arrays: proleptic-Gregorian
+    ordinals ('l') and values ('d'), like investment_app's TimeSeries.
+    """
+    rows = EconomicObservation.objects.filter(series_id=series_id)
+    if start:
+        rows = rows.filter(date__gte=start)
+    ordinals = array("l")
+    values = array("d")
+    for d, value in rows.order_by("date").values_list("date", "value"):
+        ordinals.append(d.toordinal())
+        values.append(value)
+    return ordinals, values
+
+
+INFLATION_SERIES_ID = "FPCPITOTLZGUSA"
+
+# The average only moves when FRED publishes a new year, so it is served from cache and
+# re-read from the local series hourly, on a background thread once it has been computed.
+INFLATION_FRESH_TTL = 60 * 60
+INFLATION_STALE_TTL = 30 * 24 * 60 * 60
+
+
+def inflation_average():
+    """
+    Average annual inflation over the stored FRED series, refreshing the local copy first
+    if it is due (see refresh_series). None if nothing was ever stored.
+    """
+    series = refresh_series(INFLATION_SERIES_ID)
+    if series.average_value is None:
+        return None
+    return round(series.average_value, 3)
+
+
+INFLATION_AVERAGE = StaleWhileRevalidateCache(
+    "retire_app:inflation_average",
+    inflation_average,
+    fresh_ttl=INFLATION_FRESH_TTL,
+    stale_ttl=INFLATION_STALE_TTL,
+    cacheable=lambda value: value is not None,
+)
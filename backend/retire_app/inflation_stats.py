@@ -0,0 +1,122 @@
+"""
+Windowed statistics over a stored annual inflation series.
+
+InflationAggregates is built once per stored version of the series (rebuilt when
+EconomicSeries.last_changed moves) and holds prefix sums of the rates and of their log
+growth factors. Any [start, end] window's arithmetic and geometric mean is then two array
+reads, and every rolling k-year average inside it is one vectorized difference of prefix
+sums. Percentiles need the window's values themselves; with one observation per year that
+slice is at most a few dozen numbers.
+"""
+import threading
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from .economic_data import load_observations, refresh_series
+from .models import EconomicSeries
+
+ROLLING_YEARS = (10, 20, 30)
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class InflationAggregates:
+    def __init__(self, years: np.ndarray, rates: np.ndarray):
+        self.years = years
+        self.rates = rates
+        # prefix sums with a leading zero: sum(rates[i:j]) == cum[j] - cum[i]
+        self.cum = np.concatenate(([0.0], np.cumsum(rates)))
+        self.log_cum = np.concatenate(([0.0], np.cumsum(np.log1p(rates / 100.0))))
+
+    @classmethod
+    def from_store(cls, series_id: str) -> "InflationAggregates":
+        ordinals, values = load_observations(series_id)
+        years = np.array([date.fromordinal(o).year for o in ordinals], dtype=np.int64)
+        return cls(years, np.frombuffer(values, dtype=np.float64).copy())
+
+    def __len__(self) -> int:
+        return len(self.years)
+
+    def bounds(self, start: Optional[int], end: Optional[int]):
+        """
+        [i, j) index range of the observations with start <= year <= end.
+        """
+        i = 0 if start is None else int(np.searchsorted(self.years, start, side="left"))
+        j = len(self.years) if end is None else int(np.searchsorted(self.years, end, side="right"))
+        return i, max(i, j)
+
+    def window(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        rolling: Iterable[int] = ROLLING_YEARS,
+        percentiles: Iterable[float] = DEFAULT_PERCENTILES,
+    ) -> Dict:
+        i, j = self.bounds(start, end)
+        n = j - i
+        out = {
+            "start_year": int(self.years[i]) if n else None,
+            "end_year": int(self.years[j - 1]) if n else None,
+            "count": n,
+            "arithmetic_mean": None,
+            "geometric_mean": None,
+            "rolling": {},
+            "percentiles": {},
+        }
+        if n:
+            out["arithmetic_mean"] = round(float((self.cum[j] - self.cum[i]) / n), 4)
+            out["geometric_mean"] = round(float(np.expm1((self.log_cum[j] - self.log_cum[i]) / n) * 100.0), 4)
+            values = np.percentile(self.rates[i:j], list(percentiles))
+            out["percentiles"] = {format_pct(p): round(float(v), 4) for p, v in zip(percentiles, values)}
+
+        for k in rolling:
+            out["rolling"][str(k)] = self.rolling(i, j, k)
+        return out
+
+    def rolling(self, i: int, j: int, k: int) -> Dict:
+        """
+        Every trailing k-year average ending inside [i, j) whose k years also lie inside it.
+        """
+        if j - i < k:
+            return {"values": [], "min": None, "max": None, "latest": None}
+        ends = np.arange(i + k, j + 1)
+        averages = (self.cum[ends] - self.cum[ends - k]) / k
+        return {
+            "values": [[int(y), round(float(a), 4)] for y, a in zip(self.years[ends - 1], averages)],
+            "min": round(float(averages.min()), 4),
+            "max": round(float(averages.max()), 4),
+            "latest": round(float(averages[-1]), 4),
+        }
+
+
+def format_pct(p: float) -> str:
+    return f"p{int(p)}" if float(p).is_integer() else f"p{p}"
+
+
+_aggregates: Dict[str, tuple] = {}
+_aggregates_lock = threading.Lock()
+
+
+def get_aggregates(series_id: str) -> Optional[InflationAggregates]:
+    """
+    Aggregates for the stored series, rebuilt only when the stored observations changed.
+    Fetches from FRED only if the series has never been stored.
+    """
+    series = EconomicSeries.objects.filter(series_id=series_id).first()
+    if series is None or not series.observation_count:
+        series = refresh_series(series_id)
+        if not series.observation_count:
+            return None
+
+    version = series.last_changed
+    cached = _aggregates.get(series_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    with _aggregates_lock:
+        cached = _aggregates.get(series_id)
+        if cached and cached[0] == version:
+            return cached[1]
+        aggregates = InflationAggregates.from_store(series_id)
+        _aggregates[series_id] = (version, aggregates)
+        return aggregates
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from retire_app.economic_data import DEFAULT_MAX_WORKERS, SERIES_REGISTRY, refresh_all
+
+
+class Command(BaseCommand):
+    help = "Refresh the locally stored FRED series (default: every series in the registry) in one batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("series", nargs="*", help=f"series ids (default: {', '.join(SERIES_REGISTRY)})")
+        parser.add_argument("--force", action="store_true", help="ignore the revalidation interval and re-pull full history")
+        parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="max concurrent FRED requests")
+
+    def handle(self, *args, **options):
+        series_ids = [s.upper() for s in options["series"]] or list(SERIES_REGISTRY)
+        results = refresh_all(series_ids, force=options["force"], max_workers=options["workers"])
+
+        for series_id in series_ids:
+            series = results[series_id]
+            self.stdout.write(
+                f"{series_id}: {series.observation_count} observations through "
+                f"{series.last_observation_date}, latest {series.latest_value}, checked {series.last_checked}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Checked {len(series_ids)} series"))
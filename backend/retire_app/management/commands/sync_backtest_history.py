@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from investment_app.price_store import load_timeseries
+from retire_app.backtest import BACKTEST_SYMBOLS, CPI_SERIES_ID, HISTORY_START, sync_history
+
+
+class Command(BaseCommand):
+    help = (
+        f"Backfill the backtest index prices ({', '.join(BACKTEST_SYMBOLS)}) from {HISTORY_START} "
+        f"and refresh {CPI_SERIES_ID}, so /api/retire/backtest/ only reads stored data."
+    )
+
+    def handle(self, *args, **options):
+        sync_history()
+        for symbol in BACKTEST_SYMBOLS:
+            ts = load_timeseries(symbol)
+            self.stdout.write(f"{symbol}: {len(ts) if ts else 0} stored closes")
+        self.stdout.write(self.style.SUCCESS(f"Synced {len(BACKTEST_SYMBOLS)} backtest series"))
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.3 on 2026-10-18 21:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('retire_app', '0006_retirementplan_readiness'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EconomicSeries',
+            fields=[
+                ('series_id', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('last_checked', models.DateTimeField(blank=True, null=True)),
+                ('last_changed', models.DateTimeField(blank=True, null=True)),
+                ('etag', models.CharField(blank=True, default='', max_length=200)),
+                ('last_observation_date', models.DateField(blank=True, null=True)),
+                ('observation_count', models.PositiveIntegerField(default=0)),
+                ('average_value', models.FloatField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EconomicObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('value', models.FloatField()),
+                ('series', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='observations', to='retire_app.economicseries')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='economicobservation',
+            constraint=models.UniqueConstraint(fields=('series', 'date'), name='unique_economic_series_date'),
+        ),
+    ]
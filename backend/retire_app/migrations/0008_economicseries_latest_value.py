@@ -0,0 +1,31 @@
+# Generated by Django 5.0.3 on 2026-10-18 21:04
+
+from django.db import migrations, models
+
+
+def fill_latest_value(apps, schema_editor):
+    EconomicSeries = apps.get_model('retire_app', 'EconomicSeries')
+    EconomicObservation = apps.get_model('retire_app', 'EconomicObservation')
+    for series in EconomicSeries.objects.exclude(last_observation_date=None):
+        series.latest_value = (
+            EconomicObservation.objects.filter(series=series, date=series.last_observation_date)
+            .values_list('value', flat=True)
+            .first()
+        )
+        series.save(update_fields=['latest_value'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('retire_app', '0007_economicseries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='economicseries',
+            name='latest_value',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_latest_value, migrations.RunPython.noop),
+    ]
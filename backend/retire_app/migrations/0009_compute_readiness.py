@@ -0,0 +1,35 @@
+# Generated by Django 5.0.3 on 2026-10-18 22:40
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations
+from django.db.models import Sum
+
+
+def compute_readiness(apps, schema_editor):
+    # same formula as retire_app.readiness.compute_readiness, frozen for the migration
+    RetirementPlan = apps.get_model('retire_app', 'RetirementPlan')
+    RetirementIncomeSource = apps.get_model('retire_app', 'RetirementIncomeSource')
+    totals = dict(
+        RetirementIncomeSource.objects.values('user_id').annotate(total=Sum('amount')).values_list('user_id', 'total')
+    )
+    plans = list(RetirementPlan.objects.all())
+    for plan in plans:
+        expenses = Decimal(plan.projected_expenses or 0)
+        if expenses <= 0:
+            plan.readiness = Decimal('0.00')
+            continue
+        coverage = min(max(Decimal(totals.get(plan.user_id) or 0) / expenses * 100, Decimal(0)), Decimal(100))
+        plan.readiness = coverage.quantize(Decimal('1'), rounding=ROUND_HALF_UP).quantize(Decimal('0.01'))
+    RetirementPlan.objects.bulk_update(plans, ['readiness'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('retire_app', '0008_economicseries_latest_value'),
+    ]
+
+    operations = [
+        migrations.RunPython(compute_readiness, migrations.RunPython.noop),
+    ]
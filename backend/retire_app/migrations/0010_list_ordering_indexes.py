@@ -0,0 +1,27 @@
+# Generated by Django 5.0.3 on 2026-10-18 21:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('retire_app', '0009_compute_readiness'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='retirementincomesource',
+            index=models.Index(fields=['user', 'id'], name='retire_income_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='retirementincomesource',
+            index=models.Index(fields=['user', 'age_available', 'id'], name='retire_income_user_age_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='retirementincomesource',
+            index=models.Index(fields=['user', 'amount', 'id'], name='retire_income_user_amount_idx'),
+        ),
+    ]
@@ -24,8 +24,48 @@ class RetirementIncomeSource(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["user", "income_source"], name="unique_user_income_source")
         ]
+        # ?ordering=income_source is served by the unique constraint's index
+        indexes = [
+            models.Index(fields=["user", "id"], name="retire_income_user_id_idx"),
+            models.Index(fields=["user", "age_available", "id"], name="retire_income_user_age_idx"),
+            models.Index(fields=["user", "amount", "id"], name="retire_income_user_amount_idx"),
+        ]
 
     def __str__(self):
         return f"{self.income_source} - {self.age_available} - {self.amount}"
 
 
+
+
+class EconomicSeries(models.Model):
+    """
+    A FRED series kept locally. last_checked is when FRED was last asked for new
+    observations; etag and last_observation_date make that refresh conditional and
+    incremental. average_value and latest_value are recomputed whenever the observations
+    change, so readers never aggregate.
+    """
+    series_id = models.CharField(max_length=50, primary_key=True)
+    last_checked = models.DateTimeField(null=True, blank=True)
+    last_changed = models.DateTimeField(null=True, blank=True)
+    etag = models.CharField(max_length=200, blank=True, default="")
+    last_observation_date = models.DateField(null=True, blank=True)
+    observation_count = models.PositiveIntegerField(default=0)
+    average_value = models.FloatField(null=True, blank=True)
+    latest_value = models.FloatField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.series_id} - {self.last_observation_date} - {self.average_value}"
+
+
+class EconomicObservation(models.Model):
+    series = models.ForeignKey(EconomicSeries, on_delete=models.CASCADE, related_name="observations")
+    date = models.DateField()
+    value = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["series", "date"], name="unique_economic_series_date")
+        ]
+
+    def __str__(self):
+        return f"{self.series_id} - {self.date} - {self.value}"
@@ -0,0 +1,306 @@
+"""
+Monte Carlo retirement simulation, vectorized across paths and years.
+
+Each path draws one lognormal market shock per year, shared by all of the user's
+investments (their expected growth is their own rate_of_return, compounded monthly like
+the charts). Until retirement every investment grows and takes its contributions; from
+retirement on the combined balance is one pool that pays the yearly shortfall between
+projected_expenses and the RetirementIncomeSource amounts available at that age. Income
+rows the retirement page imports from investments are left out (see from_plan), since
+those investments already pay out of the simulated pool.
+
+Neither phase loops over years. With growth factors G and their running product P,
+V_t = V_(t-1) * G_t + C_t unrolls to V_t = P_t * (V_0 + cumsum(C_s / P_s)), and
+V_t = (V_(t-1) - W_t) * G_t to V_t = Q_t * (B - cumsum(W_s / Q_(s-1))), so both phases are
+a cumprod and a cumsum over (paths x years) arrays. Withdrawals never go negative, so the
+remaining term only falls and a path is depleted from the first year it drops below zero.
+
+Paths are generated in CHUNK_PATHS blocks from SeedSequence(seed).spawn(), so a seed gives
+the same result whether the blocks run in this process or on the process pool.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import repeat
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from investment_app.projection import project_balances
+from personal_project.memo_cache import MemoCache
+from .scenarios import investment_income_names
+
+DEFAULT_PATHS = 10_000
+MAX_PATHS = 200_000
+DEFAULT_VOLATILITY = 15.0
+DEFAULT_END_AGE = 95
+MAX_END_AGE = 120
+BAND_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Paths per block. Also the unit of work sent to the pool, and part of what a seed
+# reproduces, so changing it changes the results for a given seed.
+CHUNK_PATHS = 25_000
+
+# Below this many paths the pool's pickling overhead costs more than it saves.
+POOL_MIN_PATHS = 50_000
+
+# Seeded runs by content hash of their inputs; results carry yearly bands, so fewer entries.
+SIMULATION_CACHE = MemoCache("retirement_simulation", maxsize=256)
+
+
+class SimulationInputs:
+    """
+    Everything a simulation needs, as plain numbers and arrays (picklable for the pool).
+    Money amounts are monthly, like the models; ages are whole years.
+    """
+
+    def __init__(
+        self,
+        current_age: int,
+        retirement_age: int,
+        end_age: int,
+        monthly_expenses: float,
+        withdrawal_rate: float,
+        values: np.ndarray,
+        rates: np.ndarray,
+        contributions: np.ndarray,
+        contribution_years: np.ndarray,
+        income_ages: np.ndarray,
+        income_amounts: np.ndarray,
+        volatility: float = DEFAULT_VOLATILITY,
+        inflation: float = 0.0,
+    ):
+        self.current_age = current_age
+        self.retirement_age = max(retirement_age, current_age)
+        self.end_age = end_age
+        self.monthly_expenses = monthly_expenses
+        self.withdrawal_rate = withdrawal_rate
+        self.values = values
+        self.rates = rates
+        self.contributions = contributions
+        self.contribution_years = contribution_years
+        self.income_ages = income_ages
+        self.income_amounts = income_amounts
+        self.volatility = volatility
+        self.inflation = inflation
+
+    @classmethod
+    def from_plan(
+        cls,
+        plan,
+        investments: Iterable,
+        incomes: Iterable,
+        end_age: int = DEFAULT_END_AGE,
+        volatility: float = DEFAULT_VOLATILITY,
+        inflation: float = 0.0,
+    ) -> "SimulationInputs":
+        investments = list(investments)
+        # income rows imported from the investments would count them a second time
+        derived = investment_income_names(investments)
+        incomes = [inc for inc in incomes if inc.income_source.strip() not in derived]
+        return cls(
+            current_age=plan.current_age,
+            retirement_age=plan.retirement_age,
+            end_age=end_age,
+            monthly_expenses=float(plan.projected_expenses),
+            withdrawal_rate=float(plan.withdrawal_rate),
+            values=np.array([float(inv.value) for inv in investments], dtype=np.float64),
+            rates=np.array([float(inv.rate_of_return) for inv in investments], dtype=np.float64),
+            contributions=np.array([float(inv.contribution) for inv in investments], dtype=np.float64),
+            contribution_years=np.array([inv.contribution_timeline_years for inv in investments], dtype=np.int64),
+            income_ages=np.array([inc.age_available for inc in incomes], dtype=np.int64),
+            income_amounts=np.array([float(inc.amount) for inc in incomes], dtype=np.float64),
+            volatility=volatility,
+            inflation=inflation,
+        )
+
+    @property
+    def years_to_retire(self) -> int:
+        return self.retirement_age - self.current_age
+
+    @property
+    def horizon(self) -> int:
+        return self.end_age - self.current_age
+
+    def annual_growth(self) -> np.ndarray:
+        """
+        Expected yearly growth factor per investment (monthly compounding, as in the charts).
+        """
+        return (1.0 + self.rates / 100.0 / 12.0) ** 12
+
+    def yearly_contributions(self) -> np.ndarray:
+        """
+        (investments x years_to_retire): each year's twelve contributions, valued at year end
+        at the investment's expected monthly rate. With zero volatility the accumulation
+        phase reproduces investment_app.projection exactly.
+        """
+        i = self.rates / 100.0 / 12.0
+        g = 1.0 + i
+        safe_i = np.where(i == 0, 1.0, i)
+        per_year = np.where(i == 0, 12.0 * self.contributions, self.contributions * g * (g ** 12 - 1.0) / safe_i)
+        active = np.arange(self.years_to_retire)[None, :] < self.contribution_years[:, None]
+        return per_year[:, None] * active
+
+    def yearly_withdrawals(self) -> np.ndarray:
+        """
+        Shortfall paid from the pool at the start of each retirement year: twelve months of
+        expenses less the income sources available at that age, grown by `inflation`.
+        """
+        years = np.arange(self.years_to_retire, self.horizon)
+        ages = self.current_age + years
+        available = self.income_ages[None, :] <= ages[:, None]
+        income = (self.income_amounts[None, :] * available).sum(axis=1)
+        need = 12.0 * (self.monthly_expenses - income) * (1.0 + self.inflation / 100.0) ** years
+        return np.maximum(need, 0.0)
+
+    def pool_growth(self) -> float:
+        """
+        Expected yearly growth of the pooled balance after retirement: the investments'
+        growth weighted by their projected balances at retirement.
+        """
+        if not len(self.values):
+            return 1.0
+        at_retirement = project_balances(
+            self.values, self.rates, self.contributions, self.contribution_years,
+            np.array([12 * self.years_to_retire]),
+        )[:, 0]
+        total = at_retirement.sum()
+        if total <= 0:
+            return float(self.annual_growth().mean())
+        return float((self.annual_growth() * at_retirement).sum() / total)
+
+
+def project_paths(
+    inputs: SimulationInputs, investment_growth: np.ndarray, pool_growth: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Balances along given market paths. investment_growth holds each year's growth factor
+    until retirement (paths x investments x years_to_retire, or with a broadcastable
+    investments axis of 1), pool_growth the pooled balance's growth after it
+    (paths x retirement years). Returns balances (paths x horizon+1, year 0 = today) and,
+    per path, the year index whose withdrawal could not be covered (-1 if the money lasted).
+    """
+    n_paths = pool_growth.shape[0]
+    retire, horizon = inputs.years_to_retire, inputs.horizon
+    balances = np.empty((n_paths, horizon + 1))
+    balances[:, 0] = inputs.values.sum()
+
+    if retire:
+        growth = np.cumprod(investment_growth, axis=2)
+        contributions = inputs.yearly_contributions()[None, :, :]
+        per_investment = growth * (inputs.values[None, :, None] + np.cumsum(contributions / growth, axis=2))
+        balances[:, 1:retire + 1] = per_investment.sum(axis=1)
+
+    depleted_at = np.full(n_paths, -1, dtype=np.int64)
+    if horizon > retire:
+        growth = np.cumprod(pool_growth, axis=1)
+        growth_before = np.hstack([np.ones((n_paths, 1)), growth[:, :-1]])
+        remaining = balances[:, retire, None] - np.cumsum(inputs.yearly_withdrawals()[None, :] / growth_before, axis=1)
+        balances[:, retire + 1:] = growth * np.maximum(remaining, 0.0)
+        failed = remaining[:, -1] < 0
+        depleted_at[failed] = retire + np.argmax(remaining[failed] < 0, axis=1)
+    return balances, depleted_at
+
+
+def simulate_paths(inputs: SimulationInputs, n_paths: int, seed) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One block of random paths (see project_paths for what comes back).
+    """
+    rng = np.random.default_rng(seed)
+    sigma = inputs.volatility / 100.0
+    retire = inputs.years_to_retire
+    shocks = sigma * rng.standard_normal((n_paths, inputs.horizon))
+    # lognormal growth whose mean is the expected growth: log-drift minus sigma^2 / 2
+    drift = np.log(inputs.annual_growth()) - sigma ** 2 / 2.0
+    investment_growth = np.exp(drift[None, :, None] + shocks[:, None, :retire])
+    pool_growth = np.exp(np.log(inputs.pool_growth()) - sigma ** 2 / 2.0 + shocks[:, retire:])
+    return project_paths(inputs, investment_growth, pool_growth)
+
+
+def chunk_sizes(paths: int):
+    full, rest = divmod(paths, CHUNK_PATHS)
+    return [CHUNK_PATHS] * full + ([rest] if rest else [])
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by all requests in this process, started on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _pool
+
+
+def simulate(inputs: SimulationInputs, paths: int, seed: int, use_pool: Optional[bool] = None):
+    """
+    All `paths` paths as (balances, depleted_at), in CHUNK_PATHS blocks. The blocks go to
+    the process pool when `use_pool`, which defaults to paths >= POOL_MIN_PATHS.
+    """
+    sizes = chunk_sizes(paths)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if use_pool is None:
+        use_pool = paths >= POOL_MIN_PATHS
+    if use_pool and len(sizes) > 1:
+        blocks = list(get_pool().map(simulate_paths, repeat(inputs), sizes, seeds))
+    else:
+        blocks = [simulate_paths(inputs, n, s) for n, s in zip(sizes, seeds)]
+    return np.concatenate([b for b, _ in blocks]), np.concatenate([d for _, d in blocks])
+
+
+def band_values(values: np.ndarray, axis=None) -> Dict:
+    bands = np.percentile(values, BAND_PERCENTILES, axis=axis)
+    return {f"p{p}": np.round(band, 2).tolist() for p, band in zip(BAND_PERCENTILES, bands)}
+
+
+def run_simulation(
+    inputs: SimulationInputs, paths: int = DEFAULT_PATHS, seed: Optional[int] = None
+) -> Dict:
+    """
+    Simulate and summarize: success probability (the money lasts to end_age), percentile
+    balance bands per year, the balance at retirement against the plan's nest-egg target,
+    and when failing paths run out. The seed is returned so a run can be repeated.
+    """
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    started = time.perf_counter()
+    balances, depleted_at = simulate(inputs, paths, seed)
+    elapsed = time.perf_counter() - started
+    print(f"[MonteCarlo] {paths} paths x {inputs.horizon} years in {elapsed * 1000:.0f}ms ({paths / elapsed:,.0f} paths/s)")
+
+    retire = inputs.years_to_retire
+    at_retirement = balances[:, retire]
+    failed = depleted_at >= 0
+
+    target = None
+    target_probability = None
+    if inputs.withdrawal_rate > 0:
+        target = inputs.monthly_expenses * 12 / (inputs.withdrawal_rate / 100.0)
+        target *= (1.0 + inputs.inflation / 100.0) ** retire
+        target_probability = round(float((at_retirement >= target).mean()) * 100.0, 2)
+
+    this_year = date.today().year
+    return {
+        "seed": seed,
+        "paths": paths,
+        "volatility": inputs.volatility,
+        "inflation": inputs.inflation,
+        "current_age": inputs.current_age,
+        "retirement_age": inputs.retirement_age,
+        "end_age": inputs.end_age,
+        "ages": list(range(inputs.current_age, inputs.end_age + 1)),
+        "labels": [str(this_year + y) for y in range(inputs.horizon + 1)],
+        "success_probability": round(float((~failed).mean()) * 100.0, 2),
+        "bands": band_values(balances, axis=0),
+        "at_retirement": band_values(at_retirement),
+        "target_nest_egg": round(target, 2) if target is not None else None,
+        "target_probability": target_probability,
+        "depletion_age": band_values(inputs.current_age + depleted_at[failed]) if failed.any() else None,
+    }
@@ -0,0 +1,91 @@
+"""
+Server-side retirement readiness, stored on RetirementPlan.readiness.
+
+Readiness is the share of the plan's monthly projected_expenses covered by the user's
+RetirementIncomeSource amounts, as a whole percent clamped to 0-100 (the figure the
+retirement page shows). Investments count through the income rows imported from them.
+
+Writes that can move it only mark the user dirty (see signals.py). The dirty users are
+recomputed together once the surrounding transaction commits, with one aggregate query and
+one bulk update, so a bulk import of many income rows costs one recompute rather than one
+per row, and a rolled-back write costs nothing. Readers just read the stored column.
+"""
+import threading
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Sum
+
+from .models import RetirementPlan, RetirementIncomeSource
+
+_pending = threading.local()
+
+
+def compute_readiness(projected_expenses, total_income) -> Decimal:
+    """
+    round(clamp(total_income / projected_expenses * 100, 0, 100)), rounding halves up like
+    the frontend's Math.round. Zero when there are no expenses to cover.
+    """
+    expenses = Decimal(projected_expenses or 0)
+    if expenses <= 0:
+        return Decimal("0.00")
+    coverage = Decimal(total_income or 0) / expenses * 100
+    coverage = min(max(coverage, Decimal(0)), Decimal(100))
+    return coverage.quantize(Decimal("1"), rounding=ROUND_HALF_UP).quantize(Decimal("0.01"))
+
+
+def recompute(user_ids: Iterable[int]) -> int:
+    """
+    Recompute and store readiness for the plans of `user_ids`. Returns how many changed.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return 0
+    totals = dict(
+        RetirementIncomeSource.objects.filter(user_id__in=user_ids)
+        .values("user_id")
+        .annotate(total=Sum("amount"))
+        .values_list("user_id", "total")
+    )
+    changed = []
+    for plan in RetirementPlan.objects.filter(user_id__in=user_ids):
+        readiness = compute_readiness(plan.projected_expenses, totals.get(plan.user_id))
+        if plan.readiness != readiness:
+            plan.readiness = readiness
+            changed.append(plan)
+    if changed:
+        # bulk_update sends no post_save, so this doesn't mark the plans dirty again
+        RetirementPlan.objects.bulk_update(changed, ["readiness"])
+    return len(changed)
+
+
+def pending_users() -> set:
+    if not hasattr(_pending, "user_ids"):
+        _pending.user_ids = set()
+    return _pending.user_ids
+
+
+def flush() -> int:
+    """
+    Recompute every user marked dirty on this thread. The first on_commit callback of a
+    transaction does the work; the others find the set empty.
+    """
+    user_ids = pending_users()
+    if not user_ids:
+        return 0
+    batch = set(user_ids)
+    user_ids.clear()
+    return recompute(batch)
+
+
+def mark_dirty(user_id: Optional[int]) -> None:
+    """
+    Queue `user_id` for a readiness recompute after the current transaction commits
+    (immediately when there is no transaction). A user left queued by a rolled-back
+    transaction is recomputed with the next flush, which is harmless.
+    """
+    if user_id is None:
+        return
+    pending_users().add(user_id)
+    transaction.on_commit(flush)
@@ -0,0 +1,123 @@
+"""
+What-if grid over retirement age, withdrawal rate, return assumption and inflation.
+
+Every cell is the readiness the retirement page would show for that plan: the income rows
+imported from investments are replaced by each investment's projected balance at the
+scenario's retirement age times its withdrawal rate, the user's other income sources are
+kept as entered, and the total is compared with projected_expenses. Inflation grows the
+expenses (and the other income sources, which are in today's dollars too) until retirement,
+so it only discounts the investment income.
+
+Balances come from investment_app.projection in one call covering every investment x
+return offset x retirement age; the withdrawal-rate and inflation axes are broadcast on top,
+so the whole grid is a handful of array operations whatever its size.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from investment_app.projection import project_balances
+from personal_project.memo_cache import MemoCache
+
+AXES = ("retirement_age", "withdrawal_rate", "return_offset", "inflation")
+MAX_AXIS_POINTS = 50
+MAX_GRID_CELLS = 50_000
+
+SCENARIO_CACHE = MemoCache("readiness_grid", maxsize=256)
+
+
+def parse_axis(raw: Optional[str], default: List[float], integer: bool = False) -> List[float]:
+    """
+    Axis values from "a,b,c" or an inclusive range "start:stop[:step]" (step defaults to 1).
+    Raises ValueError for malformed input or more than MAX_AXIS_POINTS values.
+    """
+    if not raw:
+        return list(default)
+    cast = int if integer else float
+    if ':' in raw:
+        parts = [cast(p) for p in raw.split(':')]
+        if len(parts) not in (2, 3):
+            raise ValueError(raw)
+        start, stop = parts[0], parts[1]
+        step = parts[2] if len(parts) == 3 else cast(1)
+        if step <= 0 or stop < start:
+            raise ValueError(raw)
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        if count > MAX_AXIS_POINTS:
+            raise ValueError(raw)
+        values = [start + step * k for k in range(count)]
+        return values if integer else [round(v, 6) for v in values]
+    values = [cast(p) for p in raw.split(',') if p.strip()]
+    if not values or len(values) > MAX_AXIS_POINTS:
+        raise ValueError(raw)
+    return values
+
+
+def investment_income_names(investments: Iterable) -> set:
+    # the names the retirement page's investment import gives its income rows
+    return {(inv.investment_name or f"Investment {inv.id}").strip() for inv in investments}
+
+
+def readiness_grid(
+    plan,
+    investments: Iterable,
+    incomes: Iterable,
+    retirement_ages: List[int],
+    withdrawal_rates: List[float],
+    return_offsets: List[float],
+    inflation_rates: List[float],
+) -> Dict:
+    """
+    Readiness (whole percent, 0-100) and investment income for every combination of the
+    four axes, as nested lists indexed [retirement_age][withdrawal_rate][return_offset][inflation]
+    (investment_income, in nominal monthly dollars, has no inflation axis).
+    return_offsets are percentage points added to every investment's rate_of_return.
+    """
+    investments = list(investments)
+    derived = investment_income_names(investments)
+    other_income = sum(float(inc.amount) for inc in incomes if inc.income_source.strip() not in derived)
+    expenses = float(plan.projected_expenses)
+
+    ages = np.array(retirement_ages, dtype=np.int64)
+    withdrawal = np.array(withdrawal_rates, dtype=np.float64)
+    offsets = np.array(return_offsets, dtype=np.float64)
+    inflation = np.array(inflation_rates, dtype=np.float64)
+    years = np.maximum(ages - plan.current_age, 0)
+
+    if investments:
+        # one projection row per (investment, return offset), sampled at each retirement age
+        n = len(offsets)
+        balances = project_balances(
+            np.repeat([float(inv.value) for inv in investments], n),
+            (np.array([float(inv.rate_of_return) for inv in investments])[:, None] + offsets[None, :]).ravel(),
+            np.repeat([float(inv.contribution) for inv in investments], n),
+            np.repeat([inv.contribution_timeline_years for inv in investments], n),
+            years * 12,
+        ).reshape(len(investments), n, len(ages)).sum(axis=0)
+    else:
+        balances = np.zeros((len(offsets), len(ages)))
+
+    # (age, withdrawal, offset): monthly income from the investments in nominal dollars
+    investment_income = balances.T[:, None, :] * (withdrawal[None, :, None] / 100.0 / 12.0)
+    # (age, inflation): how much prices have grown by retirement
+    price_growth = (1.0 + inflation[None, :] / 100.0) ** years[:, None]
+    covered = investment_income[..., None] / price_growth[:, None, None, :] + other_income
+    if expenses > 0:
+        # floor(x + 0.5) rounds halves up, like the frontend's Math.round
+        readiness = np.floor(np.clip(covered / expenses * 100.0, 0.0, 100.0) + 0.5)
+    else:
+        readiness = np.zeros_like(covered)
+
+    return {
+        "axes": {
+            "retirement_age": [int(a) for a in ages],
+            "withdrawal_rate": withdrawal.tolist(),
+            "return_offset": offsets.tolist(),
+            "inflation": inflation.tolist(),
+        },
+        "order": list(AXES),
+        "other_income": round(other_income, 2),
+        "projected_expenses": round(expenses, 2),
+        "readiness": readiness.astype(int).tolist(),
+        "investment_income": np.round(investment_income, 2).tolist(),
+    }
@@ -5,6 +5,8 @@ class PlanSerializer(serializers.ModelSerializer):
     class Meta:
         model = RetirementPlan
         fields = ['id', 'current_age', 'retirement_age', 'projected_expenses', 'withdrawal_rate', 'readiness']
+        # computed on the server from the plan and income sources (see readiness.py)
+        read_only_fields = ['readiness']
 
 class IncomeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from personal_project.memo_cache import invalidate_owner
+from .models import RetirementPlan, RetirementIncomeSource
+from .readiness import mark_dirty
+
+
+@receiver(post_save, sender=RetirementPlan)
+def plan_saved(sender, instance, update_fields=None, **kwargs):
+    # a save that only wrote readiness itself has nothing new to recompute from
+    if update_fields is not None and set(update_fields) <= {"readiness"}:
+        return
+    mark_dirty(instance.user_id)
+    invalidate_owner(instance.user_id)
+
+
+@receiver(post_delete, sender=RetirementPlan)
+def plan_deleted(sender, instance, **kwargs):
+    invalidate_owner(instance.user_id)
+
+
+@receiver(post_save, sender=RetirementIncomeSource)
+@receiver(post_delete, sender=RetirementIncomeSource)
+def income_changed(sender, instance, **kwargs):
+    mark_dirty(instance.user_id)
+    invalidate_owner(instance.user_id)
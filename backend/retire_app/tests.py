@@ -1,3 +1,379 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from investment_app.projection import project_balances
+from user_app.models import App_user
+from . import backtest, monte_carlo, readiness
+from .backtest import TRADING_DAYS_PER_YEAR, HistoryTooShort, run_backtest, yearly_growth
+from .inflation_stats import InflationAggregates
+from .models import RetirementIncomeSource, RetirementPlan
+from .monte_carlo import SimulationInputs, project_paths, run_simulation, simulate
+from .readiness import compute_readiness
+from .scenarios import parse_axis, readiness_grid
+
+
+def sample_inputs(**overrides):
+    fields = dict(
+        current_age=40,
+        retirement_age=60,
+        end_age=90,
+        monthly_expenses=4000.0,
+        withdrawal_rate=4.0,
+        values=np.array([150000.0, 40000.0]),
+        rates=np.array([7.0, 3.0]),
+        contributions=np.array([800.0, 200.0]),
+        contribution_years=np.array([15, 25]),
+        income_ages=np.array([62, 67]),
+        income_amounts=np.array([1000.0, 1500.0]),
+        volatility=15.0,
+        inflation=2.0,
+    )
+    fields.update(overrides)
+    return SimulationInputs(**fields)
+
+
+def plan_rows(imported_income=False):
+    plan = mock.Mock(current_age=40, retirement_age=60, projected_expenses=4000, withdrawal_rate=4)
+    investments = [
+        mock.Mock(id=1, investment_name="Brokerage", value=150000, rate_of_return=7, contribution=800, contribution_timeline_years=15),
+        mock.Mock(id=2, investment_name="", value=40000, rate_of_return=3, contribution=200, contribution_timeline_years=25),
+    ]
+    incomes = [mock.Mock(income_source="Social Security", age_available=67, amount=1500)]
+    if imported_income:
+        # the rows the retirement page writes for each investment on every plan save
+        incomes += [
+            mock.Mock(income_source="Brokerage", age_available=60, amount=2200),
+            mock.Mock(income_source="Investment 2", age_available=60, amount=400),
+        ]
+    return plan, investments, incomes
+
+
+class MonteCarloTests(SimpleTestCase):
+    def test_income_imported_from_investments_is_not_counted_twice(self):
+        without = SimulationInputs.from_plan(*plan_rows())
+        with_imported = SimulationInputs.from_plan(*plan_rows(imported_income=True))
+        np.testing.assert_array_equal(with_imported.income_amounts, [1500.0])
+        self.assertEqual(
+            run_simulation(without, paths=2000, seed=5),
+            run_simulation(with_imported, paths=2000, seed=5),
+        )
+
+    def test_same_seed_same_result(self):
+        inputs = sample_inputs()
+        first = run_simulation(inputs, paths=2000, seed=1234)
+        second = run_simulation(inputs, paths=2000, seed=1234)
+        self.assertEqual(first, second)
+        other = run_simulation(inputs, paths=2000, seed=4321)
+        self.assertNotEqual(first["bands"], other["bands"])
+
+    def test_pool_and_serial_blocks_agree(self):
+        inputs = sample_inputs()
+        with mock.patch.object(monte_carlo, "CHUNK_PATHS", 500):
+            serial = simulate(inputs, 1700, seed=99, use_pool=False)
+            pooled = simulate(inputs, 1700, seed=99, use_pool=True)
+        np.testing.assert_array_equal(serial[0], pooled[0])
+        np.testing.assert_array_equal(serial[1], pooled[1])
+
+    def test_zero_volatility_accumulation_matches_the_projection(self):
+        inputs = sample_inputs(volatility=0.0)
+        balances, _ = simulate(inputs, 3, seed=1)
+        expected = project_balances(
+            inputs.values, inputs.rates, inputs.contributions, inputs.contribution_years,
+            np.arange(inputs.years_to_retire + 1) * 12,
+        ).sum(axis=0)
+        for row in balances:
+            np.testing.assert_allclose(row[:inputs.years_to_retire + 1], expected, rtol=1e-10)
+
+    def test_vectorized_paths_match_a_year_by_year_loop(self):
+        inputs = sample_inputs()
+        rng = np.random.default_rng(7)
+        paths, retire, horizon = 50, inputs.years_to_retire, inputs.horizon
+        investment_growth = rng.lognormal(0.05, 0.2, (paths, len(inputs.values), retire))
+        pool_growth = rng.lognormal(0.0, 0.25, (paths, horizon - retire))
+        balances, depleted_at = project_paths(inputs, investment_growth, pool_growth)
+
+        contributions = inputs.yearly_contributions()
+        withdrawals = inputs.yearly_withdrawals()
+        for p in range(paths):
+            per_investment = inputs.values.copy()
+            expected = [per_investment.sum()]
+            for t in range(retire):
+                per_investment = per_investment * investment_growth[p, :, t] + contributions[:, t]
+                expected.append(per_investment.sum())
+            pool, depleted = expected[-1], -1
+            for t in range(horizon - retire):
+                pool -= withdrawals[t]
+                if pool < 0 and depleted < 0:
+                    depleted = retire + t
+                pool = max(pool, 0.0) * pool_growth[p, t]
+                expected.append(pool)
+            np.testing.assert_allclose(balances[p], expected, rtol=1e-9, atol=1e-6)
+            self.assertEqual(depleted_at[p], depleted)
+
+
+def naive_yearly_growth(prices, years, wrap):
+    """
+    Window-by-window version of backtest.yearly_growth: from each start day, the price
+    ratio across each following TRADING_DAYS_PER_YEAR trading days.
+    """
+    daily = prices[1:] / prices[:-1]
+    span = TRADING_DAYS_PER_YEAR * years
+    starts = range(len(daily)) if wrap else range(max(len(prices) - span, 0))
+    rows = []
+    for start in starts:
+        row = []
+        for year in range(years):
+            factor = 1.0
+            for day in range(year * TRADING_DAYS_PER_YEAR, (year + 1) * TRADING_DAYS_PER_YEAR):
+                factor *= daily[(start + day) % len(daily)]
+            row.append(factor)
+        rows.append(row)
+    return np.array(rows).reshape(len(rows), years)
+
+
+class BacktestTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.prices = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, TRADING_DAYS_PER_YEAR * 4 + 17)))
+
+    def test_yearly_growth_matches_a_window_by_window_loop(self):
+        for years, wrap in [(2, False), (3, False), (6, True), (2, True)]:
+            growth, starts = yearly_growth(np.log(self.prices), years, wrap)
+            expected = naive_yearly_growth(self.prices, years, wrap)
+            np.testing.assert_allclose(growth, expected, rtol=1e-9)
+            np.testing.assert_array_equal(starts, np.arange(len(expected)))
+
+    def test_plan_longer_than_history_needs_wrap(self):
+        growth, starts = yearly_growth(np.log(self.prices), 6)
+        self.assertEqual((growth.shape, len(starts)), ((0, 6), 0))
+
+    def stored_history(self, years=6):
+        rng = np.random.default_rng(4)
+        log_prices = np.cumsum(rng.normal(0.0003, 0.01, TRADING_DAYS_PER_YEAR * years))
+        ordinals = np.arange(len(log_prices), dtype=np.int64) + 730000
+        return mock.patch.object(backtest, "load_history", return_value=(ordinals, log_prices, True))
+
+    def test_income_imported_from_investments_is_not_counted_twice(self):
+        with self.stored_history():
+            without = run_backtest(SimulationInputs.from_plan(*plan_rows()), wrap=True)
+            with_imported = run_backtest(SimulationInputs.from_plan(*plan_rows(imported_income=True)), wrap=True)
+        self.assertEqual(without, with_imported)
+
+    def test_plan_longer_than_history_raises_without_wrap(self):
+        inputs = sample_inputs()
+        with self.stored_history():
+            with self.assertRaises(HistoryTooShort) as raised:
+                run_backtest(inputs)
+            self.assertEqual(raised.exception.plan_years, inputs.horizon)
+            self.assertEqual(run_backtest(inputs, wrap=True)["windows"], TRADING_DAYS_PER_YEAR * 6 - 1)
+
+
+class ScenarioGridTests(SimpleTestCase):
+    ages, rates, offsets, inflation = [55, 60, 67], [3.0, 4.0, 5.5], [-2.0, 0.0, 1.5], [0.0, 2.5]
+
+    def grid(self, imported_income=True):
+        return readiness_grid(*plan_rows(imported_income), self.ages, self.rates, self.offsets, self.inflation)
+
+    def test_every_cell_matches_a_single_plan_readiness(self):
+        plan, investments, _ = plan_rows()
+        grid = self.grid()
+        for a, age in enumerate(self.ages):
+            years = age - plan.current_age
+            for w, rate in enumerate(self.rates):
+                for o, offset in enumerate(self.offsets):
+                    balance = sum(
+                        project_balances(
+                            np.array([float(inv.value)]), np.array([inv.rate_of_return + offset]),
+                            np.array([float(inv.contribution)]), np.array([inv.contribution_timeline_years]),
+                            np.array([years * 12]),
+                        )[0, 0]
+                        for inv in investments
+                    )
+                    monthly = balance * rate / 100 / 12
+                    self.assertAlmostEqual(grid["investment_income"][a][w][o], round(monthly, 2), places=2)
+                    for i, infl in enumerate(self.inflation):
+                        # the imported rows are replaced; only Social Security is kept as entered
+                        covered = monthly / (1 + infl / 100) ** years + 1500
+                        expected = compute_readiness(Decimal(plan.projected_expenses), Decimal(covered))
+                        self.assertEqual(grid["readiness"][a][w][o][i], int(expected))
+
+    def test_imported_income_rows_are_replaced_not_added(self):
+        self.assertEqual(self.grid(imported_income=True), self.grid(imported_income=False))
+        self.assertEqual(self.grid()["other_income"], 1500.0)
+
+    def test_shape_follows_the_axes(self):
+        grid = self.grid()
+        self.assertEqual(np.array(grid["readiness"]).shape, (3, 3, 3, 2))
+        self.assertEqual(np.array(grid["investment_income"]).shape, (3, 3, 3))
+        self.assertEqual(grid["axes"]["retirement_age"], self.ages)
+
+    def test_no_investments_or_expenses(self):
+        plan, _, incomes = plan_rows()
+        grid = readiness_grid(plan, [], incomes, [60], [4.0], [0.0], [0.0])
+        self.assertEqual(grid["readiness"], [[[[38]]]])  # 1500 / 4000
+        plan.projected_expenses = 0
+        self.assertEqual(readiness_grid(plan, [], incomes, [60], [4.0], [0.0], [0.0])["readiness"], [[[[0]]]])
+
+    def test_parse_axis(self):
+        self.assertEqual(parse_axis(None, [4.0]), [4.0])
+        self.assertEqual(parse_axis("60:64:2", [], integer=True), [60, 62, 64])
+        self.assertEqual(parse_axis("3:4:0.25", []), [3.0, 3.25, 3.5, 3.75, 4.0])
+        self.assertEqual(parse_axis("-2, 0,2", []), [-2.0, 0.0, 2.0])
+        for raw in ("5:1", "1:2:0", "1:2:3:4", "a,b", "0:100:1", ","):
+            with self.assertRaises(ValueError):
+                parse_axis(raw, [])
+
+
+def naive_window(years, rates, start, end, rolling, percentiles):
+    """
+    Straight-from-the-definition version of InflationAggregates.window: slice the years
+    in [start, end] and average each window directly.
+    """
+    picked = [(y, r) for y, r in zip(years, rates)
+              if (start is None or y >= start) and (end is None or y <= end)]
+    values = [r for _, r in picked]
+    out = {"count": len(values), "rolling": {}}
+    if values:
+        out["start_year"], out["end_year"] = picked[0][0], picked[-1][0]
+        out["arithmetic_mean"] = sum(values) / len(values)
+        growth = 1.0
+        for r in values:
+            growth *= 1 + r / 100
+        out["geometric_mean"] = (growth ** (1 / len(values)) - 1) * 100
+        out["percentiles"] = list(np.percentile(values, percentiles))
+    for k in rolling:
+        out["rolling"][k] = [
+            (picked[e][0], sum(values[e - k + 1:e + 1]) / k) for e in range(k - 1, len(values))
+        ]
+    return out
+
+
+class InflationAggregatesTests(SimpleTestCase):
+    rolling = (1, 3, 10)
+    percentiles = (10, 50, 90)
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.years = np.arange(1990, 2020)
+        self.rates = rng.normal(3.0, 2.5, len(self.years))
+        self.aggregates = InflationAggregates(self.years, self.rates)
+
+    def window(self, start, end):
+        return self.aggregates.window(start, end, rolling=self.rolling, percentiles=self.percentiles)
+
+    def test_windows_match_a_per_window_mean(self):
+        # whole series, open ends, an interior window, bounds outside the data, a single point
+        for start, end in [(None, None), (None, 2000), (2005, None), (1995, 2012),
+                           (1980, 2030), (2003, 2003), (2019, 2019)]:
+            got = self.window(start, end)
+            expected = naive_window(self.years, self.rates, start, end, self.rolling, self.percentiles)
+            self.assertEqual(got["count"], expected["count"])
+            self.assertEqual((got["start_year"], got["end_year"]), (expected["start_year"], expected["end_year"]))
+            self.assertAlmostEqual(got["arithmetic_mean"], expected["arithmetic_mean"], places=4)
+            self.assertAlmostEqual(got["geometric_mean"], expected["geometric_mean"], places=4)
+            np.testing.assert_allclose(list(got["percentiles"].values()), expected["percentiles"], atol=1e-4)
+            for k in self.rolling:
+                rolled = got["rolling"][str(k)]
+                self.assertEqual([y for y, _ in rolled["values"]], [y for y, _ in expected["rolling"][k]])
+                np.testing.assert_allclose(
+                    [a for _, a in rolled["values"]], [a for _, a in expected["rolling"][k]], atol=1e-4,
+                )
+
+    def test_single_point_window(self):
+        got = self.window(2003, 2003)
+        rate = round(float(self.rates[13]), 4)
+        self.assertEqual((got["count"], got["start_year"], got["end_year"]), (1, 2003, 2003))
+        self.assertEqual(got["arithmetic_mean"], rate)
+        self.assertAlmostEqual(got["geometric_mean"], rate, places=4)
+        self.assertEqual(set(got["percentiles"].values()), {rate})
+        self.assertEqual(got["rolling"]["1"]["values"], [[2003, rate]])
+        self.assertEqual(got["rolling"]["3"], {"values": [], "min": None, "max": None, "latest": None})
+
+    def test_empty_windows(self):
+        # inverted bounds, a gap before the first year, and a gap after the last
+        for start, end in [(2010, 2000), (1900, 1950), (2030, None)]:
+            got = self.window(start, end)
+            self.assertEqual(got["count"], 0)
+            self.assertIsNone(got["start_year"])
+            self.assertIsNone(got["arithmetic_mean"])
+            self.assertIsNone(got["geometric_mean"])
+            self.assertEqual(got["percentiles"], {})
+            for k in self.rolling:
+                self.assertEqual(got["rolling"][str(k)]["values"], [])
+        self.assertEqual(InflationAggregates(np.array([], dtype=np.int64), np.array([])).window()["count"], 0)
+
+
+class BacktestViewTests(TestCase):
+    def setUp(self):
+        user = App_user.objects.create_user(username="saver@example.com", email="saver@example.com", password="pw")
+        RetirementPlan.objects.create(user=user, current_age=40, retirement_age=65, projected_expenses=4000, withdrawal_rate=4)
+        self.client = APIClient()
+        self.client.cookies["token"] = Token.objects.create(user=user).key
+
+    def test_missing_history_is_a_503_without_fetching(self):
+        with mock.patch.object(backtest, "sync_many") as sync, mock.patch.object(backtest, "refresh_all") as refresh:
+            response = self.client.get("/api/retire/backtest/")
+        self.assertEqual(response.status_code, 503)
+        sync.assert_not_called()
+        refresh.assert_not_called()
+
+    def test_plan_longer_than_history_asks_for_wrap(self):
+        prices = np.linspace(100, 200, TRADING_DAYS_PER_YEAR * 16)
+        history = (np.arange(len(prices), dtype=np.int64) + 730000, np.log(prices), True)
+        with mock.patch.object(backtest, "load_history", return_value=history):
+            response = self.client.get("/api/retire/backtest/")
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("wrap=1", response.json()["detail"])
+            self.assertEqual(self.client.get("/api/retire/backtest/?wrap=1").status_code, 200)
+
+
+class ReadinessTests(TestCase):
+    def setUp(self):
+        self.user = App_user.objects.create_user(username="planner@example.com", email="planner@example.com", password="pw")
+        self.client = APIClient()
+        self.client.cookies["token"] = Token.objects.create(user=self.user).key
+
+    def post_plan(self, **fields):
+        data = dict(current_age=40, retirement_age=65, projected_expenses="4000.00", withdrawal_rate="4.00", **fields)
+        return self.client.post("/api/retire/", data, format="json")
+
+    def test_create_and_update_responses_carry_the_stored_readiness(self):
+        RetirementIncomeSource.objects.create(user=self.user, income_source="Pension", age_available=65, amount=2000)
+        response = self.post_plan()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["readiness"], "50.00")
+
+        response = self.client.post("/api/retire/", {"projected_expenses": "8000.00"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["readiness"], "25.00")
+        self.assertEqual(RetirementPlan.objects.get(user=self.user).readiness, Decimal("25.00"))
+
+    def test_writes_in_one_transaction_recompute_once_on_commit(self):
+        RetirementPlan.objects.create(user=self.user, current_age=40, retirement_age=65, projected_expenses=1000, withdrawal_rate=4)
+        with mock.patch.object(readiness, "recompute", wraps=readiness.recompute) as recompute:
+            with self.captureOnCommitCallbacks(execute=True):
+                for amount in (100, 200, 300):
+                    RetirementIncomeSource.objects.create(
+                        user=self.user, income_source=f"Source {amount}", age_available=65, amount=amount,
+                    )
+                recompute.assert_not_called()
+        recompute.assert_called_once_with({self.user.id})
+        self.assertEqual(RetirementPlan.objects.get(user=self.user).readiness, Decimal("60.00"))
+
+    def test_rolled_back_writes_leave_readiness_alone(self):
+        RetirementPlan.objects.create(user=self.user, current_age=40, retirement_age=65, projected_expenses=1000, withdrawal_rate=4)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    RetirementIncomeSource.objects.create(user=self.user, income_source="Gone", age_available=65, amount=500)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertIsNone(RetirementPlan.objects.get(user=self.user).readiness)
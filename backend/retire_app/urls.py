@@ -1,10 +1,17 @@
+from django.conf import settings
 from django.urls import path
-from .views import ( RetirementPlanView, RetirementIncomeListCreate, IncomeDelete, RetirementIncomeBulkImport, InflationData)
+from .views import ( RetirementPlanView, RetirementIncomeListCreate, IncomeDelete, RetirementIncomeBulkImport, InflationData, AsyncInflationData, InflationStats, RetirementSimulation, ScenarioGrid, RetirementBacktest)
+
+InflationView = AsyncInflationData if settings.ASYNC_IO_VIEWS else InflationData
 
 urlpatterns = [
     path('', RetirementPlanView.as_view(), name='retire-plan-view'),
     path('income/', RetirementIncomeListCreate.as_view(), name = 'retire-list-create'),
     path('income/<int:pk>/', IncomeDelete.as_view(), name='income-delete'),
     path('income/bulk/', RetirementIncomeBulkImport.as_view(), name='income-bulk-import'),
-    path('inflation/', InflationData.as_view(), name='get-inflation'),
+    path('inflation/', InflationView.as_view(), name='get-inflation'),
+    path('inflation/stats/', InflationStats.as_view(), name='inflation-stats'),
+    path('simulate/', RetirementSimulation.as_view(), name='retire-simulation'),
+    path('scenarios/', ScenarioGrid.as_view(), name='retire-scenarios'),
+    path('backtest/', RetirementBacktest.as_view(), name='retire-backtest'),
 ]
\ No newline at end of file
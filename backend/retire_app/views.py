@@ -4,12 +4,24 @@ from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from django.http import JsonResponse
-import requests
+from datetime import date
 
 from .models import RetirementPlan, RetirementIncomeSource
 from .serializers import PlanSerializer, IncomeSerializer
-from user_app.views import TokenReq
-import os
+from user_app.views import TokenReq, AsyncTokenReq
+from .economic_data import INFLATION_AVERAGE, INFLATION_SERIES_ID
+from .readiness import flush as flush_readiness, mark_dirty
+from .backtest import BACKTEST_SYMBOLS, DEFAULT_BACKTEST_SYMBOL, HistoryTooShort, run_backtest
+from .scenarios import MAX_GRID_CELLS, SCENARIO_CACHE, parse_axis, readiness_grid
+from .inflation_stats import DEFAULT_PERCENTILES, ROLLING_YEARS, get_aggregates
+from .monte_carlo import (
+    DEFAULT_END_AGE, DEFAULT_PATHS, DEFAULT_VOLATILITY, MAX_END_AGE, MAX_PATHS, SIMULATION_CACHE, SimulationInputs,
+    run_simulation,
+)
+from investment_app.models import Investment
+from investment_app.projection import investment_inputs
+from personal_project.listing import list_response
+from personal_project.memo_cache import invalidate_owner
 from dotenv import load_dotenv
 
 class RetirementPlanView(TokenReq):
@@ -34,16 +46,21 @@ class RetirementPlanView(TokenReq):
             status_code = status.HTTP_201_CREATED
 
         if serializer.is_valid():
-            serializer.save(user=request.user)
-            return Response(serializer.data, status=status_code)
+            plan = serializer.save(user=request.user)
+            # the save only queued the readiness recompute (it runs on commit, on a fresh
+            # query), so run it now and read the stored value back for the response
+            flush_readiness()
+            plan.refresh_from_db(fields=['readiness'])
+            return Response(PlanSerializer(plan).data, status=status_code)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class RetirementIncomeListCreate(TokenReq):
+    orderings = ('income_source', 'age_available', 'amount')
+
     def get(self, request):
         income = RetirementIncomeSource.objects.filter(user=request.user)
-        serializer = IncomeSerializer(income, many=True)
-        return Response(serializer.data)
+        return list_response(request, income, IncomeSerializer, self.orderings)
 
     def post(self, request):
         data = request.data.copy()
@@ -114,27 +131,213 @@ class RetirementIncomeBulkImport(TokenReq):
                 # bulk_update requires a list of model instances and the fields to update
                 RetirementIncomeSource.objects.bulk_update(to_update, ["age_available", "amount"])
 
+            # bulk_create / bulk_update send no signals, so queue the readiness recompute and
+            # drop the user's memoized results here
+            mark_dirty(user.id)
+            invalidate_owner(user.id)
+
         # Return the refreshed list of incomes (so frontend can update without extra GET)
         refreshed = RetirementIncomeSource.objects.filter(user=user)
         return Response(IncomeSerializer(refreshed, many=True).data, status=status.HTTP_200_OK)
     
 
 class InflationData(TokenReq):
-    api_key = os.getenv('INFLATION_KEY')
-    url = f'https://api.stlouisfed.org/fred/series/observations?series_id=FPCPITOTLZGUSA&api_key={api_key}&file_type=json'
+    def get(self, request):
+        average_value, _ = INFLATION_AVERAGE.get()
+        if average_value is None:
+            return JsonResponse({'error': 'Inflation data is temporarily unavailable.'}, status=503)
+        return JsonResponse({'average_value': average_value})
+
+
+class AsyncInflationData(AsyncTokenReq):
+    """
+    InflationData for ASGI deployments; the hot path is a cache read on the event loop.
+    """
+
+    async def get(self, request):
+        average_value, _ = await INFLATION_AVERAGE.aget()
+        if average_value is None:
+            return JsonResponse({'error': 'Inflation data is temporarily unavailable.'}, status=503)
+        return JsonResponse({'average_value': average_value})
+
+
+def parse_int_list(raw, default):
+    if not raw:
+        return list(default)
+    return [int(part) for part in raw.split(',') if part.strip()]
+
+
+class InflationStats(TokenReq):
+    """
+    GET ?start=YYYY&end=YYYY&rolling=10,20,30&percentiles=10,50,90 (all optional).
+    Arithmetic and geometric mean inflation over the window, the trailing rolling averages
+    that fit inside it, and percentiles of the annual rates. Answered from prefix sums kept
+    per stored version of the series (see inflation_stats.py).
+    """
 
     def get(self, request):
-        response = requests.get(self.url)
-        data = response.json()
+        try:
+            start = int(request.query_params['start']) if request.query_params.get('start') else None
+            end = int(request.query_params['end']) if request.query_params.get('end') else None
+            rolling = parse_int_list(request.query_params.get('rolling'), ROLLING_YEARS)
+            percentiles = parse_int_list(request.query_params.get('percentiles'), DEFAULT_PERCENTILES)
+        except ValueError:
+            return Response({'detail': 'start, end, rolling and percentiles must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+        if any(k < 1 for k in rolling) or any(not 0 <= p <= 100 for p in percentiles):
+            return Response({'detail': 'rolling must be positive and percentiles within 0-100.'}, status=status.HTTP_400_BAD_REQUEST)
+        if start is not None and end is not None and start > end:
+            return Response({'detail': 'start must not be after end.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Extracting the observations
-        observations = data.get('observations', [])
-        values = [float(obs['value']) for obs in observations if obs['value']]
+        aggregates = get_aggregates(INFLATION_SERIES_ID)
+        if aggregates is None:
+            return Response({'error': 'Inflation data is temporarily unavailable.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
-        # Calculating the average value
-        if values:
-            average_value = round(sum(values) / len(values), 3)
-        else:
-            average_value = 0.0
+        stats = aggregates.window(start, end, rolling=rolling, percentiles=percentiles)
+        stats['series_id'] = INFLATION_SERIES_ID
+        return Response(stats)
+
+
+def plan_inputs(plan, investments, incomes):
+    """
+    Everything the projection-style retirement endpoints read from the user's rows, as the
+    content their MemoCache entries are keyed by. Labels are calendar years, so the current
+    year is included too.
+    """
+    return {
+        'year': date.today().year,
+        'plan': [plan.current_age, plan.retirement_age, plan.projected_expenses, plan.withdrawal_rate],
+        'investments': investment_inputs(investments),
+        'incomes': sorted([inc.income_source, inc.age_available, inc.amount] for inc in incomes),
+    }
+
+
+class RetirementSimulation(TokenReq):
+    """
+    GET ?paths=10000&seed=42&volatility=15&inflation=0&end_age=95 (all optional).
+    Monte Carlo run of the user's plan over their investments and income sources: chance
+    the money lasts to end_age, yearly percentile balance bands and the balance at
+    retirement. Pass the returned seed back to repeat a run. See monte_carlo.py.
+    """
+
+    def get(self, request):
+        plan = RetirementPlan.objects.filter(user=request.user).first()
+        if plan is None:
+            return Response({'detail': 'Create a retirement plan first.'}, status=status.HTTP_404_NOT_FOUND)
+
+        params = request.query_params
+        try:
+            paths = int(params.get('paths', DEFAULT_PATHS))
+            seed = int(params['seed']) if params.get('seed') else None
+            volatility = float(params.get('volatility', DEFAULT_VOLATILITY))
+            inflation = float(params.get('inflation', 0))
+            end_age = int(params.get('end_age', DEFAULT_END_AGE))
+        except ValueError:
+            return Response({'detail': 'paths, seed and end_age must be integers; volatility and inflation numbers.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= paths <= MAX_PATHS:
+            return Response({'detail': f'paths must be between 1 and {MAX_PATHS}.'}, status=status.HTTP_400_BAD_REQUEST)
+        if seed is not None and seed < 0:
+            return Response({'detail': 'seed must not be negative.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= volatility <= 100 or not -50 < inflation <= 100:
+            return Response({'detail': 'volatility must be within 0-100 and inflation within -50-100.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not max(plan.retirement_age, plan.current_age) < end_age <= MAX_END_AGE:
+            return Response({'detail': f'end_age must be after the retirement age and at most {MAX_END_AGE}.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        investments = list(Investment.objects.filter(user=request.user))
+        incomes = list(RetirementIncomeSource.objects.filter(user=request.user))
+        inputs = SimulationInputs.from_plan(
+            plan, investments, incomes, end_age=end_age, volatility=volatility, inflation=inflation,
+        )
+        if seed is None:
+            return Response(run_simulation(inputs, paths=paths, seed=seed))
+        # a seeded run is a pure function of its inputs, so repeating it is a cache hit
+        key = plan_inputs(plan, investments, incomes)
+        key['simulation'] = [paths, seed, volatility, inflation, end_age]
+        result = SIMULATION_CACHE.get_or_compute(
+            request.user.id, key, lambda: run_simulation(inputs, paths=paths, seed=seed)
+        )
+        return Response(result)
+
+
+class ScenarioGrid(TokenReq):
+    """
+    GET ?retirement_ages=60:70&withdrawal_rates=3:5:0.25&return_offsets=-2,0,2&inflation=0,2.5
+    Each axis is a comma list or an inclusive start:stop[:step] range and defaults to the
+    saved plan (no return offset, no inflation). Returns the readiness of every combination
+    in one response, e.g. a retirement age x withdrawal rate heatmap. See scenarios.py.
+    """
+
+    def get(self, request):
+        plan = RetirementPlan.objects.filter(user=request.user).first()
+        if plan is None:
+            return Response({'detail': 'Create a retirement plan first.'}, status=status.HTTP_404_NOT_FOUND)
+
+        params = request.query_params
+        try:
+            ages = parse_axis(params.get('retirement_ages'), [plan.retirement_age], integer=True)
+            rates = parse_axis(params.get('withdrawal_rates'), [float(plan.withdrawal_rate)])
+            offsets = parse_axis(params.get('return_offsets'), [0.0])
+            inflation = parse_axis(params.get('inflation'), [0.0])
+        except ValueError:
+            return Response({'detail': 'Axes must be comma lists or start:stop[:step] ranges of at most 50 numbers.'}, status=status.HTTP_400_BAD_REQUEST)
+        if any(not 0 <= a <= 120 for a in ages) or any(not 0 <= r <= 100 for r in rates):
+            return Response({'detail': 'retirement_ages must be within 0-120 and withdrawal_rates within 0-100.'}, status=status.HTTP_400_BAD_REQUEST)
+        if any(not -50 <= o <= 50 for o in offsets) or any(not -50 < i <= 100 for i in inflation):
+            return Response({'detail': 'return_offsets must be within -50-50 and inflation within -50-100.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ages) * len(rates) * len(offsets) * len(inflation) > MAX_GRID_CELLS:
+            return Response({'detail': f'The grid may have at most {MAX_GRID_CELLS} cells.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        investments = list(Investment.objects.filter(user=request.user))
+        incomes = list(RetirementIncomeSource.objects.filter(user=request.user))
+        key = plan_inputs(plan, investments, incomes)
+        key['grid'] = [ages, rates, offsets, inflation]
+        grid = SCENARIO_CACHE.get_or_compute(
+            request.user.id, key,
+            lambda: readiness_grid(plan, investments, incomes, ages, rates, offsets, inflation),
+        )
+        return Response(grid)
+
+
+class RetirementBacktest(TokenReq):
+    """
+    GET ?symbol=VOO&real=1&wrap=0&end_age=95 (all optional).
+    Runs the plan from every trading day in the stored history of `symbol` on its actual
+    (by default inflation-adjusted) yearly returns, and reports the share of start dates
+    where the money lasts plus the worst, median and best windows. Only stored history is
+    read (see backtest.sync_history); a plan longer than the history is a 400 unless wrap=1,
+    which replays it.
+    """
+
+    def get(self, request):
+        plan = RetirementPlan.objects.filter(user=request.user).first()
+        if plan is None:
+            return Response({'detail': 'Create a retirement plan first.'}, status=status.HTTP_404_NOT_FOUND)
+
+        params = request.query_params
+        symbol = params.get('symbol', DEFAULT_BACKTEST_SYMBOL).upper()
+        if symbol not in BACKTEST_SYMBOLS:
+            return Response({'detail': f'symbol must be one of {", ".join(BACKTEST_SYMBOLS)}.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            end_age = int(params.get('end_age', DEFAULT_END_AGE))
+        except ValueError:
+            return Response({'detail': 'end_age must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not max(plan.retirement_age, plan.current_age) < end_age <= MAX_END_AGE:
+            return Response({'detail': f'end_age must be after the retirement age and at most {MAX_END_AGE}.'}, status=status.HTTP_400_BAD_REQUEST)
+        real = params.get('real', '1').lower() not in ('0', 'false', 'no')
+        wrap = params.get('wrap', '0').lower() in ('1', 'true', 'yes')
 
-        return JsonResponse({'average_value': average_value})
\ No newline at end of file
+        inputs = SimulationInputs.from_plan(
+            plan,
+            Investment.objects.filter(user=request.user),
+            RetirementIncomeSource.objects.filter(user=request.user),
+            end_age=end_age,
+        )
+        try:
+            result = run_backtest(inputs, symbol=symbol, real=real, wrap=wrap)
+        except HistoryTooShort as e:
+            return Response(
+                {'detail': f'This plan spans {e.plan_years} years but only {e.stored_years:.0f} years of {symbol} history are stored. Pass wrap=1 to replay the history for longer plans.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if result is None:
+            return Response({'error': f'Stored price history for {symbol} is not available yet.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(result)
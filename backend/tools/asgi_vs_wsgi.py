@@ -0,0 +1,119 @@
+"""
+Load test comparing the WSGI deployment (gunicorn, sync views) with the ASGI one
+(uvicorn, async views for market gains and inflation) under the same upstream latency.
+
+It starts the stand-in FMP/FRED server, then each app server in turn against it, and runs
+tools/bench.py's load against both with the same settings:
+
+    python tools/asgi_vs_wsgi.py --email bench@example.com --password secret \
+        --latency-ms 300 --concurrency 32 --requests 320
+
+Both servers get the same budget of OS processes (--workers); gunicorn additionally gets
+--threads per worker. Uses whatever DJANGO_SETTINGS_MODULE / database the shell points at.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import bench
+
+TOOLS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = TOOLS_DIR.parent
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.2)
+    raise SystemExit(f"nothing listening on port {port} after {timeout}s")
+
+
+def start(cmd, env, port, log):
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    wait_for_port(port)
+    return proc
+
+
+def stop(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def server_commands(args):
+    return {
+        "wsgi": [
+            "gunicorn", "personal_project.wsgi:application",
+            "--bind", f"127.0.0.1:{args.port}",
+            "--workers", str(args.workers), "--threads", str(args.threads),
+        ],
+        "asgi": [
+            "uvicorn", "personal_project.asgi:application",
+            "--port", str(args.port), "--workers", str(args.workers), "--no-access-log",
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--email", required=True, help="existing user; the inflation endpoint needs auth")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--endpoint", action="append", help=f"path to hit; repeatable (default: {bench.DEFAULT_ENDPOINTS})")
+    parser.add_argument("--latency-ms", type=float, default=300, help="stand-in upstream latency")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=320, help="requests per endpoint per server")
+    parser.add_argument("--workers", type=int, default=1, help="processes per app server")
+    parser.add_argument("--threads", type=int, default=4, help="threads per gunicorn worker")
+    parser.add_argument("--port", type=int, default=8010, help="app server port")
+    parser.add_argument("--standin-port", type=int, default=8766)
+    parser.add_argument("--only", choices=["wsgi", "asgi"], help="run a single mode")
+    parser.add_argument("--log", default=os.devnull, help="file for the servers' output")
+    args = parser.parse_args(argv)
+
+    upstream = f"http://127.0.0.1:{args.standin_port}"
+    env = dict(os.environ, FMP_BASE_URL=upstream, FRED_BASE_URL=upstream)
+    base_url = f"http://127.0.0.1:{args.port}"
+    endpoints = args.endpoint or bench.DEFAULT_ENDPOINTS
+
+    rows = []
+    with open(args.log, "a") as log:
+        standin = start(
+            [sys.executable, str(TOOLS_DIR / "standin_server.py"), "serve",
+             "--port", str(args.standin_port), "--latency-ms", str(args.latency_ms)],
+            env, args.standin_port, log,
+        )
+        try:
+            for mode, cmd in server_commands(args).items():
+                if args.only and mode != args.only:
+                    continue
+                proc = start(cmd, env, args.port, log)
+                try:
+                    token = bench.login(base_url, args.email, args.password)
+                    for path in endpoints:
+                        bench.run_endpoint(base_url, path, 1, 5, None, token, 60)
+                        row = bench.run_endpoint(base_url, path, args.concurrency, args.requests, None, token, 60)
+                        row["endpoint"] = f"{mode} {path}"
+                        rows.append(row)
+                finally:
+                    stop(proc)
+        finally:
+            stop(standin)
+
+    print(
+        f"upstream latency {args.latency_ms}ms, concurrency {args.concurrency}, "
+        f"{args.workers} worker(s) per server, gunicorn threads {args.threads}"
+    )
+    bench.print_table(rows)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Concurrent latency benchmark for the backend's HTTP endpoints.
+
+Point the backend at the stand-in server first (see tools/standin_server.py) so results
+don't depend on FMP/FRED, then for example:
+
+    python tools/bench.py --base-url http://127.0.0.1:8000 --concurrency 16 --requests 400 \
+        --email bench@example.com --password secret
+
+Reports p50/p95/p99/max latency, throughput and error count per endpoint. Endpoints that
+need auth get the `token` cookie from --token, or from logging in with --email/--password.
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_ENDPOINTS = ["/api/invest/market-gains/", "/api/retire/inflation/"]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def login(base_url, email, password):
+    resp = requests.post(f"{base_url}/api/users/login/", json={"email": email, "password": password}, timeout=30)
+    token = resp.cookies.get("token")
+    if not token:
+        raise SystemExit(f"login failed ({resp.status_code}): {resp.text[:200]}")
+    return token
+
+
+def run_endpoint(base_url, path, concurrency, total, duration, token, timeout):
+    """
+    Fire `total` requests (or as many as fit in `duration` seconds) at `path` from
+    `concurrency` workers, each with its own keep-alive session.
+    """
+    url = f"{base_url}{path}"
+    latencies = []
+    errors = {}
+    lock = threading.Lock()
+    issued = 0
+    local = threading.local()
+    deadline = time.monotonic() + duration if duration else None
+
+    def next_slot():
+        nonlocal issued
+        with lock:
+            if deadline is not None:
+                return time.monotonic() < deadline
+            if issued >= total:
+                return False
+            issued += 1
+            return True
+
+    def worker():
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+            if token:
+                session.cookies.set("token", token)
+        while next_slot():
+            started = time.perf_counter()
+            try:
+                resp = session.get(url, timeout=timeout)
+                resp.content
+                elapsed = time.perf_counter() - started
+                key = None if resp.status_code < 400 else str(resp.status_code)
+            except requests.RequestException as exc:
+                elapsed = time.perf_counter() - started
+                key = type(exc).__name__
+            with lock:
+                if key is None:
+                    latencies.append(elapsed)
+                else:
+                    errors[key] = errors.get(key, 0) + 1
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    ms = lambda v: round(v * 1000, 2) if v is not None else None
+    return {
+        "endpoint": path,
+        "ok": len(latencies),
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "mean_ms": ms(statistics.fmean(latencies)) if latencies else None,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1] if latencies else None),
+    }
+
+
+def print_table(rows):
+    cols = ["endpoint", "ok", "throughput_rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "errors"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in cols}
+    print("  ".join(c.ljust(widths[c]) for c in cols))
+    for r in rows:
+        print("  ".join(str(r[c]).ljust(widths[c]) for c in cols))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", action="append", help=f"path to hit; repeatable (default: {DEFAULT_ENDPOINTS})")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--duration", type=float, help="run each endpoint for this many seconds instead of --requests")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per endpoint first")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--token", help="value for the `token` auth cookie")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    base_url = args.base_url.rstrip("/")
+    token = args.token
+    if not token and args.email:
+        token = login(base_url, args.email, args.password)
+
+    rows = []
+    for path in args.endpoint or DEFAULT_ENDPOINTS:
+        if args.warmup:
+            run_endpoint(base_url, path, 1, args.warmup, None, token, args.timeout)
+        rows.append(run_endpoint(base_url, path, args.concurrency, args.requests, args.duration, token, args.timeout))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
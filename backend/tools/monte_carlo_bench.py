@@ -0,0 +1,77 @@
+"""
+Throughput benchmark for the Monte Carlo retirement simulator (retire_app/monte_carlo.py).
+
+Runs the simulation on a synthetic plan (no database or Django settings needed) for each
+path count, in this process and on the process pool, and reports paths per second:
+
+    python tools/monte_carlo_bench.py --paths 10000,50000,200000 --repeat 3
+
+The best of --repeat runs is reported; the pool is warmed up once before timing.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from retire_app import monte_carlo as mc  # noqa: E402
+
+
+def sample_inputs(investments, current_age, retirement_age, end_age):
+    rng = np.random.default_rng(0)
+    return mc.SimulationInputs(
+        current_age=current_age,
+        retirement_age=retirement_age,
+        end_age=end_age,
+        monthly_expenses=6000.0,
+        withdrawal_rate=4.0,
+        values=rng.uniform(5_000, 100_000, investments),
+        rates=rng.uniform(3, 9, investments),
+        contributions=rng.uniform(100, 800, investments).round(),
+        contribution_years=rng.integers(5, retirement_age - current_age + 1, investments),
+        income_ages=np.array([65, 67]),
+        income_amounts=np.array([800.0, 2500.0]),
+    )
+
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paths", default="10000,50000,200000", help="comma-separated path counts")
+    parser.add_argument("--investments", type=int, default=4)
+    parser.add_argument("--current-age", type=int, default=35)
+    parser.add_argument("--retirement-age", type=int, default=65)
+    parser.add_argument("--end-age", type=int, default=95)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    inputs = sample_inputs(args.investments, args.current_age, args.retirement_age, args.end_age)
+    counts = [int(p) for p in args.paths.split(",") if p.strip()]
+    mc.simulate(inputs, 2 * mc.CHUNK_PATHS, 0, use_pool=True)
+
+    print(
+        f"{args.investments} investments, {inputs.horizon} years per path, "
+        f"{os.cpu_count()} CPU(s), blocks of {mc.CHUNK_PATHS} paths"
+    )
+    print(f"{'paths':>9} {'mode':>7} {'seconds':>9} {'paths/s':>12}")
+    for paths in counts:
+        for mode, use_pool in (("serial", False), ("pool", True)):
+            elapsed = best_time(lambda: mc.simulate(inputs, paths, 42, use_pool=use_pool), args.repeat)
+            print(f"{paths:>9} {mode:>7} {elapsed:>9.3f} {paths / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
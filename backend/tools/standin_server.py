@@ -0,0 +1,338 @@
+"""
+Local stand-in for the two upstream APIs the backend calls:
+
+- Financial Modeling Prep (historical-price-full, historical-price-eod/light, quote)
+- FRED (fred/series/observations)
+
+It serves recorded fixtures when it has them and deterministic synthetic data when it
+doesn't, with configurable latency, error rate and history length, so the market and
+inflation endpoints can be run and benchmarked offline.
+
+Serve:
+    python tools/standin_server.py serve --port 8765 --latency-ms 150 --jitter-ms 50 --error-rate 0.02
+
+then start Django against it:
+    FMP_BASE_URL=http://127.0.0.1:8765 FRED_BASE_URL=http://127.0.0.1:8765 python manage.py runserver
+
+Record fixtures from the live services (uses MARKET_KEY / INFLATION_KEY from the environment):
+    python tools/standin_server.py record --symbols VOO,QQQ,DIA,BTCUSD --series FPCPITOTLZGUSA,CPIAUCSL,DGS10,FEDFUNDS --out tools/fixtures
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+LIVE_FMP = "https://financialmodelingprep.com"
+LIVE_FRED = "https://api.stlouisfed.org"
+
+# FRED series we know are published once a year; everything else is synthesized monthly.
+ANNUAL_SERIES = {"FPCPITOTLZGUSA"}
+
+
+# ---------------------------------------------------------------------------
+# data
+# ---------------------------------------------------------------------------
+class DataSource:
+    """
+    Fixture-backed data with a synthetic fallback. Fixture layout:
+        <dir>/fmp/<SYMBOL>.json   FMP full-history payload ({"symbol", "historical": [...]})
+        <dir>/fred/<SERIES>.json  FRED observations payload ({"observations": [...]})
+    """
+
+    def __init__(self, fixtures=None, history_days=9000):
+        self.fixtures = Path(fixtures) if fixtures else None
+        self.history_days = history_days
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _load_fixture(self, kind, name):
+        if not self.fixtures:
+            return None
+        path = self.fixtures / kind / f"{name}.json"
+        if not path.exists():
+            return None
+        with open(path) as fh:
+            return json.load(fh)
+
+    def _memo(self, key, build):
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = build()
+            return self._cache[key]
+
+    def history(self, symbol):
+        """Newest-first list of {"date", "close"} rows, like FMP."""
+
+        def build():
+            fixture = self._load_fixture("fmp", symbol)
+            if fixture:
+                rows = fixture.get("historical", fixture) if isinstance(fixture, dict) else fixture
+                rows = [r for r in rows if isinstance(r, dict) and r.get("date")]
+                return sorted(rows, key=lambda r: r["date"], reverse=True)
+            return synthetic_history(symbol, self.history_days)
+
+        return self._memo(("fmp", symbol), build)
+
+    def observations(self, series_id):
+        """Oldest-first list of FRED observation rows."""
+
+        def build():
+            fixture = self._load_fixture("fred", series_id)
+            if fixture:
+                return fixture.get("observations", [])
+            return synthetic_observations(series_id)
+
+        return self._memo(("fred", series_id), build)
+
+
+def _rng(name):
+    return random.Random(zlib.crc32(name.encode()))
+
+
+def synthetic_history(symbol, days):
+    """Deterministic geometric random walk ending today, newest first."""
+    rng = _rng(symbol)
+    crypto = symbol.endswith("USD")
+    drift, vol = (0.0008, 0.035) if crypto else (0.0003, 0.011)
+    price = 50.0 + rng.random() * 200
+    rows = []
+    today = date.today()
+    start = today - timedelta(days=days)
+    d = start
+    while d <= today:
+        if crypto or d.weekday() < 5:
+            price *= math.exp(drift + vol * rng.gauss(0, 1))
+            rows.append({"date": d.isoformat(), "close": round(price, 4)})
+        d += timedelta(days=1)
+    rows.reverse()
+    return rows
+
+
+def synthetic_observations(series_id):
+    rng = _rng(series_id)
+    today = date.today()
+    rows = []
+    if series_id in ANNUAL_SERIES:
+        for year in range(1960, today.year):
+            rows.append({"date": f"{year}-01-01", "value": f"{max(-1.0, rng.gauss(3.7, 2.6)):.4f}"})
+    else:
+        level = 1.0 + rng.random() * 5
+        year, month = 1960, 1
+        while (year, month) < (today.year, today.month):
+            level = max(0.05, level + rng.gauss(0, 0.15))
+            rows.append({"date": f"{year}-{month:02d}-01", "value": f"{level:.2f}"})
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+    for row in rows:
+        row["realtime_start"] = row["realtime_end"] = today.isoformat()
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# server
+# ---------------------------------------------------------------------------
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FinCatStandIn/1.0"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def do_GET(self):
+        server = self.server
+        delay = max(0.0, server.latency + random.uniform(-server.jitter, server.jitter))
+        if server.hang_rate and random.random() < server.hang_rate:
+            delay = server.hang_seconds
+        if delay:
+            time.sleep(delay)
+
+        if server.error_rate and random.random() < server.error_rate:
+            return self._send(500, {"Error Message": "stand-in injected failure"})
+
+        parsed = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        parts = [p for p in parsed.path.split("/") if p]
+
+        try:
+            if parts[:2] == ["api", "v3"] and len(parts) >= 4 and parts[2] == "historical-price-full":
+                symbol = parts[-1]
+                return self._send(200, {"symbol": symbol, "historical": self._window(symbol, query)})
+            if parts[:2] == ["stable", "historical-price-eod"]:
+                symbol = query.get("symbol", "")
+                rows = [
+                    {"symbol": symbol, "date": r["date"], "price": r["close"], "volume": 0}
+                    for r in self._window(symbol, query)
+                ]
+                return self._send(200, rows)
+            if parts[:3] == ["api", "v3", "quote"] and len(parts) == 4:
+                now = int(time.time())
+                out = []
+                for symbol in parts[3].split(","):
+                    rows = server.data.history(symbol)
+                    if rows:
+                        out.append({"symbol": symbol, "price": rows[0]["close"], "timestamp": now})
+                return self._send(200, out)
+            if parts == ["fred", "series", "observations"]:
+                series_id = query.get("series_id", "")
+                start = query.get("observation_start")
+                rows = [r for r in server.data.observations(series_id) if not start or r["date"] >= start]
+                return self._send(200, {
+                    "realtime_start": date.today().isoformat(),
+                    "observation_start": start or "1600-01-01",
+                    "count": len(rows),
+                    "observations": rows,
+                })
+        except Exception as exc:
+            return self._send(500, {"error": str(exc)})
+
+        return self._send(404, {"error": f"stand-in has no route for {parsed.path}"})
+
+    def _window(self, symbol, query):
+        rows = self.server.data.history(symbol)
+        start, end = query.get("from"), query.get("to")
+        if start or end:
+            rows = [r for r in rows if (not start or r["date"] >= start) and (not end or r["date"] <= end)]
+        return rows
+
+    def _send(self, code, payload):
+        body = json.dumps(payload).encode()
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if code == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, data, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 hang_rate=0.0, hang_seconds=60.0, verbose=False):
+        super().__init__(address, StandInHandler)
+        self.data = data
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.verbose = verbose
+
+
+def serve(args):
+    data = DataSource(args.fixtures, history_days=args.history_days)
+    server = StandInServer(
+        (args.host, args.port),
+        data,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        verbose=args.verbose,
+    )
+    print(
+        f"stand-in FMP/FRED on http://{args.host}:{args.port} "
+        f"(latency {args.latency_ms}±{args.jitter_ms}ms, errors {args.error_rate:.0%}, "
+        f"hangs {args.hang_rate:.0%}, fixtures {args.fixtures or 'synthetic'})"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# recording
+# ---------------------------------------------------------------------------
+def record(args):
+    import requests
+
+    out = Path(args.out)
+    (out / "fmp").mkdir(parents=True, exist_ok=True)
+    (out / "fred").mkdir(parents=True, exist_ok=True)
+    market_key = os.getenv("MARKET_KEY")
+    fred_key = os.getenv("INFLATION_KEY")
+
+    for symbol in filter(None, args.symbols.split(",")):
+        if symbol.endswith("USD"):
+            resp = requests.get(
+                f"{LIVE_FMP}/stable/historical-price-eod/light",
+                params={"symbol": symbol, "apikey": market_key},
+                timeout=60,
+            )
+            rows = [{"date": r["date"], "close": r.get("price", r.get("close"))} for r in resp.json()]
+            payload = {"symbol": symbol, "historical": rows}
+        else:
+            resp = requests.get(
+                f"{LIVE_FMP}/api/v3/historical-price-full/{symbol}",
+                params={"serietype": "line", "apikey": market_key},
+                timeout=60,
+            )
+            payload = resp.json()
+        with open(out / "fmp" / f"{symbol}.json", "w") as fh:
+            json.dump(payload, fh)
+        print(f"recorded {symbol}: {len(payload.get('historical', []))} rows")
+
+    for series_id in filter(None, args.series.split(",")):
+        resp = requests.get(
+            f"{LIVE_FRED}/fred/series/observations",
+            params={"series_id": series_id, "api_key": fred_key, "file_type": "json"},
+            timeout=60,
+        )
+        payload = resp.json()
+        with open(out / "fred" / f"{series_id}.json", "w") as fh:
+            json.dump(payload, fh)
+        print(f"recorded {series_id}: {len(payload.get('observations', []))} observations")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("serve", help="run the stand-in server")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--fixtures", help="directory written by `record` (default: synthetic data only)")
+    p.add_argument("--latency-ms", type=float, default=0, help="added to every response")
+    p.add_argument("--jitter-ms", type=float, default=0, help="uniform +/- spread around --latency-ms")
+    p.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 500")
+    p.add_argument("--hang-rate", type=float, default=0.0, help="fraction of requests that stall for --hang-seconds")
+    p.add_argument("--hang-seconds", type=float, default=60.0)
+    p.add_argument("--history-days", type=int, default=9000, help="length of synthetic FMP histories (payload size)")
+    p.add_argument("--verbose", action="store_true", help="log every request")
+    p.set_defaults(func=serve)
+
+    p = sub.add_parser("record", help="record fixtures from the live services")
+    p.add_argument("--symbols", default="VOO,QQQ,DIA,BTCUSD")
+    p.add_argument("--series", default="FPCPITOTLZGUSA,CPIAUCSL,DGS10,FEDFUNDS")
+    p.add_argument("--out", default=str(Path(__file__).resolve().parent / "fixtures"))
+    p.set_defaults(func=record)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from user_app.totals import RECONCILE_BATCH_SIZE, reconcile
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's stored budget, net-worth and investment totals and repair any that drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="only report drift, don't repair it")
+        parser.add_argument("--batch-size", type=int, default=RECONCILE_BATCH_SIZE, help="users per comparison query")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        checked, drifted = reconcile(options["batch_size"], repair=not options["check"])
+        action = "found" if options["check"] else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} user(s), {action} {drifted} with drifted totals"))
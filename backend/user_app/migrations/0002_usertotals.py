@@ -0,0 +1,27 @@
+# Generated by Django 5.0.3 on 2026-10-18 21:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTotals',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='totals', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('income_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('expense_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('deduction_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('asset_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('liability_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('investment_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+    ]
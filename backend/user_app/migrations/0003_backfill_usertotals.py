@@ -0,0 +1,49 @@
+# Generated by Django 5.0.3 on 2026-10-18 23:30
+
+from django.db import migrations
+from django.db.models import Sum
+
+
+# model -> (UserTotals field, summed field), frozen from user_app.totals.TRACKED_MODELS
+TRACKED_MODELS = {
+    ('budget_app', 'Income'): ('income_total', 'amount'),
+    ('budget_app', 'Expense'): ('expense_total', 'amount'),
+    ('budget_app', 'Deduction'): ('deduction_total', 'amount'),
+    ('networth_app', 'Asset'): ('asset_total', 'amount'),
+    ('networth_app', 'Liability'): ('liability_total', 'amount'),
+    ('investment_app', 'Investment'): ('investment_total', 'value'),
+}
+BATCH_SIZE = 1000
+
+
+def backfill_totals(apps, schema_editor):
+    App_user = apps.get_model('user_app', 'App_user')
+    UserTotals = apps.get_model('user_app', 'UserTotals')
+    missing = list(App_user.objects.filter(totals__isnull=True).order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(missing), BATCH_SIZE):
+        rows = {pk: UserTotals(user_id=pk) for pk in missing[start:start + BATCH_SIZE]}
+        for (app_label, model_name), (total, field) in TRACKED_MODELS.items():
+            sums = (
+                apps.get_model(app_label, model_name).objects
+                .filter(user_id__in=list(rows))
+                .values('user_id')
+                .annotate(total=Sum(field))
+                .values_list('user_id', 'total')
+            )
+            for user_id, value in sums:
+                setattr(rows[user_id], total, value or 0)
+        UserTotals.objects.bulk_create(rows.values(), ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_app', '0002_usertotals'),
+        ('budget_app', '0004_list_ordering_indexes'),
+        ('networth_app', '0003_list_ordering_indexes'),
+        ('investment_app', '0007_list_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
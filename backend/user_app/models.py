@@ -9,3 +9,22 @@ class App_user(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS =[]
     # lists
+
+
+class UserTotals(models.Model):
+    """
+    The user's running totals over their budget, net-worth and investment rows, kept in
+    step on every save and delete by F() updates (see totals.py), so reading them is one
+    primary-key lookup. Queryset update()/bulk_create() bypass that; the reconcile_totals
+    command repairs any drift.
+    """
+    user = models.OneToOneField(App_user, on_delete=models.CASCADE, primary_key=True, related_name="totals")
+    income_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    expense_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    deduction_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    asset_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    liability_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    investment_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.user_id} - totals"
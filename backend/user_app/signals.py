@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import App_user, UserTotals
+from .totals import TRACKED_MODELS, apply_delta
+
+
+def amount_of(instance):
+    _, field = TRACKED_MODELS[type(instance)]
+    return Decimal(str(getattr(instance, field) or 0))
+
+
+def remember_previous(sender, instance, raw=False, **kwargs):
+    # an update moves the total by new - old, so read the stored row's old owner and amount
+    instance._previous_total = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    _, field = TRACKED_MODELS[sender]
+    instance._previous_total = sender.objects.filter(pk=instance.pk).values_list("user_id", field).first()
+
+
+def row_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    total, _ = TRACKED_MODELS[sender]
+    amount = amount_of(instance)
+    previous = getattr(instance, "_previous_total", None)
+    if previous is None:
+        apply_delta(instance.user_id, total, amount)
+    elif previous[0] != instance.user_id:
+        apply_delta(previous[0], total, -Decimal(previous[1] or 0))
+        apply_delta(instance.user_id, total, amount)
+    else:
+        apply_delta(instance.user_id, total, amount - Decimal(previous[1] or 0))
+
+
+def row_deleted(sender, instance, **kwargs):
+    total, _ = TRACKED_MODELS[sender]
+    apply_delta(instance.user_id, total, -amount_of(instance))
+
+
+def user_created(sender, instance, created=False, raw=False, **kwargs):
+    # a new user has no rows yet, so their totals start at zero
+    if created and not raw:
+        UserTotals.objects.get_or_create(user=instance)
+
+
+post_save.connect(user_created, sender=App_user, dispatch_uid="totals-user-created")
+for model in TRACKED_MODELS:
+    pre_save.connect(remember_previous, sender=model, dispatch_uid=f"totals-pre-save-{model.__name__}")
+    post_save.connect(row_saved, sender=model, dispatch_uid=f"totals-saved-{model.__name__}")
+    post_delete.connect(row_deleted, sender=model, dispatch_uid=f"totals-deleted-{model.__name__}")
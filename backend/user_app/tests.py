@@ -1,3 +1,81 @@
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps
 from django.test import TestCase
 
-# Create your tests here.
+from budget_app.models import Expense, Income
+from investment_app.models import Investment
+from networth_app.models import Asset
+from .models import App_user, UserTotals
+from .totals import TOTAL_FIELDS, get_totals, reconcile
+
+backfill = import_module("user_app.migrations.0003_backfill_usertotals")
+
+
+def make_user(email):
+    return App_user.objects.create_user(username=email, email=email, password="pw")
+
+
+class UserTotalsTests(TestCase):
+    def setUp(self):
+        self.user = make_user("saver@example.com")
+
+    def totals(self, user=None):
+        return UserTotals.objects.get(pk=(user or self.user).pk)
+
+    def test_row_is_created_with_the_user(self):
+        totals = self.totals()
+        self.assertEqual([getattr(totals, field) for field in TOTAL_FIELDS], [0] * len(TOTAL_FIELDS))
+
+    def test_saves_and_deletes_move_the_totals(self):
+        pay = Income.objects.create(user=self.user, name="pay", amount=Decimal("2500.00"))
+        Income.objects.create(user=self.user, name="side", amount=Decimal("300.50"))
+        rent = Expense.objects.create(user=self.user, name="rent", amount=Decimal("1200.00"))
+        Investment.objects.create(
+            user=self.user, investment_name="index", value=Decimal("10000.00"),
+            rate_of_return=7, contribution=100, contribution_timeline_years=10,
+        )
+        self.assertEqual(self.totals().income_total, Decimal("2800.50"))
+
+        pay.amount = Decimal("2600.00")
+        pay.save()
+        rent.delete()
+        totals = self.totals()
+        self.assertEqual(totals.income_total, Decimal("2900.50"))
+        self.assertEqual(totals.expense_total, 0)
+        self.assertEqual(totals.investment_total, Decimal("10000.00"))
+
+    def test_moving_a_row_to_another_user_moves_its_amount(self):
+        other = make_user("other@example.com")
+        asset = Asset.objects.create(user=self.user, name="car", amount=Decimal("8000.00"))
+        asset.user = other
+        asset.save()
+        self.assertEqual(self.totals().asset_total, 0)
+        self.assertEqual(self.totals(other).asset_total, Decimal("8000.00"))
+
+    def test_reconcile_repairs_writes_that_skip_signals(self):
+        Income.objects.create(user=self.user, name="pay", amount=Decimal("1000.00"))
+        Income.objects.bulk_create([Income(user=self.user, name=f"gig {n}", amount=Decimal("50.00")) for n in range(4)])
+        clean = make_user("clean@example.com")
+        UserTotals.objects.filter(pk=clean.pk).delete()  # a row that went missing
+
+        self.assertEqual(reconcile(batch_size=1, repair=False), (2, 2))
+        self.assertEqual(self.totals().income_total, Decimal("1000.00"))
+        self.assertEqual(reconcile(batch_size=1), (2, 2))
+        self.assertEqual(self.totals().income_total, Decimal("1200.00"))
+        self.assertEqual(self.totals(clean).income_total, 0)
+        self.assertEqual(reconcile(), (2, 0))
+
+    def test_get_totals_computes_a_missing_row(self):
+        Income.objects.create(user=self.user, name="pay", amount=Decimal("700.00"))
+        UserTotals.objects.filter(pk=self.user.pk).delete()
+        self.assertEqual(get_totals(self.user.pk).income_total, Decimal("700.00"))
+
+    def test_backfill_migration_creates_missing_rows(self):
+        Income.objects.create(user=self.user, name="pay", amount=Decimal("700.00"))
+        Asset.objects.create(user=self.user, name="cash", amount=Decimal("90.00"))
+        UserTotals.objects.all().delete()
+        backfill.backfill_totals(apps, None)
+        totals = self.totals()
+        self.assertEqual((totals.income_total, totals.asset_total, totals.expense_total), (Decimal("700.00"), Decimal("90.00"), 0))
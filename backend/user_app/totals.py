@@ -0,0 +1,104 @@
+"""
+Per-user running totals (UserTotals) over the budget, net-worth and investment rows.
+
+Every save and delete of a tracked row moves the matching total by the row's change with
+a single `UPDATE ... SET total = total + delta` (an F() expression, so concurrent writes
+for the same user add up instead of overwriting each other); see signals.py. The row is
+created, all zeros, together with the user (migration 0003 backfilled it for users that
+existed before), so every delta has a row to move. Writes that skip model signals
+(queryset update(), bulk_create, raw SQL) or a crash between a row's save and its total's
+update leave the totals drifted; reconcile() finds and repairs that in bulk.
+"""
+from decimal import Decimal
+from typing import Tuple
+
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+from budget_app.models import Income, Expense, Deduction
+from investment_app.models import Investment
+from networth_app.models import Asset, Liability
+from personal_project.aggregates import sum_of
+from .models import App_user, UserTotals
+
+# tracked model -> (UserTotals field, the model field it sums)
+TRACKED_MODELS = {
+    Income: ("income_total", "amount"),
+    Expense: ("expense_total", "amount"),
+    Deduction: ("deduction_total", "amount"),
+    Asset: ("asset_total", "amount"),
+    Liability: ("liability_total", "amount"),
+    Investment: ("investment_total", "value"),
+}
+TOTAL_FIELDS = [total for total, _ in TRACKED_MODELS.values()]
+
+# Users per reconcile chunk: one query compares a chunk's stored and recomputed totals.
+RECONCILE_BATCH_SIZE = 1000
+
+
+def computed_totals():
+    # Sum subqueries recomputing every total; correlated on "pk", which is the user id on
+    # both App_user and UserTotals
+    return {total: sum_of(model, field) for model, (total, field) in TRACKED_MODELS.items()}
+
+
+def stored_totals(*totals: str):
+    """
+    Expressions reading `totals` (default: all of them) from the user's UserTotals row, for
+    .values()/.annotate() on an App_user queryset: one join instead of a scan per total.
+    A user without a row (the post_save didn't run) falls back to the computed total.
+    """
+    sources = {total: (model, field) for model, (total, field) in TRACKED_MODELS.items()}
+    return {
+        total: Coalesce(F(f"totals__{total}"), sum_of(*sources[total]))
+        for total in totals or TOTAL_FIELDS
+    }
+
+
+def get_totals(user_id: int) -> UserTotals:
+    """
+    The user's UserTotals row: one primary-key lookup. A user without one (the post_save
+    didn't run) gets it computed in full and inserted.
+    """
+    totals = UserTotals.objects.filter(pk=user_id).first()
+    if totals is None:
+        computed = App_user.objects.filter(pk=user_id).values(**computed_totals()).get()
+        totals, _ = UserTotals.objects.get_or_create(user_id=user_id, defaults=computed)
+    return totals
+
+
+def apply_delta(user_id: int, total: str, delta: Decimal) -> None:
+    if delta:
+        UserTotals.objects.filter(pk=user_id).update(**{total: F(total) + delta})
+
+
+def reconcile(batch_size: int = RECONCILE_BATCH_SIZE, repair: bool = True) -> Tuple[int, int]:
+    """
+    Compare every user's stored totals with freshly computed ones, walking users in
+    primary-key chunks with one comparison query each. Drifted or missing rows are
+    repaired (with `repair`) by one UPDATE per chunk that recomputes the totals inside the
+    database, so a write landing between the comparison and the repair is not lost.
+    Returns (users checked, users drifted).
+    """
+    stored = {f"stored_{total}": F(f"totals__{total}") for total in TOTAL_FIELDS}
+    checked = drifted = 0
+    last_pk = 0
+    while True:
+        rows = list(
+            App_user.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values("pk", **computed_totals(), **stored)[:batch_size]
+        )
+        if not rows:
+            break
+        stale = [row for row in rows if any(row[total] != row[f"stored_{total}"] for total in TOTAL_FIELDS)]
+        if stale and repair:
+            missing = [row["pk"] for row in stale if row[f"stored_{TOTAL_FIELDS[0]}"] is None]
+            UserTotals.objects.bulk_create([UserTotals(user_id=pk) for pk in missing], ignore_conflicts=True)
+            UserTotals.objects.filter(pk__in=[row["pk"] for row in stale]).update(**computed_totals())
+        checked += len(rows)
+        drifted += len(stale)
+        last_pk = rows[-1]["pk"]
+        if len(rows) < batch_size:
+            break
+    return checked, drifted
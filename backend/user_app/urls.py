@@ -1,10 +1,11 @@
 from django.urls import path
-from .views import Sign_up, Log_in, Log_out, Info, TestEndpoint
+from .views import Sign_up, Log_in, Log_out, Info, TestEndpoint, Totals
 
 urlpatterns = [
     path("", Info.as_view()),
     path("signup/", Sign_up.as_view()),
     path("login/", Log_in.as_view()),
     path("logout/", Log_out.as_view()),
-    path("test/", TestEndpoint.as_view())
+    path("test/", TestEndpoint.as_view()),
+    path("totals/", Totals.as_view()),
 ]
\ No newline at end of file
@@ -174,9 +174,12 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.authtoken.models import Token
 from .models import App_user
+from .totals import TOTAL_FIELDS, get_totals
 from datetime import timedelta, datetime
-from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.csrf import ensure_csrf_cookie, csrf_exempt
 from django.utils.decorators import method_decorator
+from django.views import View
+from django.http import JsonResponse
 import logging
 
 logger = logging.getLogger(__name__)
@@ -326,6 +329,39 @@ class TokenReq(APIView):
     permission_classes = [IsAuthenticated]
 
 
+class AsyncTokenReq(View):
+    """
+    TokenReq for native async views. DRF's APIView only runs sync handlers, so this is a
+    plain Django View doing the same cookie-token check with an async ORM lookup; the
+    401 bodies match what DRF returns. Handlers must be `async def` and get
+    request.user / request.auth set from the token.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # like APIView: auth is by token cookie, not session, so CSRF doesn't apply
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        key = request.COOKIES.get("token")
+        if not key:
+            return self.unauthorized("Authentication credentials were not provided.")
+        try:
+            token = await Token.objects.select_related("user").aget(key=key)
+        except Token.DoesNotExist:
+            return self.unauthorized("Invalid token.")
+        if not token.user.is_active:
+            return self.unauthorized("User inactive or deleted.")
+        request.user = token.user
+        request.auth = token
+        return await super().dispatch(request, *args, **kwargs)
+
+    def unauthorized(self, detail):
+        response = JsonResponse({"detail": detail}, status=401)
+        response["WWW-Authenticate"] = "Token"
+        return response
+
+
 class Log_out(TokenReq):
     def post(self, request):
         request.user.auth_token.delete()
@@ -360,3 +396,14 @@ class Info(TokenReq):
         except ValidationError as e:
             logger.debug("Info PUT validation error: %s", e)
             return Response({"code": "validation_error", "error": getattr(e, "message_dict", e.messages)}, status=HTTP_400_BAD_REQUEST)
+
+
+class Totals(TokenReq):
+    """
+    The user's income, expense, deduction, asset, liability and investment totals, read from
+    the UserTotals row kept up to date on every write (see totals.py).
+    """
+
+    def get(self, request):
+        totals = get_totals(request.user.id)
+        return Response({field: getattr(totals, field) for field in TOTAL_FIELDS})
@@ -46,4 +46,13 @@ export async function addDeduction(deductionData) {
 
 export async function deleteDeduction(deductionId) {
   await api.delete(`budget/deductions/${deductionId}/`);
-}
\ No newline at end of file
+}
+
+// --- SUMMARY ---
+
+// Totals, net profit and spend ratios computed server-side; pass top to also get the
+// largest spending categories.
+export async function getBudgetSummary(top) {
+  const response = await api.get('budget/summary/', { params: top ? { top } : {} });
+  return response.data;
+}
@@ -1,20 +1,10 @@
-import React, { useEffect, useState } from 'react';
+import React from 'react';
 import { Paper, Typography, Divider, Box } from '@mui/material';
 import { useTheme } from '@mui/material/styles';
-import { getFavoriteGoals } from '../goals_api'; // adjust the path if needed
 
-const FavoriteGoalsCard = () => {
+// favoriteGoals: goals.favorites from GET /api/dashboard/
+const FavoriteGoalsCard = ({ favoriteGoals = [] }) => {
   const theme = useTheme();
-  const [favoriteGoals, setFavoriteGoals] = useState([]);
-
-  useEffect(() => {
-    const fetchGoals = async () => {
-      const favorites = await getFavoriteGoals();
-      setFavoriteGoals(favorites);
-    };
-
-    fetchGoals();
-  }, []);
 
   return (
     <Paper
@@ -1,103 +1,54 @@
 // components/InvestChart.jsx
-import React, { useMemo } from "react";
+import React, { useEffect, useMemo, useState } from "react";
 import PropTypes from "prop-types";
 import { Box, useTheme, Typography } from "@mui/material";
 import { LineChart, lineElementClasses } from "@mui/x-charts/LineChart";
+import { getProjection } from "../investment_api";
 
+// the projection endpoint's limit (investment_app/projection.py MAX_PROJECTION_YEARS)
+const MAX_PROJECTION_YEARS = 100;
 
-function computeYearlySeries(inv, endYear) {
-  const roiDecimal = (parseFloat(inv.rate_of_return) || 0) / 100; // convert percent to decimal
-  const invVal0 = parseFloat(inv.value) || 0;
-  const monthlyContribution = parseFloat(inv.contribution) || 0;
-  const contYears = parseInt(inv.contribution_timeline_years || 0, 10) || 0;
-
-  const years = new Array(endYear + 1).fill(0);
-  let val = invVal0;
-
-  // year 0 = starting value before growth
-  years[0] = val;
-
-  const totalMonths = endYear * 12;
-  const contMonths = contYears * 12;
-
-  for (let month = 0; month < totalMonths; month++) {
-    if (month < contMonths) {
-      // contribute then compound monthly
-      val = (val + monthlyContribution) * (1 + roiDecimal / 12);
-    } else {
-      // only compound
-      val = val * (1 + roiDecimal / 12);
-    }
-
-    // record the value at the end of each year (month indices 11, 23, 35, ...)
-    if ((month + 1) % 12 === 0) {
-      const yearIndex = Math.floor((month + 1) / 12);
-      if (yearIndex <= endYear) years[yearIndex] = val;
-    }
-  }
-
-  // Fill any missing entries defensively (carry forward last known)
-  let last = years[0] || 0;
-  for (let y = 0; y <= endYear; y++) {
-    if (typeof years[y] === "undefined" || years[y] === null) {
-      years[y] = last;
-    } else {
-      last = years[y];
-    }
-  }
-
-  return years;
-}
+// format values in the tooltip as USD with 2 decimals
+const tooltipCurrencyFormatter = (v) =>
+  new Intl.NumberFormat("en-US", {
+    style: "currency",
+    currency: "USD",
+    minimumFractionDigits: 2,
+    maximumFractionDigits: 2,
+  }).format(v);
 
 export default function InvestChart({ investments, endYear, retirementGoal, showRetirementGoal }) {
   const theme = useTheme();
+  const [projection, setProjection] = useState(null);
+
+  // The yearly series are projected on the server (GET /api/invest/projection/). The
+  // investments prop is the saved list, so refetch whenever the parent reloads it.
+  useEffect(() => {
+    let cancelled = false;
+    const years = Math.min(Math.max(parseInt(endYear, 10) || 0, 0), MAX_PROJECTION_YEARS);
+    getProjection(years)
+      .then((data) => {
+        if (!cancelled) setProjection(data);
+      })
+      .catch((err) => console.error("Failed to fetch investment projection:", err));
+    return () => {
+      cancelled = true;
+    };
+  }, [investments, endYear]);
 
   const { series, xLabels, maxTotal } = useMemo(() => {
-    const invs = (investments || []).map((inv) => ({
-      ...inv,
-      numericValue: parseFloat(inv.value) || 0,
+    if (!projection) return { series: [], xLabels: [], maxTotal: 0 };
+    // the server already orders the series largest starting value first (bottom of the stack)
+    const builtSeries = projection.series.map((s) => ({
+      data: s.data,
+      label: s.label,
+      area: true,
+      stack: "total",
+      showMark: false,
+      valueFormatter: tooltipCurrencyFormatter,
     }));
-
-    // sort so largest initial value is first (bottom of the stack)
-    invs.sort((a, b) => b.numericValue - a.numericValue);
-
-    // make x labels actual years (calendar years)
-    const currentYear = new Date().getFullYear();
-    const labels = [];
-    for (let y = 0; y <= endYear; y++) {
-      labels.push(String(currentYear + y));
-    }
-
-    const builtSeries = invs.map((inv) => {
-      const data = computeYearlySeries(inv, endYear);
-      return {
-        data,
-        label: inv.investment_name || `inv-${inv.id}`,
-        area: true,
-        stack: "total",
-        showMark: false,
-        // format values in the tooltip as USD with 2 decimals
-        valueFormatter: (v) =>
-          new Intl.NumberFormat("en-US", {
-            style: "currency",
-            currency: "USD",
-            minimumFractionDigits: 2,
-            maximumFractionDigits: 2,
-          }).format(v),
-      };
-    });
-
-    // compute per-year totals across series to find max Y
-    const totals = new Array(endYear + 1).fill(0);
-    for (const s of builtSeries) {
-      for (let i = 0; i < s.data.length; i++) {
-        totals[i] += Number(s.data[i] || 0);
-      }
-    }
-    const overallMax = totals.reduce((m, v) => (v > m ? v : m), 0);
-
-    return { series: builtSeries, xLabels: labels, maxTotal: overallMax };
-  }, [investments, endYear]);
+    return { series: builtSeries, xLabels: projection.labels, maxTotal: projection.max_total };
+  }, [projection]);
 
   if (!investments || investments.length === 0) {
     return (
@@ -132,6 +83,7 @@ export default function InvestChart({ investments, endYear, retirementGoal, show
       <LineChart
         height={360}
         series={series}
+        loading={!projection}
         // xAxis uses point scale with calendar year labels
         xAxis={[{ scaleType: "point", data: xLabels }]}
         // yAxis uses a valueFormatter to show $ and commas
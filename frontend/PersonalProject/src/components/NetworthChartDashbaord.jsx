@@ -1,67 +1,18 @@
 // components/NetworthChartDashboard.jsx
-import React, { useEffect, useMemo, useState } from "react";
+import React, { useMemo } from "react";
 import { Box, Typography, Paper } from "@mui/material";
 import { PieChart } from "@mui/x-charts/PieChart";
-import { getAssets, getLiabilities, getInvestmentsSum } from "../networth_api";
 
-export default function NetworthChartDashboard() {
-    // --- state hooks (always declared) ---
-    const [assets, setAssets] = useState(null); // null = loading
-    const [liabilities, setLiabilities] = useState(null);
-    const [investSum, setInvestSum] = useState(0);
-    const [error, setError] = useState(null);
+// networth: the "networth" block of GET /api/dashboard/ (null while loading);
+// investmentTotal: its investments.total_value
+export default function NetworthChartDashboard({ networth = null, investmentTotal = 0, error = null }) {
+    const assets = networth ? networth.assets : null; // null = loading
+    const liabilities = networth ? networth.liabilities : null;
 
     // read localStorage flag to determine whether to include investments
     const includeInvestments =
         typeof window !== "undefined" && localStorage.getItem("investments_included") === "true";
-
-    // --- effects (always declared) ---
-    useEffect(() => {
-        let mounted = true;
-        const loadAll = async () => {
-            try {
-                const [a, l] = await Promise.all([getAssets(), getLiabilities()]);
-                if (!mounted) return;
-                setAssets(Array.isArray(a) ? a : []);
-                setLiabilities(Array.isArray(l) ? l : []);
-            } catch (err) {
-                console.error("Failed to load networth data:", err);
-                if (mounted) {
-                    setError("Failed to load assets or liabilities");
-                    setAssets([]);
-                    setLiabilities([]);
-                }
-            }
-        };
-        loadAll();
-        return () => {
-            mounted = false;
-        };
-    }, []);
-
-    useEffect(() => {
-        let mounted = true;
-        const loadInvestSum = async () => {
-            if (!includeInvestments) {
-                setInvestSum(0);
-                return;
-            }
-            try {
-                const sum = await getInvestmentsSum();
-                if (!mounted) return;
-                setInvestSum(Number(sum || 0));
-            } catch (err) {
-                console.error("Failed to fetch investments sum:", err);
-                if (mounted) {
-                    setInvestSum(0);
-                }
-            }
-        };
-        loadInvestSum();
-        return () => {
-            mounted = false;
-        };
-    }, [includeInvestments]);
+    const investSum = includeInvestments ? Number(investmentTotal || 0) : 0;
 
     // --- memos (always declared, defensive against null) ---
     const assetSeries = useMemo(() => {
@@ -122,7 +73,7 @@ export default function NetworthChartDashboard() {
     }, [totals.totalAssets, totals.totalLiabilities]);
 
     // --- render-time early returns (no hooks here) ---
-    if (assets === null || liabilities === null) {
+    if (!error && (assets === null || liabilities === null)) {
         return (
             <Box sx={{ height: 200, display: "flex", alignItems: "center", justifyContent: "center" }}>
                 <Typography>Loading net worth...</Typography>
@@ -1,91 +1,20 @@
 // src/components/RetirementReadinessDashboard.jsx
-import React, { useEffect, useState, useRef } from "react";
+import React, { useRef } from "react";
 import { Box, Paper, Typography, CircularProgress } from "@mui/material";
 import RetirementReadiness from "./RetirementReadiness";
-import { getPlan, getRetIncome } from "../retire_api"; // adjust path if needed
 
-export default function RetirementReadinessDashboard() {
+// retirement: the "retirement" block of GET /api/dashboard/ (null while loading)
+export default function RetirementReadinessDashboard({ retirement = null, error = null }) {
   const readinessRef = useRef(null);
-  const [loadingPlan, setLoadingPlan] = useState(true);
-  const [loadingIncomes, setLoadingIncomes] = useState(true);
-  const [error, setError] = useState(null);
-
-  const [plan, setPlan] = useState({
-    current_age: "",
-    retirement_age: "",
-    projected_expenses: "",
-    withdrawal_rate: "",
-    readiness: 0,
-  });
-
-  const [incomes, setIncomes] = useState([]);
-
-  useEffect(() => {
-    let mounted = true;
-
-    const load = async () => {
-      setLoadingPlan(true);
-      setLoadingIncomes(true);
-      setError(null);
-
-      try {
-        const p = await getPlan();
-        if (!mounted) return;
-        setPlan({
-          current_age: p?.current_age ?? "",
-          retirement_age: p?.retirement_age ?? "",
-          projected_expenses: p?.projected_expenses ?? "",
-          withdrawal_rate: p?.withdrawal_rate ?? "",
-          readiness:
-            typeof p?.readiness !== "undefined" && p?.readiness !== null
-              ? Number(p.readiness)
-              : 0,
-        });
-      } catch (err) {
-        console.error("Failed to fetch plan:", err);
-        if (mounted) setError(err);
-      } finally {
-        if (mounted) setLoadingPlan(false);
-      }
-
-      try {
-        const r = await getRetIncome();
-        if (!mounted) return;
-        setIncomes(r || []);
-      } catch (err) {
-        console.error("Failed to fetch retirement incomes:", err);
-        if (mounted) setError(err);
-      } finally {
-        if (mounted) setLoadingIncomes(false);
-      }
-    };
-
-    load();
-
-    return () => {
-      mounted = false;
-    };
-  }, []);
-
-  // compute totals and the same retPercentage logic you use on the page
-  const totalMonthlyIncome = (incomes || []).reduce(
-    (sum, it) => sum + Number(it.amount || 0),
-    0
-  );
 
+  const plan = retirement?.plan || {};
+  const totalMonthlyIncome = Number(retirement?.income_total || 0);
   const projectedExpenses = Number(plan.projected_expenses || 0);
-  const rawCoverage =
-    projectedExpenses > 0 ? (totalMonthlyIncome / projectedExpenses) * 100 : 0;
-  const computedRetPercentage = Math.round(Math.min(Math.max(rawCoverage, 0), 100));
 
-  // The gauge should use the server's stored readiness value (fetched from plan.readiness).
-  // If it's missing, fall back to the locally computed percentage.
-  const serverReadiness =
-    typeof plan.readiness !== "undefined" && plan.readiness !== null
-      ? Math.round(Math.min(Math.max(Number(plan.readiness) || 0, 0), 100))
-      : computedRetPercentage;
+  // Readiness is computed and stored by the backend; show that value rather than recomputing it.
+  const readiness = Math.round(Math.min(Math.max(Number(retirement?.readiness) || 0, 0), 100));
 
-  const loading = loadingPlan || loadingIncomes;
+  const loading = retirement === null && !error;
 
   return (
     <Box sx={{ gridArea: "ret_readiness", minWidth: 0 }}>
@@ -131,14 +60,14 @@ export default function RetirementReadinessDashboard() {
                 </Typography>
               </Box>
             ) : (
-              <RetirementReadiness percentage={serverReadiness} />
+              <RetirementReadiness percentage={readiness} />
             )}
           </Box>
 
           {/* Text area: full width when stacked, fixed width on larger screens */}
           <Box sx={{ width: { xs: "100%", sm: 320 }, flexShrink: 1, minWidth: 0 , ml: 1}}>
             <Typography variant="subtitle1" sx={{ textAlign: { xs: "left", sm: "left" } }}>
-              You're on track to cover {computedRetPercentage}% of your post-retirement expenses.
+              You're on track to cover {readiness}% of your post-retirement expenses.
             </Typography>
 
             <Typography variant="body2" color="text.secondary" mt={1}>
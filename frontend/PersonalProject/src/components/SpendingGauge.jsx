@@ -7,11 +7,6 @@
 //     useGaugeState,
 //     GaugeValueText,
 // } from '@mui/x-charts/Gauge';
-import {
-    getIncome,
-    getExpenses,
-    getDeductions,
-} from '../budget_api';
 
 
 // /**
@@ -136,56 +131,23 @@ import { PieChart } from '@mui/x-charts/PieChart';
 
 /**
  * Props:
- * - totalIncome (number)
- * - totalDeductions (number)
- * - totalExpenses (number)
+ * - summary: the GET /api/budget/summary/ response (null while loading)
  *
- * Displays deductions, expenses, and remaining as slices of totalIncome.
+ * Displays deductions, expenses, and remaining as slices of the income total.
+ * The totals, net profit and whole-percent ratios are computed by the server;
+ * ratios and percent_spent are null when there is no income.
  * Uses objects with `value` (required by MUI PieChart API).
  */
-export default function SpendingGauge({
-  totalIncome = 0,
-  totalDeductions = 0,
-  totalExpenses = 0,
-}) {
+export default function SpendingGauge({ summary = null }) {
   const theme = useTheme();
 
-  const {
-    totalIncomeNum,
-    deductionsNum,
-    expensesNum,
-    remainingNum,
-    percentSpent,
-    display,
-    series,
-    netProfit,
-  } = useMemo(() => {
-    const totalIncomeNum = Number(totalIncome || 0);
-    const deductionsNum = Math.max(0, Number(totalDeductions || 0));
-    const expensesNum = Math.max(0, Number(totalExpenses || 0));
+  const { hasIncome, percentSpent, display, series, netProfit } = useMemo(() => {
+    const ratios = summary?.ratios ?? null;
 
-    const spent = deductionsNum + expensesNum;
-    const remainingRaw = totalIncomeNum - spent;
-    const remainingNum = Math.max(0, remainingRaw);
-
-    const percentSpentRaw =
-      totalIncomeNum > 0 && isFinite(totalIncomeNum)
-        ? (spent / totalIncomeNum) * 100
-        : NaN;
-
-    const percentSpent = isFinite(percentSpentRaw)
-      ? Math.round(percentSpentRaw)
-      : null;
-
-    const display = percentSpent === null ? 'N/A' : `${percentSpent}%`;
-
-    // If income is invalid or zero, show a single neutral slice to avoid NaN
-    if (!isFinite(totalIncomeNum) || totalIncomeNum <= 0) {
+    // No income (or still loading): show a single neutral slice to avoid NaN
+    if (!ratios) {
       return {
-        totalIncomeNum,
-        deductionsNum,
-        expensesNum,
-        remainingNum: 0,
+        hasIncome: false,
         percentSpent: null,
         display: 'N/A',
         netProfit: NaN,
@@ -209,23 +171,20 @@ export default function SpendingGauge({
       {
         id: 'deductions',
         label: 'Deductions',
-        value: deductionsNum,
-        pct: Math.round((deductionsNum / totalIncomeNum) * 100),
-        raw: deductionsNum,
+        value: Math.max(0, Number(summary.deduction_total)),
+        pct: ratios.deductions,
       },
       {
         id: 'expenses',
         label: 'Expenses',
-        value: expensesNum,
-        pct: Math.round((expensesNum / totalIncomeNum) * 100),
-        raw: expensesNum,
+        value: Math.max(0, Number(summary.expense_total)),
+        pct: ratios.expenses,
       },
       {
         id: 'remaining',
         label: 'Remaining',
-        value: remainingNum,
-        pct: Math.round((remainingNum / totalIncomeNum) * 100),
-        raw: remainingNum,
+        value: Number(summary.remaining),
+        pct: ratios.remaining,
       },
     ];
 
@@ -240,22 +199,19 @@ export default function SpendingGauge({
         // mimic your previous half-circle gauge if desired
         startAngle: -100,
         endAngle: 100,
-        // arcLabel: use the precomputed pct so label shows percent
+        // arcLabel: use the server's pct so label shows percent
         arcLabel: (item) => `${item.pct}%`,
       },
     ];
 
     return {
-      totalIncomeNum,
-      deductionsNum,
-      expensesNum,
-      remainingNum,
-      percentSpent,
-      display,
+      hasIncome: true,
+      percentSpent: summary.percent_spent,
+      display: `${summary.percent_spent}%`,
       series,
-      netProfit: totalIncomeNum - spent,
+      netProfit: Number(summary.net_profit),
     };
-  }, [totalIncome, totalDeductions, totalExpenses]);
+  }, [summary]);
 
   const formatter = useMemo(
     () =>
@@ -269,7 +225,7 @@ export default function SpendingGauge({
 
   // theme colors map to slices (same order as data array: deductions, expenses, remaining)
   const colors =
-    totalIncome && totalIncome > 0
+    hasIncome
       ? [theme.palette.warning.main, theme.palette.error.main, theme.palette.success.main]
       : [theme.palette.grey[400]];
 
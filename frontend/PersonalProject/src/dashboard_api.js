@@ -0,0 +1,7 @@
+import { api } from "./api";
+
+// Budget, net worth, investment, goal and retirement summaries for the dashboard in one request.
+export async function getDashboard() {
+    const response = await api.get('dashboard/');
+    return response.data;
+}
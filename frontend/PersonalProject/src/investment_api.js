@@ -70,4 +70,12 @@ export async function getMarketGains() {
     // No cache to fall back to — rethrow so caller can handle the error
     throw networkError;
   }
-}
\ No newline at end of file
+}
+// Projected yearly balances for all investments, nominal and inflation-adjusted
+// (real_data / real_totals / price_index), computed on the server.
+export async function getProjection(years = 30, inflation = null) {
+  const params = { years };
+  if (inflation !== null && inflation !== undefined) params.inflation = inflation;
+  const response = await api.get('invest/projection/', { params });
+  return response.data;
+}
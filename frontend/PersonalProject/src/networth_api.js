@@ -51,4 +51,12 @@ export async function getInvestmentsSum() {
   // fallback: try coercion
   const maybe = Number(data);
   return isNaN(maybe) ? 0 : maybe;
-}
\ No newline at end of file
+}
+// Daily net-worth snapshots, oldest first; start/end are optional YYYY-MM-DD strings
+export async function getNetWorthHistory(start, end) {
+    const params = {};
+    if (start) params.start = start;
+    if (end) params.end = end;
+    const response = await api.get('networth/history/', { params });
+    return response.data
+}
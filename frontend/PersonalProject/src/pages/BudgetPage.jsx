@@ -22,6 +22,7 @@ import {
   getDeductions,
   addDeduction,
   deleteDeduction,
+  getBudgetSummary,
 } from '../budget_api';
 
 export default function BudgetPage() {
@@ -43,6 +44,9 @@ export default function BudgetPage() {
 
   // State for expenses
   const [expenses, setExpenses] = useState([]);
+
+  // Totals and spend ratios from GET /api/budget/summary/ (null until loaded)
+  const [summary, setSummary] = useState(null);
   const [newExpenseName, setNewExpenseName] = useState('');
   const [newExpenseAmount, setNewExpenseAmount] = useState('');
 
@@ -61,6 +65,7 @@ export default function BudgetPage() {
     setIncome(await getIncome());
     setExpenses(await getExpenses());
     setDeductions(await getDeductions());
+    setSummary(await getBudgetSummary());
   };
 
   // --- INCOME handlers ---
@@ -106,9 +111,9 @@ export default function BudgetPage() {
   };
 
   // --- Totals ---
-  const totalIncome = income.reduce((sum, i) => sum + parseFloat(i.amount || 0), 0);
-  const totalDeductions = deductions.reduce((sum, d) => sum + parseFloat(d.amount || 0), 0);
-  const totalExpenses = expenses.reduce((sum, e) => sum + parseFloat(e.amount || 0), 0);
+  const totalIncome = Number(summary?.income_total ?? 0);
+  const totalDeductions = Number(summary?.deduction_total ?? 0);
+  const totalExpenses = Number(summary?.expense_total ?? 0);
 
   // Measure heights and set expenseMinHeight when on md+
   useEffect(() => {
@@ -354,11 +359,7 @@ export default function BudgetPage() {
             flexDirection: 'column',
           }}
         >
-          <SpendingGauge
-            totalIncome={Number(totalIncome) | 0}
-            totalDeductions={Number(totalDeductions) | 0}
-            totalExpenses={Number(totalExpenses) | 0}
-          />
+          <SpendingGauge summary={summary} />
         </Paper>
       </Box>
     </Box>
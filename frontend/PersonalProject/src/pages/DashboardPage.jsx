@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { Grid, Box, Typography, } from '@mui/material';
 import { Navigate, useNavigate } from 'react-router-dom';
 import FavoriteGoalsCard from '../components/FavoriteGoalsCard';
@@ -6,9 +6,29 @@ import GoalsPage from './GoalsPage';
 import InvestChartDashboard from '../components/InvestChartDashboard';
 import NetworthChartDashboard from '../components/NetworthChartDashbaord';
 import RetirementReadinessDashboard from '../components/RetirementReadinessDashboard';
+import { getDashboard } from '../dashboard_api';
 
 export default function DashboardPage() {
   const navigate = useNavigate();
+  const [dashboard, setDashboard] = useState(null); // null = loading
+  const [error, setError] = useState(null);
+
+  // One request for every card; each card renders its slice of the response.
+  useEffect(() => {
+    let cancelled = false;
+    getDashboard()
+      .then((data) => {
+        if (!cancelled) setDashboard(data);
+      })
+      .catch((err) => {
+        console.error('Failed to load dashboard', err);
+        if (!cancelled) setError('Failed to load dashboard');
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, []);
+
   const handleNavigateToNetWorth = () => {
     navigate('/networth');
   };
@@ -30,25 +50,32 @@ export default function DashboardPage() {
         alignItems: 'center'}}>
       {/* Box 1 */}
       <Grid item xs={12} sm={6} md={3} onClick={handleNavigateToNetWorth}>
-        <NetworthChartDashboard />
+        <NetworthChartDashboard
+          networth={dashboard?.networth ?? null}
+          investmentTotal={dashboard?.investments.total_value ?? 0}
+          error={error}
+        />
       </Grid>
 
       {/* Box 2 */}
       <Grid item xs={12} sm={6} md={3} onClick={handleNavigateToInvestments}>
-        <InvestChartDashboard />
+        <InvestChartDashboard
+          projection={dashboard?.investments.projection ?? null}
+          error={error}
+        />
       </Grid>
 
       {/* Box 3 */}
       <Grid item xs={6} sm={2} md={1}>
         <Box onClick={handleNavigateToGoals} p={2}>
-          <FavoriteGoalsCard/>
+          <FavoriteGoalsCard favoriteGoals={dashboard?.goals.favorites ?? []} />
         </Box>
       </Grid>
 
       {/* Box 4 */}
       <Grid item xs={12} sm={6} md={3}>
         <Box onClick={handleNavigateToRetirement} p={0}>
-          <RetirementReadinessDashboard />
+          <RetirementReadinessDashboard retirement={dashboard?.retirement ?? null} error={error} />
         </Box>
       </Grid>
     </Grid>
@@ -24,9 +24,8 @@ import {
   postRetIncome,
   deleteRetIncome,
   postRetIncomeBulk,
-  getInflationData,
 } from "../retire_api";
-import { getInvestments } from "../investment_api";
+import { getInvestments, getProjection } from "../investment_api";
 
 
 export default function RetirementPage() {
@@ -76,7 +75,8 @@ export default function RetirementPage() {
     setEditAgeMap(m);
   }, [incomes]);
 
-  const loadAll = async () => {
+  // readiness is computed by the backend, so reload the plan after anything that changes it
+  const loadPlan = async () => {
     try {
       const p = await getPlan();
       setPlan({
@@ -89,6 +89,10 @@ export default function RetirementPage() {
     } catch (err) {
       console.error("Failed to fetch plan:", err);
     }
+  };
+
+  const loadAll = async () => {
+    await loadPlan();
 
     try {
       const r = await getRetIncome();
@@ -108,8 +112,7 @@ export default function RetirementPage() {
           plan.projected_expenses === "" ? null : Number(plan.projected_expenses),
         withdrawal_rate:
           plan.withdrawal_rate === "" ? null : Number(plan.withdrawal_rate),
-        // send readiness to backend (same percentage shown by RetirementReadiness)
-        readiness: retPercentage,
+        // readiness is recomputed by the backend whenever the plan or incomes change
       };
       await updatePlan(payload);
 
@@ -176,8 +179,7 @@ export default function RetirementPage() {
   const totalMonthlyIncome = incomes.reduce((sum, it) => sum + Number(it.amount || 0), 0);
 
   const projectedExpenses = Number(plan.projected_expenses || 0);
-  const rawCoverage = projectedExpenses > 0 ? (totalMonthlyIncome / projectedExpenses) * 100 : 0;
-  const retPercentage = Math.round(Math.min(Math.max(rawCoverage, 0), 100));
+  const retPercentage = Math.round(Math.min(Math.max(Number(plan.readiness) || 0, 0), 100));
 
   // --- Small addition: compute and format the "Nest Egg" wording shown left of Save ---
   const monthlyExpensesNum = Number(plan.projected_expenses) || 0;
@@ -223,14 +225,27 @@ export default function RetirementPage() {
     }
   };
 
+  const planYearsToRetire = (currentPlan) => {
+    const currentAge = Number(currentPlan.current_age) || 0;
+    const retirementAge = Number(currentPlan.retirement_age) || 0;
+    return retirementAge > currentAge ? retirementAge - currentAge : 0;
+  };
+
+  // Investments plus each one's projected balance at retirement (id -> balance), projected on the server
+  const fetchInvestmentsAtRetirement = async (currentPlan) => {
+    const years = planYearsToRetire(currentPlan);
+    const [invs, projection] = await Promise.all([getInvestments(), getProjection(years)]);
+    const balances = {};
+    for (const s of projection?.series || []) {
+      balances[s.id] = Number(s.data[years]) || 0;
+    }
+    return { investments: Array.isArray(invs) ? invs : [], balances };
+  };
+
   // Helper: compute payloads from investments while preserving any user-entered ages
-  const computePayloadsFromInvestments = (investments, currentIncomes, currentEditAgeMap, currentPlan) => {
+  const computePayloadsFromInvestments = (investments, balances, currentIncomes, currentEditAgeMap, currentPlan) => {
     const payloads = [];
 
-    const currentAge = Number(currentPlan.current_age) || 0;
-    const retirementAge = Number(currentPlan.retirement_age) || 0;
-    const yearsToRetire = retirementAge > currentAge ? retirementAge - currentAge : 0;
-    const monthsToRetire = yearsToRetire * 12;
     const withdrawalRate = Number(currentPlan.withdrawal_rate) || 0;
 
     // helper to find income by name (trim & compare)
@@ -241,20 +256,7 @@ export default function RetirementPage() {
     };
 
     for (const inv of investments) {
-      const roiDecimal = (parseFloat(inv.rate_of_return) || 0) / 100;
-      let val = parseFloat(inv.value) || 0;
-      const monthlyContribution = parseFloat(inv.contribution) || 0;
-      const contYears = parseInt(inv.contribution_timeline_years || 0, 10) || 0;
-      const contMonths = contYears * 12;
-
-      for (let month = 0; month < monthsToRetire; month++) {
-        if (month < contMonths) {
-          val = (val + monthlyContribution) * (1 + roiDecimal / 12);
-        } else {
-          val = val * (1 + roiDecimal / 12);
-        }
-      }
-
+      const val = balances[inv.id] || 0;
       const monthlyIncome = (val * (withdrawalRate / 100)) / 12;
 
       const name = inv.investment_name || `Investment ${inv.id}`;
@@ -294,17 +296,17 @@ export default function RetirementPage() {
   const handleImportInvestments = async () => {
     setIsImporting(true);
     try {
-      const invs = await getInvestments();
-      const investments = Array.isArray(invs) ? invs : [];
+      const { investments, balances } = await fetchInvestmentsAtRetirement(plan);
 
       // Build payloads while preserving user-updated ages if present
-      const payloads = computePayloadsFromInvestments(investments, incomes, editAgeMap, plan);
+      const payloads = computePayloadsFromInvestments(investments, balances, incomes, editAgeMap, plan);
 
       // Single network request (bulk)
       const refreshedIncomes = await postRetIncomeBulk(payloads);
 
-      // Use returned data to update local state without an extra GET
+      // Use returned data to update local state without an extra GET for incomes
       setIncomes(refreshedIncomes || []);
+      await loadPlan();
     } catch (err) {
       console.error("Failed to import investments:", err);
     } finally {
@@ -316,13 +318,13 @@ export default function RetirementPage() {
   const recalcInvestmentsAndUpdateIncomes = async () => {
     setIsImporting(true);
     try {
-      const invs = await getInvestments();
-      const investments = Array.isArray(invs) ? invs : [];
+      const { investments, balances } = await fetchInvestmentsAtRetirement(plan);
 
-      const payloads = computePayloadsFromInvestments(investments, incomes, editAgeMap, plan);
+      const payloads = computePayloadsFromInvestments(investments, balances, incomes, editAgeMap, plan);
 
       const refreshedIncomes = await postRetIncomeBulk(payloads);
       setIncomes(refreshedIncomes || []);
+      await loadPlan();
     } catch (err) {
       console.error("Failed to recalc investments after saving plan:", err);
     } finally {
@@ -353,6 +355,7 @@ export default function RetirementPage() {
   const [calcOpen, setCalcOpen] = useState(false);
   const [calcPresentAmount, setCalcPresentAmount] = useState(""); // string so typing is smooth
   const [inflationAvg, setInflationAvg] = useState(null); // percent number, e.g. 2.5
+  const [priceIndex, setPriceIndex] = useState(null); // priceIndex[y] = (1 + inflation)^y, from the server
   const [calcFutureValue, setCalcFutureValue] = useState(0);
   const [isFetchingInflation, setIsFetchingInflation] = useState(false);
 
@@ -364,15 +367,16 @@ export default function RetirementPage() {
 
   const openCalculator = async () => {
     setCalcOpen(true);
-    // fetch inflation
+    // fetch the stored inflation average and its yearly price index (computed on the server)
     try {
       setIsFetchingInflation(true);
-      const resp = await getInflationData();
-      const avg = resp?.average_value ?? null;
-      setInflationAvg(avg);
+      const resp = await getProjection(yearsToRetire);
+      setInflationAvg(resp?.inflation_rate ?? null);
+      setPriceIndex(resp?.price_index ?? null);
     } catch (err) {
       console.error("Failed to fetch inflation data:", err);
       setInflationAvg(null);
+      setPriceIndex(null);
     } finally {
       setIsFetchingInflation(false);
     }
@@ -383,7 +387,7 @@ export default function RetirementPage() {
     // keep present amount so the user can re-open and continue typing if desired
   };
 
-  // Recalculate future value whenever present amount, inflationAvg, or yearsToRetire changes
+  // Recalculate future value whenever present amount, the price index, or yearsToRetire changes
   useEffect(() => {
     const p = parseFloat(calcPresentAmount);
     if (isNaN(p) || p <= 0) {
@@ -391,19 +395,12 @@ export default function RetirementPage() {
       return;
     }
 
-    const inflationRate = Number(inflationAvg) || 0; // percent per year
     const years = yearsToRetire || 0;
 
-    // If years == 0, future value is same as present (no inflation growth to apply)
-    if (years === 0) {
-      setCalcFutureValue(Number(p.toFixed(2)));
-      return;
-    }
-
-    // future_value = present * (1 + inflationRate/100) ** years
-    const fv = p * Math.pow(1 + inflationRate / 100, years);
-    setCalcFutureValue(Number(fv.toFixed(2)));
-  }, [calcPresentAmount, inflationAvg, yearsToRetire]);
+    // future_value = present * price_index[years]; no inflation data means no growth
+    const factor = Number(priceIndex?.[years]) || 1;
+    setCalcFutureValue(Number((p * factor).toFixed(2)));
+  }, [calcPresentAmount, priceIndex, yearsToRetire]);
 
   const handleUpdateProjectedExpenses = () => {
     // Replace the projected_expenses with the computed future value